@@ -0,0 +1,2 @@
+# 페이지별 핵심 경로 성능 측정 (python -m bench.run --help)
+# Whisper float32/int8 CPU 비교 (python -m bench.whisper_cpu --help)
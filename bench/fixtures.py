@@ -0,0 +1,225 @@
+# ─── 벤치마크용 합성 입력 ─────────────────────────────────────────────
+# 실제 업로드/데이터셋과 같은 모양의 입력을 난수 시드로 만들어서,
+# 같은 규모면 어느 컴퓨터에서나 같은 파일이 나오게 한다.
+#   - 일반 xlsx: 파일 N개 × M행 (파일마다 열 구성이 조금씩 다름)
+#   - 서식 많은 xlsx: 글꼴/채우기/테두리/표시형식/병합/틀 고정/조건부 서식
+#   - 학생 습관 CSV: 실제 데이터셋과 같은 열 구성, 1만~500만 행
+#   - 오디오(wav)/VTT 자막: 말소리 대신 쉼이 섞인 톤 신호와 자막 큐
+# 만든 파일은 규모별 폴더에 두고, 이미 있으면 다시 만들지 않는다.
+import os
+import wave
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from utils.audio_pipe import SAMPLE_RATE
+
+# 학생 CSV 를 만들 때 한 번에 생성/기록할 행 수 (500만 행도 메모리 일정)
+STUDENT_CHUNK_ROWS = 500_000
+
+_MAJORS = ["Computer Science", "Engineering", "Business", "Arts", "Psychology", "Biology"]
+_CHOICES = {
+    "gender": ["Male", "Female", "Other"],
+    "part_time_job": ["Yes", "No"],
+    "diet_quality": ["Poor", "Fair", "Good"],
+    "parental_education_level": ["High School", "Bachelor", "Master", "PhD"],
+    "extracurricular_participation": ["Yes", "No"],
+    "dropout_risk": ["Yes", "No"],
+    "study_environment": ["Dorm", "Library", "Cafe", "Quiet Room", "Co-Learning Group"],
+    "access_to_tutoring": ["Yes", "No"],
+    "family_income_range": ["Low", "Medium", "High"],
+    "learning_style": ["Visual", "Auditory", "Reading", "Kinesthetic"],
+}
+
+
+# ─── 학생 습관 CSV ───────────────────────────────────────────────────
+def student_frame(n: int, seed: int = 0, start_id: int = 0) -> pd.DataFrame:
+    """enhanced_student_habits_performance_dataset.csv 와 같은 열 순서/값 범위"""
+    r = np.random.default_rng(seed)
+
+    def pick(name):
+        return r.choice(_CHOICES[name], n)
+
+    df = pd.DataFrame({
+        "student_id": [f"S{100000 + start_id + i}" for i in range(n)],
+        "age": r.integers(16, 29, n),
+        "gender": pick("gender"),
+        "major": r.choice(_MAJORS, n),
+        "study_hours_per_day": (r.random(n) * 12).round(1),
+        "social_media_hours": (r.random(n) * 8).round(1),
+        "netflix_hours": (r.random(n) * 6).round(1),
+        "part_time_job": pick("part_time_job"),
+        "attendance_percentage": (r.random(n) * 50 + 50).round(1),
+        "sleep_hours": (r.random(n) * 6 + 4).round(1),
+        "diet_quality": pick("diet_quality"),
+        "exercise_frequency": r.integers(0, 7, n),
+        "parental_education_level": pick("parental_education_level"),
+        "extracurricular_participation": pick("extracurricular_participation"),
+        "dropout_risk": pick("dropout_risk"),
+        "screen_time": (r.random(n) * 15).round(1),
+        "study_environment": pick("study_environment"),
+        "access_to_tutoring": pick("access_to_tutoring"),
+        "family_income_range": pick("family_income_range"),
+        "parental_support_level": r.integers(1, 11, n),
+        "motivation_level": r.integers(1, 11, n),
+        "exam_anxiety_score": r.integers(1, 11, n),
+        "learning_style": pick("learning_style"),
+        "exam_score": r.integers(40, 101, n),
+    })
+    # 실제 데이터처럼 일부 수치 칸은 비워 둔다 (중앙값 채우기 경로도 측정되게)
+    for col in ("attendance_percentage", "sleep_hours"):
+        df.loc[r.random(n) < 0.01, col] = np.nan
+    return df
+
+
+def students_csv(path: str, rows: int, seed: int = 0) -> str:
+    if os.path.exists(path):
+        return path
+    tmp = path + ".tmp"
+    for i, start in enumerate(range(0, rows, STUDENT_CHUNK_ROWS)):
+        n = min(STUDENT_CHUNK_ROWS, rows - start)
+        student_frame(n, seed + i, start).to_csv(tmp, index=False, mode="w" if i == 0 else "a", header=i == 0)
+    os.replace(tmp, path)
+    return path
+
+
+# ─── 엑셀 ────────────────────────────────────────────────────────────
+def plain_workbooks(folder: str, files: int, rows: int, seed: int = 0) -> List[str]:
+    """값만 있는 xlsx. 두 번째 파일마다 '비고' 열(숫자/문자 혼합)이 더 있다"""
+    from openpyxl import Workbook
+
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i in range(files):
+        path = os.path.join(folder, f"plain_{i:02}.xlsx")
+        paths.append(path)
+        if os.path.exists(path):
+            continue
+        r = np.random.default_rng(seed + i)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Sheet1")
+        extra = i % 2 == 1
+        ws.append(["학번", "이름", "반", "국어", "영어", "수학", "평균", "응시일"] + (["비고"] if extra else []))
+        scores = r.integers(0, 101, (rows, 3))
+        days = pd.date_range("2024-03-01", periods=rows, freq="min").to_pydatetime()
+        for j in range(rows):
+            row = [i * rows + j, f"학생{j}", f"{j % 10 + 1}반", *map(int, scores[j]),
+                   round(float(scores[j].mean()), 2), days[j]]
+            if extra:
+                row.append("결석" if j % 7 == 0 else j % 3)
+            ws.append(row)
+        tmp = path + ".tmp"
+        wb.save(tmp)
+        os.replace(tmp, path)
+    return paths
+
+
+def styled_workbooks(folder: str, files: int, rows: int, seed: int = 0) -> List[str]:
+    """서식이 많은 xlsx (02 페이지의 스타일 보존 병합 경로용)"""
+    from openpyxl import Workbook
+    from openpyxl.formatting.rule import CellIsRule
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+    os.makedirs(folder, exist_ok=True)
+    thin = Side(style="thin", color="999999")
+    fonts = [Font(bold=b, italic=it, color=c) for b in (False, True) for it in (False, True)
+             for c in ("000000", "1F4E79", "C00000")]
+    fills = [PatternFill("solid", fgColor=c) for c in ("FFFFFF", "DDEBF7", "FCE4D6", "E2EFDA", "FFF2CC")]
+    formats = ["General", "0", "0.00", "#,##0", "0.0%", "yyyy-mm-dd"]
+    paths = []
+    for i in range(files):
+        path = os.path.join(folder, f"styled_{i:02}.xlsx")
+        paths.append(path)
+        if os.path.exists(path):
+            continue
+        r = np.random.default_rng(seed + 1000 + i)
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "성적표"
+        ws.append([f"{i + 1}번 파일 성적표"])
+        ws.merge_cells("A1:H1")
+        ws["A1"].font = Font(bold=True, size=14)
+        ws["A1"].alignment = Alignment(horizontal="center")
+        ws.append(["학번", "이름", "반", "국어", "영어", "수학", "평균", "비율"])
+        for cell in ws[2]:
+            cell.font = Font(bold=True, color="FFFFFF")
+            cell.fill = PatternFill("solid", fgColor="1F4E79")
+            cell.border = Border(top=thin, bottom=thin, left=thin, right=thin)
+        values = r.integers(0, 101, (rows, 3))
+        style_idx = r.integers(0, 1 << 16, (rows, 8))
+        for j in range(rows):
+            s = values[j]
+            ws.append([j, f"학생{j}", f"{j % 10 + 1}반", *map(int, s), float(s.mean()), float(s.mean()) / 100])
+            for k, cell in enumerate(ws[j + 3]):
+                code = int(style_idx[j, k])
+                cell.font = fonts[code % len(fonts)]
+                cell.fill = fills[(code >> 4) % len(fills)]
+                cell.number_format = formats[(code >> 8) % len(formats)]
+                if code & 1:
+                    cell.border = Border(bottom=thin)
+            if j % 50 == 49:
+                ws.merge_cells(start_row=j + 3, start_column=2, end_row=j + 3, end_column=3)
+        for col, width in zip("ABCDEFGH", (10, 14, 8, 8, 8, 8, 10, 10)):
+            ws.column_dimensions[col].width = width
+        ws.freeze_panes = "A3"
+        ws.conditional_formatting.add(
+            f"G3:G{rows + 2}", CellIsRule(operator="lessThan", formula=["60"], font=Font(color="C00000")),
+        )
+        tmp = path + ".tmp"
+        wb.save(tmp)
+        os.replace(tmp, path)
+    return paths
+
+
+# ─── 오디오 / 자막 ───────────────────────────────────────────────────
+def speech_like_audio(seconds: float, seed: int = 0) -> np.ndarray:
+    """1~6초 길이의 소리 구간과 0.2~1.5초 쉼이 번갈아 나오는 16kHz float32 신호"""
+    r = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = np.zeros(total, dtype=np.float32)
+    pos = 0
+    while pos < total:
+        voiced = int(r.uniform(1, 6) * SAMPLE_RATE)
+        end = min(total, pos + voiced)
+        t = np.arange(end - pos, dtype=np.float32) / SAMPLE_RATE
+        tone = np.sin(2 * np.pi * r.uniform(120, 300) * t) * 0.3
+        audio[pos:end] = tone + r.normal(0, 0.02, end - pos).astype(np.float32)
+        pos = end + int(r.uniform(0.2, 1.5) * SAMPLE_RATE)
+    return audio
+
+
+def audio_wav(path: str, seconds: float, seed: int = 0) -> str:
+    if os.path.exists(path):
+        return path
+    pcm = (np.clip(speech_like_audio(seconds, seed), -1, 1) * 32767).astype("<i2")
+    tmp = path + ".tmp"
+    with wave.open(tmp, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(pcm.tobytes())
+    os.replace(tmp, path)
+    return path
+
+
+def subtitle_vtt(path: str, cues: int, seed: int = 0) -> str:
+    """유튜브 자동 자막처럼 짧은 큐가 이어지는 WebVTT"""
+    if os.path.exists(path):
+        return path
+    from utils.transcribe import format_time
+
+    r = np.random.default_rng(seed)
+    words = ["오늘은", "파이썬", "데이터", "분석을", "배워", "보겠습니다", "먼저", "엑셀", "파일을", "합치는", "방법"]
+    lines = ["WEBVTT", "Kind: captions", "Language: ko", ""]
+    t = 0.0
+    for i in range(cues):
+        dur = float(r.uniform(1.0, 4.0))
+        text = " ".join(r.choice(words, int(r.integers(3, 9))))
+        lines += [str(i + 1), f"{format_time(t).replace(',', '.')} --> {format_time(t + dur).replace(',', '.')}", text, ""]
+        t += dur
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    os.replace(tmp, path)
+    return path
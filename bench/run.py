@@ -0,0 +1,308 @@
+# ─── 벤치마크 실행기 ─────────────────────────────────────────────────
+# 사용법 (저장소 루트에서):
+#   python -m bench.run --scale small                 # 측정 → .bench/results/ 에 JSON 저장
+#   python -m bench.run --scale medium --save-baseline # 기준값으로 저장
+#   python -m bench.run --scale medium --only merge.   # 이름이 merge. 로 시작하는 것만
+#   python -m bench.run --scale medium --fail-on-regression  # 기준보다 느려지면 exit 1
+# 작업마다, 반복마다 새 파이썬 프로세스에서 돌려서 캐시/풀/메모리 상태가 서로
+# 섞이지 않게 한다. 벽시계 시간과 최대 RSS(자식 프로세스 포함)를 기록하고,
+# 기준 JSON 과 비교해 느려진/빨라진 작업을 표시한다.
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from statistics import median
+from typing import Any, Dict, List, Optional
+
+# 규모별 입력 크기. --set 이름=값 으로 하나씩 바꿀 수 있다
+SCALES: Dict[str, Dict[str, int]] = {
+    "small": {"files": 4, "rows": 2_000, "styled_rows": 500, "students": 10_000,
+              "roster": 1_000, "audio_seconds": 60, "cues": 500},
+    "medium": {"files": 8, "rows": 20_000, "styled_rows": 5_000, "students": 500_000,
+               "roster": 20_000, "audio_seconds": 600, "cues": 5_000},
+    "large": {"files": 16, "rows": 100_000, "styled_rows": 20_000, "students": 5_000_000,
+              "roster": 100_000, "audio_seconds": 1800, "cues": 20_000},
+}
+BENCH_DIR = os.environ.get("BENCH_DIR", ".bench")
+# 기준 대비 이 비율 넘게 느리면 "느려짐"
+DEFAULT_TOLERANCE = 0.10
+# 차이가 이보다 작으면 비율과 관계없이 "같음" (아주 짧은 작업의 흔들림)
+MIN_DELTA_SECONDS = 0.02
+
+
+def _rss_mb(kb: int) -> float:
+    return round(kb / 1024, 1)
+
+
+def _peak_kb(who=resource.RUSAGE_SELF) -> int:
+    # 리눅스는 /proc 의 VmHWM (exec 때 새로 시작하고, 아래처럼 중간에 초기화할 수 있다).
+    # ru_maxrss 는 exec 를 거쳐도 부모 값을 물려받아서 자기 프로세스 값으로는 부정확하다
+    if who == resource.RUSAGE_SELF:
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+    maxrss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss 는 리눅스에서 KB, macOS 에서 바이트
+    return maxrss // 1024 if sys.platform == "darwin" else maxrss
+
+
+def _reset_peak() -> bool:
+    """최대 RSS 기록을 지금 RSS 로 되돌린다 (리눅스만)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+# ─── 입력 준비 ───────────────────────────────────────────────────────
+def prepare_fixtures(scale: str, params: Dict[str, int], names: List[str]) -> Dict[str, Any]:
+    """고른 작업에 필요한 입력만 만든다 (규모·크기가 같으면 기존 파일 재사용)"""
+    from bench import fixtures
+    from bench.workloads import WORKLOADS
+
+    needed = {WORKLOADS[n].fixture for n in names}
+    p = params
+    folder = os.path.join(BENCH_DIR, "fixtures")
+    os.makedirs(folder, exist_ok=True)
+    paths: Dict[str, Any] = {}
+    if "plain" in needed:
+        paths["plain"] = fixtures.plain_workbooks(
+            os.path.join(folder, f"plain_{p['files']}x{p['rows']}"), p["files"], p["rows"])
+    if "styled" in needed:
+        paths["styled"] = fixtures.styled_workbooks(
+            os.path.join(folder, f"styled_{p['files']}x{p['styled_rows']}"), p["files"], p["styled_rows"])
+    if "students" in needed:
+        paths["students"] = fixtures.students_csv(os.path.join(folder, f"students_{p['students']}.csv"), p["students"])
+    if "wav" in needed:
+        paths["wav"] = fixtures.audio_wav(os.path.join(folder, f"audio_{p['audio_seconds']}s.wav"), p["audio_seconds"])
+    if "vtt" in needed:
+        paths["vtt"] = fixtures.subtitle_vtt(os.path.join(folder, f"subtitle_{p['cues']}.vtt"), p["cues"])
+    return paths
+
+
+# ─── 자식 프로세스: 한 작업 한 번 ─────────────────────────────────────
+def run_child(name: str, fixture_path: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    from bench.workloads import WORKLOADS
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        params = dict(params, tmp=tmp)
+        run = WORKLOADS[name].setup(fixture_path, params)
+        setup_rss = _peak_kb()
+        # 준비 단계의 최대치를 지워서 측정 구간의 최대 RSS 만 남긴다
+        reset = _reset_peak()
+
+        start = time.perf_counter()
+        cpu = time.process_time()
+        output = run()
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+
+        # 프로세스 풀 워커까지 끝내야 자식 RSS 가 집계된다
+        from utils import parallel_parse, transcribe
+        parallel_parse.shutdown_pools(wait=True)
+        transcribe.shutdown_pools(wait=True)
+
+    return {
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "setup_rss_mb": _rss_mb(setup_rss),
+        # reset 이 안 되는 환경이면 준비 단계까지 포함한 최대치
+        "peak_rss_mb": _rss_mb(_peak_kb()),
+        "peak_rss_run_only": reset,
+        # 프로세스 풀 워커/ffmpeg 중 가장 큰 것 (exec 전 부모 값을 물려받으므로 상한값)
+        "peak_child_rss_mb": _rss_mb(_peak_kb(resource.RUSAGE_CHILDREN)),
+        "output": output if isinstance(output, (int, float, str)) else None,
+    }
+
+
+def _spawn(name: str, fixture_path: Any, params: Dict[str, int]) -> Dict[str, Any]:
+    cmd = [sys.executable, "-m", "bench.run", "--child", name,
+           "--child-input", json.dumps({"fixture": fixture_path, "params": params})]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        tail = (proc.stderr or proc.stdout).strip().splitlines()[-5:]
+        return {"error": "\n".join(tail) or f"exit {proc.returncode}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_suite(scale: str, params: Dict[str, int], names: List[str], repeat: int) -> Dict[str, Any]:
+    from bench.workloads import WORKLOADS
+
+    paths = prepare_fixtures(scale, params, names)
+    results: Dict[str, Any] = {}
+    for name in names:
+        workload = WORKLOADS[name]
+        runs = []
+        for _ in range(repeat):
+            run = _spawn(name, paths[workload.fixture], params)
+            if "error" in run:
+                results[name] = {"page": workload.page, "error": run["error"]}
+                break
+            runs.append(run)
+        else:
+            results[name] = {
+                "page": workload.page,
+                "wall_s": round(median(r["wall_s"] for r in runs), 4),
+                "wall_min_s": min(r["wall_s"] for r in runs),
+                "cpu_s": round(median(r["cpu_s"] for r in runs), 4),
+                "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+                "setup_rss_mb": max(r["setup_rss_mb"] for r in runs),
+                "peak_child_rss_mb": max(r["peak_child_rss_mb"] for r in runs),
+                "runs": [r["wall_s"] for r in runs],
+            }
+        _print_line(name, results[name])
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _meta(scale: str, params: Dict[str, int], repeat: int) -> Dict[str, Any]:
+    import numpy
+    import pandas
+
+    return {
+        "scale": scale,
+        "params": params,
+        "repeat": repeat,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+    }
+
+
+# ─── 기준 비교 ───────────────────────────────────────────────────────
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """작업별 (현재/기준) 시간·메모리 비율과 판정"""
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or "wall_s" not in base or "wall_s" not in cur:
+            rows.append({"name": name, "status": "비교 불가"})
+            continue
+        ratio = cur["wall_s"] / max(base["wall_s"], 1e-9)
+        rss_ratio = cur["peak_rss_mb"] / max(base["peak_rss_mb"], 1e-9)
+        if abs(cur["wall_s"] - base["wall_s"]) < MIN_DELTA_SECONDS:
+            status = "같음"
+        elif ratio > 1 + tolerance:
+            status = "느려짐"
+        elif ratio < 1 - tolerance:
+            status = "빨라짐"
+        else:
+            status = "같음"
+        rows.append({
+            "name": name, "status": status,
+            "wall_s": cur["wall_s"], "base_wall_s": base["wall_s"], "ratio": round(ratio, 3),
+            "peak_rss_mb": cur["peak_rss_mb"], "base_peak_rss_mb": base["peak_rss_mb"],
+            "rss_ratio": round(rss_ratio, 3),
+        })
+    return rows
+
+
+def _print_line(name: str, result: Dict[str, Any]):
+    if "error" in result:
+        print(f"{name:<26} 실패: {result['error'].splitlines()[-1]}", flush=True)
+    else:
+        print(f"{name:<26} {result['wall_s']:>9.3f}s  RSS {result['peak_rss_mb']:>8.1f}MB"
+              f"  (자식 {result['peak_child_rss_mb']:.1f}MB)  {result['page']}", flush=True)
+
+
+def _print_comparison(rows: List[Dict[str, Any]]):
+    print("\n기준 대비")
+    for r in rows:
+        if "ratio" not in r:
+            print(f"{r['name']:<26} {r['status']}")
+            continue
+        print(f"{r['name']:<26} {r['base_wall_s']:>9.3f}s → {r['wall_s']:>9.3f}s  x{r['ratio']:<6}"
+              f" RSS {r['base_peak_rss_mb']:.0f} → {r['peak_rss_mb']:.0f}MB  {r['status']}")
+
+
+def _write_json(path: str, data: Dict[str, Any]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from bench.workloads import WORKLOADS
+
+    parser = argparse.ArgumentParser(prog="python -m bench.run", description="페이지별 핵심 경로 벤치마크")
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--set", action="append", default=[], metavar="이름=값",
+                        help=f"입력 크기 바꾸기 (키: {', '.join(SCALES['small'])}, workers)")
+    parser.add_argument("--only", action="append", default=[], metavar="접두어", help="이름이 이것으로 시작하는 작업만")
+    parser.add_argument("--repeat", type=int, default=3, help="작업마다 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: .bench/results/<규모>-<시각>.json)")
+    parser.add_argument("--baseline", help="비교할 기준 JSON (기본: .bench/baseline-<규모>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준으로 저장")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--list", action="store_true", help="작업 목록만 출력")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--child-input", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        data = json.loads(args.child_input)
+        print(json.dumps(run_child(args.child, data["fixture"], data["params"])))
+        return 0
+
+    if args.list:
+        for name, w in WORKLOADS.items():
+            print(f"{name:<26} {w.page}")
+        return 0
+
+    params: Dict[str, int] = dict(SCALES[args.scale], workers=min(4, os.cpu_count() or 1))
+    for item in args.set:
+        key, _, value = item.partition("=")
+        if key not in params:
+            parser.error(f"알 수 없는 크기 이름: {key}")
+        params[key] = int(value)
+    names = [n for n in WORKLOADS if not args.only or any(n.startswith(p) for p in args.only)]
+    if not names:
+        parser.error("고른 작업이 없습니다 (--list 로 이름 확인)")
+
+    report = {"meta": _meta(args.scale, params, args.repeat),
+              "results": run_suite(args.scale, params, names, args.repeat)}
+    out = args.out or os.path.join(BENCH_DIR, "results", f"{args.scale}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    _write_json(out, report)
+    print(f"\n결과 저장: {out}")
+
+    baseline_path = args.baseline or os.path.join(BENCH_DIR, f"baseline-{args.scale}.json")
+    regressed = False
+    if os.path.exists(baseline_path) and not args.save_baseline:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("params") != params:
+            print(f"주의: 기준({baseline_path})과 입력 크기가 다릅니다")
+        rows = compare(report, baseline, args.tolerance)
+        _print_comparison(rows)
+        regressed = any(r["status"] == "느려짐" for r in rows)
+    if args.save_baseline:
+        _write_json(baseline_path, report)
+        print(f"기준 저장: {baseline_path}")
+    return 1 if regressed and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# ─── Whisper CPU 모드 비교 (float32 vs int8) ──────────────────────────
+# 사용법 (저장소 루트에서, whisper/torch 설치 필요):
+#   python -m bench.whisper_cpu --audio 강의.wav                       # base, 스레드 자동
+#   python -m bench.whisper_cpu --audio 강의.wav --models tiny,base,small --threads 1,2,4
+#   python -m bench.whisper_cpu --audio 강의.wav --language ko --beam 1,5
+# 모델 크기 × 양자화(float32/int8) × 스레드 수 × 빔 크기마다 04 페이지와 같은 경로
+# (transcribe_progressive, 작업 프로세스 하나)로 오디오 전체를 인식하고,
+#   - 실시간 배율(RTF) = 인식 시간 / 오디오 길이 (1 보다 작으면 실시간보다 빠름)
+#   - 단어 일치율 = 1 - WER (같은 모델 크기·빔의 float32 결과를 기준으로)
+# 을 출력한다. --audio 를 주지 않으면 bench 의 합성 오디오를 쓰는데, 말소리가
+# 아니라서 속도 비교에만 의미가 있고 단어 일치율은 참고하지 말 것.
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from bench.run import BENCH_DIR, _write_json
+
+# 합성 오디오를 쓸 때 길이 (초)
+FIXTURE_SECONDS = 60
+# 잴 때마다 먼저 돌리는 짧은 인식 (첫 호출의 지연 초기화를 빼기 위해)
+WARMUP_SECONDS = 5
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def word_agreement(reference: str, hypothesis: str) -> float:
+    """1 - 단어 오류율 (치환·삽입·삭제 편집 거리 / 기준 단어 수), 0 아래는 0"""
+    ref, hyp = _words(reference), _words(hypothesis)
+    if not ref:
+        return 1.0 if not hyp else 0.0
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return max(0.0, 1 - prev[-1] / len(ref))
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _load_audio(path: Optional[str]):
+    from utils.audio_pipe import decode_audio
+
+    if path:
+        return decode_audio(path)
+    from bench.fixtures import audio_wav
+
+    folder = os.path.join(BENCH_DIR, "fixtures")
+    os.makedirs(folder, exist_ok=True)
+    print("주의: 합성 오디오로 잽니다 (단어 일치율은 의미 없음, --audio 로 실제 녹음을 주세요)")
+    return decode_audio(audio_wav(os.path.join(folder, f"audio_{FIXTURE_SECONDS}s.wav"), FIXTURE_SECONDS))
+
+
+def _transcribe(audio, key: str, threads: int, language: Optional[str], beam_size: int) -> str:
+    from utils.transcribe import transcribe_progressive
+
+    segments = []
+    for _, _, segments in transcribe_progressive(audio, key, max_workers=1, language=language,
+                                                 beam_size=beam_size, threads=threads):
+        pass
+    return " ".join(seg.text for seg in segments)
+
+
+def run(audio, models: List[str], threads_list: List[int], beams: List[int],
+        language: Optional[str]) -> List[Dict[str, Any]]:
+    from utils.audio_pipe import SAMPLE_RATE
+    from utils.whisper_pool import drop_pool, get_pool, model_key
+
+    seconds = len(audio) / SAMPLE_RATE
+    rows = []
+    for size in models:
+        references: Dict[int, str] = {}
+        # CUDA 가 있으면 model_key 가 int8 을 고르지 않으므로 float32 만 잰다
+        for key in dict.fromkeys(model_key(size, quantize) for quantize in (False, True)):
+            pool = get_pool(key)
+            pool.warm()
+            load_seconds = pool.stats()["load_seconds"]
+            for beam in beams:
+                for threads in threads_list:
+                    _transcribe(audio[:WARMUP_SECONDS * SAMPLE_RATE], key, threads, language, beam)
+                    start = time.perf_counter()
+                    text = _transcribe(audio, key, threads, language, beam)
+                    wall = time.perf_counter() - start
+                    # 기준은 같은 크기·빔의 float32 첫 결과 (스레드 수는 결과에 영향 없음)
+                    reference = references.setdefault(beam, text)
+                    row = {
+                        "model": key, "threads": threads, "beam": beam,
+                        "load_s": round(load_seconds, 2), "wall_s": round(wall, 2),
+                        "rtf": round(wall / max(seconds, 1e-9), 3),
+                        "agreement": round(word_agreement(reference, text), 4),
+                        "words": len(_words(text)),
+                    }
+                    rows.append(row)
+                    print(f"{key:<12} 스레드 {threads:>2}  빔 {beam}  RTF {row['rtf']:>6.3f}"
+                          f"  ({row['wall_s']:.1f}s, 로드 {row['load_s']:.1f}s)  단어 일치 {row['agreement']:.1%}",
+                          flush=True)
+            # 다음 모델을 올리기 전에 메모리를 돌려준다
+            drop_pool(key)
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.whisper_cpu", description="Whisper float32 / int8 CPU 비교")
+    parser.add_argument("--audio", help="인식할 오디오 파일 (ffmpeg 가 읽을 수 있는 형식)")
+    parser.add_argument("--models", default="base", help="쉼표로 구분한 모델 크기 (기본: base)")
+    parser.add_argument("--threads", default=str(os.cpu_count() or 1), help="쉼표로 구분한 torch 스레드 수")
+    parser.add_argument("--beam", default="1", help="쉼표로 구분한 빔 크기 (1 = 탐욕 디코딩)")
+    parser.add_argument("--language", help="언어 코드 (기본: 자동 감지)")
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: .bench/results/whisper-<시각>.json)")
+    args = parser.parse_args(argv)
+
+    if importlib.util.find_spec("whisper") is None or importlib.util.find_spec("torch") is None:
+        print("whisper/torch 가 설치되어 있지 않아 건너뜁니다", file=sys.stderr)
+        return 1
+
+    import torch
+
+    audio = _load_audio(args.audio)
+    rows = run(audio, args.models.split(","), _int_list(args.threads), _int_list(args.beam), args.language)
+    report = {
+        "meta": {
+            "audio": args.audio or f"synthetic {FIXTURE_SECONDS}s",
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "cpu_count": os.cpu_count(),
+            "torch": torch.__version__,
+            "quantized_engine": torch.backends.quantized.engine,
+            "language": args.language,
+        },
+        "results": rows,
+    }
+    out = args.out or os.path.join(BENCH_DIR, "results", f"whisper-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    _write_json(out, report)
+    print(f"\n결과 저장: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+# ─── 측정 대상 (페이지별 핵심 경로) ───────────────────────────────────
+# 각 작업은 (준비 함수 → 측정할 함수) 꼴이다. 준비(입력 읽기, 선행 산출물 만들기)는
+# 시간에 넣지 않고, 돌려받은 함수 한 번의 실행만 잰다. Streamlit 없이 페이지가
+# 부르는 utils 함수를 같은 인자로 직접 부른다.
+import os
+import tempfile
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any, Callable, Dict, List
+
+# 02 페이지의 병합 엔진 라디오 값
+OPENPYXL_ENGINE = "openpyxl (기존)"
+XML_ENGINE = "XML 이식 (대용량 .xlsx)"
+
+# 00 페이지 필터에서 제외하는 열
+_EXCLUDE = ["student_id", "exam_score", "major", "gender"]
+# 05 페이지 유사도 특성
+NUMERIC_FEATURES = [
+    'age', 'study_hours_per_day', 'social_media_hours', 'netflix_hours',
+    'attendance_percentage', 'sleep_hours', 'exercise_frequency',
+    'screen_time', 'parental_support_level', 'motivation_level', 'exam_anxiety_score'
+]
+CATEGORICAL_FEATURES = [
+    'gender', 'part_time_job', 'diet_quality',
+    'parental_education_level', 'extracurricular_participation',
+    'dropout_risk', 'study_environment', 'access_to_tutoring',
+    'family_income_range', 'learning_style'
+]
+# 05 페이지 단건 조회 작업에서 한 번에 재는 조회 횟수 (한 번은 너무 짧아서 흔들림이 큼)
+SINGLE_QUERIES = 200
+
+
+@dataclass
+class Workload:
+    name: str
+    page: str
+    fixture: str  # 필요한 입력 (fixtures 사전의 키)
+    setup: Callable[[Any, Dict[str, Any]], Callable[[], Any]]
+
+
+class _Upload(BytesIO):
+    """Streamlit UploadedFile 대신 (name, getvalue, read, seek)"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            super().__init__(f.read())
+        self.name = os.path.basename(path)
+
+
+def _uploads(paths: List[str]) -> List[_Upload]:
+    return [_Upload(p) for p in paths]
+
+
+# ─── 엑셀 병합 (main.py, 01, 02 페이지) ───────────────────────────────
+def _write_to_temp(build):
+    # 다운로드 버튼을 눌렀을 때처럼 결과 xlsx 까지 파일에 쓴다
+    with tempfile.TemporaryFile() as out:
+        return build(out).rows
+
+
+def _stream_concat(paths, params):
+    from utils.excel_stream import stream_concat
+
+    uploads = _uploads(paths)
+    return lambda: _write_to_temp(lambda out: stream_concat(uploads, out=out))
+
+
+def _stream_sheets(paths, params):
+    from utils.excel_stream import stream_sheets
+
+    uploads = _uploads(paths)
+    return lambda: _write_to_temp(lambda out: stream_sheets(uploads, out=out))
+
+
+def _pandas_unify(paths, params):
+    from utils.frame_schema import unify_frames
+    from utils.parallel_parse import parse_uploads, read_compact_frame
+
+    uploads = _uploads(paths)
+
+    def run():
+        parsed = parse_uploads(uploads, read_compact_frame, max_workers=params["workers"])
+        return len(unify_frames([df for _, df in parsed], [f.name for f, _ in parsed]))
+    return run
+
+
+def _merged_frame(paths, params):
+    from utils.frame_schema import unify_frames
+    from utils.parallel_parse import read_compact_frame
+
+    frames = [read_compact_frame(u.getvalue()) for u in _uploads(paths)]
+    return unify_frames(frames, [os.path.basename(p) for p in paths])
+
+
+def _export(fmt):
+    def setup(paths, params):
+        from utils.export import write_export
+
+        df = _merged_frame(paths, params)
+
+        def run():
+            with tempfile.TemporaryFile() as f:
+                write_export([("Sheet1", df)], fmt, f)
+                return f.tell()
+        return run
+    return setup
+
+
+def _styled_merge(engine):
+    def setup(paths, params):
+        from utils.job_tasks import merge_uploads
+
+        uploads = _uploads(paths)
+
+        def run():
+            data, errors = merge_uploads(uploads, engine, params["workers"])
+            if errors:
+                raise RuntimeError(errors[0])
+            return len(data)
+        return run
+    return setup
+
+
+# ─── 학생 데이터 (00, 05 페이지) ─────────────────────────────────────
+def _build_parquet(csv_path, params):
+    from utils.student_data import build_parquet
+
+    out = os.path.join(params["tmp"], "students.parquet")
+    return lambda: len(build_parquet(csv_path, out))
+
+
+def _load_cached(csv_path, params):
+    from utils.student_data import build_parquet, load_students, parquet_path_for
+
+    if not os.path.exists(parquet_path_for(csv_path)):
+        build_parquet(csv_path)
+    return lambda: len(load_students(csv_path, fill_numeric=True))
+
+
+def _filter_groupby(csv_path, params):
+    import pandas as pd
+
+    from utils.stats_cube import get_cube
+    from utils.student_data import build_parquet, load_students, parquet_path_for
+
+    if not os.path.exists(parquet_path_for(csv_path)):
+        build_parquet(csv_path)
+    df = load_students(csv_path)
+
+    def run():
+        # 00 페이지 첫 화면: 필터 → 큐브 → 변수별 평균 전부 + 상관계수 (필터 조합 몇 개)
+        majors, genders = df["major"].unique(), df["gender"].unique()
+        filtered = df[df["major"].isin(majors) & df["gender"].isin(genders)]
+        variables = [c for c in df.columns if c not in _EXCLUDE]
+        numeric = [c for c in df.columns if c != "student_id" and pd.api.types.is_numeric_dtype(df[c])]
+        categorical = [c for c in variables if c not in numeric]
+        cube = get_cube(df, categorical, numeric)
+        for sel_majors in (majors, majors[:2], majors[:1]):
+            for var in categorical:
+                cube.group_mean(var, sel_majors, genders)
+            cube.corr(sel_majors, genders)
+        return len(filtered)
+    return run
+
+
+def _similarity_inputs(csv_path, params):
+    import utils.similarity as similarity
+    from utils.student_data import build_parquet, dataset_signature, load_students, parquet_path_for
+
+    if not os.path.exists(parquet_path_for(csv_path)):
+        build_parquet(csv_path)
+    # 산출물은 매 실행마다 빈 폴더에 새로 만든다
+    similarity.ARTIFACT_DIR = os.path.join(params["tmp"], "artifacts")
+    return similarity, load_students(csv_path, fill_numeric=True), dataset_signature(csv_path)
+
+
+def _similarity_build(csv_path, params):
+    similarity, df, signature = _similarity_inputs(csv_path, params)
+    return lambda: similarity.load_artifacts(df, signature, NUMERIC_FEATURES, CATEGORICAL_FEATURES).key
+
+
+def _similarity_roster(csv_path, params):
+    import pandas as pd
+
+    from bench.fixtures import student_frame
+
+    similarity, df, signature = _similarity_inputs(csv_path, params)
+    artifacts = similarity.load_artifacts(df, signature, NUMERIC_FEATURES, CATEGORICAL_FEATURES)
+    roster = student_frame(params["roster"], seed=99)
+    roster[CATEGORICAL_FEATURES] = roster[CATEGORICAL_FEATURES].astype(str)
+    roster[NUMERIC_FEATURES] = roster[NUMERIC_FEATURES].apply(pd.to_numeric, errors="coerce")
+    return lambda: len(similarity.score_roster(roster, artifacts, df, k=5))
+
+
+def _similarity_single(csv_path, params):
+    # 페이지의 [조회하기] 한 번 = 한 명짜리 질의 한 번. 산출물 로드/전처리는 준비 단계에서 끝내고
+    # 색인 조회만 SINGLE_QUERIES 번 잰다 (배치 조회와 달리 호출당 고정 비용이 드러난다)
+    from bench.fixtures import student_frame
+
+    similarity, df, signature = _similarity_inputs(csv_path, params)
+    artifacts = similarity.load_artifacts(df, signature, NUMERIC_FEATURES, CATEGORICAL_FEATURES)
+    students = student_frame(SINGLE_QUERIES, seed=7)
+    students[CATEGORICAL_FEATURES] = students[CATEGORICAL_FEATURES].astype(str)
+    X = similarity.transform_dataset(students, artifacts.preprocessor, artifacts.feature_cols)
+    queries = [X[i:i + 1] for i in range(len(X))]
+
+    def run():
+        for q in queries:
+            artifacts.index.query(q, k=5)
+        return len(queries)
+    return run
+
+
+# ─── 자막 / 오디오 (04 페이지) ───────────────────────────────────────
+def _vtt_to_text(vtt_path, params):
+    from utils.transcribe import sub_lines_to_text
+
+    with open(vtt_path, encoding="utf-8") as f:
+        text = f.read()
+    return lambda: len(sub_lines_to_text(text.splitlines()))
+
+
+def _decode_audio(wav_path, params):
+    from utils.audio_pipe import decode_audio
+
+    return lambda: len(decode_audio(wav_path))
+
+
+def _chunk_and_srt(wav_path, params):
+    import numpy as np
+
+    from bench.fixtures import speech_like_audio
+    from utils.transcribe import Segment, make_chunks, to_srt
+
+    audio = speech_like_audio(params["audio_seconds"])
+    # 2초마다 자막 한 줄이 나왔다고 치고 SRT 로 만든다
+    segments = [Segment(t, t + 2.0, f"자막 {i}") for i, t in enumerate(np.arange(0, params["audio_seconds"], 2.0))]
+
+    def run():
+        chunks = make_chunks(audio)
+        return len(chunks) + len(to_srt(segments))
+    return run
+
+
+WORKLOADS: Dict[str, Workload] = {w.name: w for w in [
+    Workload("merge.stream_concat", "main.py (스트리밍)", "plain", _stream_concat),
+    Workload("merge.pandas_unify", "main.py (pandas)", "plain", _pandas_unify),
+    Workload("merge.stream_sheets", "01 (스트리밍)", "plain", _stream_sheets),
+    Workload("export.xlsx", "main.py 다운로드", "plain", _export("xlsx")),
+    Workload("export.csv_gz", "main.py 다운로드", "plain", _export("csv.gz")),
+    Workload("export.parquet", "main.py 다운로드", "plain", _export("parquet")),
+    Workload("merge.styled_openpyxl", "02 (openpyxl)", "styled", _styled_merge(OPENPYXL_ENGINE)),
+    Workload("merge.styled_xml", "02 (XML 이식)", "styled", _styled_merge(XML_ENGINE)),
+    Workload("students.build_parquet", "00/05 첫 로드", "students", _build_parquet),
+    Workload("students.load_cached", "00/05 로드", "students", _load_cached),
+    Workload("students.filter_groupby", "00 필터/집계", "students", _filter_groupby),
+    Workload("similarity.build", "05 전처리/색인", "students", _similarity_build),
+    Workload("similarity.roster", "05 명단 조회", "students", _similarity_roster),
+    Workload("similarity.single_query", "05 단건 조회", "students", _similarity_single),
+    Workload("subtitle.vtt_to_text", "04 자막 변환", "vtt", _vtt_to_text),
+    Workload("audio.decode", "04 오디오 디코딩", "wav", _decode_audio),
+    Workload("audio.chunk_srt", "04 구간 분할/SRT", "wav", _chunk_and_srt),
+]}
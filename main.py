@@ -1,6 +1,29 @@
+import time
+
+_render_start = time.perf_counter()  # 렌더 시간은 import 부터 잰다 (finish_page 로 넘김)
+
 import streamlit as st
 import pandas as pd
-from io import BytesIO
+
+from utils.excel_stream import stream_concat
+from utils.export import FORMATS, export_cache, output_mime, output_name, upload_key
+from utils.frame_schema import memory_mb, unify_frames
+from utils.parallel_parse import DEFAULT_WORKERS, parse_uploads, read_compact_frame
+from utils.parse_cache import parse_cache
+from utils.stages import ENABLED as STAGES_ENABLED, recent_stages, stage
+from utils.startup import finish_page
+
+# 미리보기는 한 페이지씩만 잘라서 브라우저로 보낸다
+PREVIEW_PAGE_ROWS = 100
+
+
+def show_preview(df: pd.DataFrame):
+    pages = max(1, -(-len(df) // PREVIEW_PAGE_ROWS))
+    page = st.number_input(f"미리보기 페이지 (총 {pages:,}쪽)", min_value=1, max_value=pages, value=1)
+    start = (page - 1) * PREVIEW_PAGE_ROWS
+    st.caption(f"{start + 1:,}–{min(start + PREVIEW_PAGE_ROWS, len(df)):,}행 / 총 {len(df):,}행")
+    st.dataframe(df.iloc[start:start + PREVIEW_PAGE_ROWS])
+
 
 st.title("엑셀 파일 합치기")
 
@@ -10,33 +33,72 @@ uploaded_files = st.file_uploader(
     accept_multiple_files=True
 )
 
-if uploaded_files:
-    dfs = []
-    for uploaded_file in uploaded_files:
-        try:
-            df = pd.read_excel(uploaded_file)
-            df["파일명"] = uploaded_file.name
-            dfs.append(df)
-        except Exception as e:
-            st.error(f"{uploaded_file.name} 읽기 실패: {e}")
-
-    if dfs:
-        merged_df = pd.concat(dfs, ignore_index=True)
-        st.success(f"{len(dfs)}개의 파일을 성공적으로 합쳤습니다!")
-        st.dataframe(merged_df)
-
-        # 엑셀 다운로드용 BytesIO로 변환
-        def to_excel_bytes(df):
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False)
-            output.seek(0)
-            return output
-
-        excel_data = to_excel_bytes(merged_df)
+# 스트리밍: 행 단위로 바로 써서 메모리 사용량이 파일 크기와 무관
+# pandas: 기존 방식 (전체를 DataFrame으로 읽어서 합침)
+mode = st.radio("병합 방식", ["스트리밍 (대용량)", "pandas (기존)"], horizontal=True)
+workers = st.sidebar.number_input("병렬 파싱 프로세스 수", min_value=1, max_value=64, value=min(DEFAULT_WORKERS, 64))
+
+if uploaded_files and mode.startswith("스트리밍"):
+    # 여기서는 읽기만 해서 행 수/미리보기를 보여 주고, xlsx 는 버튼을 누를 때만 만든다.
+    # 읽은 요약은 업로드 묶음(파일별 내용 해시)별로 캐시해서 다시 돌 때는 파일을 읽지 않는다
+    key = upload_key(uploaded_files, "stream_concat")
+    with stage("main:stream_concat", size=sum(f.size for f in uploaded_files)) as s:
+        result = parse_cache.get_or_build(("stream_concat", key), lambda: stream_concat(uploaded_files))
+        s.rows = result.rows
+    for name, error in result.errors:
+        st.error(f"{name} 읽기 실패: {error}")
+    if result.merged:
+        st.success(f"{len(result.merged)}개의 파일을 성공적으로 합쳤습니다! (총 {result.rows}행)")
+        st.caption(f"앞 {len(result.preview)}행 미리보기")
+        st.dataframe(pd.DataFrame(result.preview, columns=result.columns))
+
+        # 같은 업로드 묶음이면 디스크 캐시에서 바로 준다
         st.download_button(
             label="엑셀로 다운로드",
-            data=excel_data,
+            data=lambda: export_cache.read(key, "xlsx", write=lambda f: stream_concat(uploaded_files, out=f)),
             file_name="합쳐진_파일.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
+
+elif uploaded_files:
+    with stage("main:parse", size=sum(f.size for f in uploaded_files)):
+        parsed = parse_uploads(
+            uploaded_files, read_compact_frame, max_workers=workers, cache=parse_cache,
+            on_error=lambda name, e: st.error(f"{name} 읽기 실패: {e}"),
+        )
+
+    if parsed:
+        # 파일마다 다른 열/타입을 공통 스키마로 맞춰서 합친다 (파일명 열은 category).
+        # 캐시에 든 DataFrame 은 다른 세션과 공유되므로 직접 바꾸지 않는다.
+        # 합친 결과도 업로드 묶음별로 캐시해서 미리보기 페이지를 넘길 때 다시 합치지 않는다
+        key = upload_key(uploaded_files, "concat")
+        with stage("main:unify") as s:
+            merged_df = parse_cache.get_or_build(
+                ("unify", key),
+                lambda: unify_frames([df for _, df in parsed], [f.name for f, _ in parsed]),
+            )
+            s.rows = len(merged_df)
+        st.success(f"{len(parsed)}개의 파일을 성공적으로 합쳤습니다! (총 {len(merged_df):,}행, {memory_mb(merged_df)} MB)")
+        show_preview(merged_df)
+
+        # 다운로드 파일은 버튼을 누를 때만 만들고, 같은 업로드 묶음이면 디스크 캐시에서 바로 준다
+        fmt = st.radio("다운로드 형식", list(FORMATS), format_func=lambda f: FORMATS[f].label, horizontal=True)
+        st.download_button(
+            label="다운로드",
+            data=lambda: export_cache.read(key, fmt, lambda: [("Sheet1", merged_df)]),
+            file_name=output_name("합쳐진_파일", fmt),
+            mime=output_mime(fmt),
+        )
+
+# 파싱 캐시 적중/미스/퇴출 횟수 (캐시 크기 조정용)
+with st.sidebar.expander("파싱 캐시 상태"):
+    st.json(parse_cache.stats())
+    st.caption("내보내기 파일 캐시")
+    st.json(export_cache.stats())
+
+# 단계별 시간/메모리 (STAGE_PROFILE=1 일 때만, 내보내기 파일 생성 포함)
+if STAGES_ENABLED:
+    with st.sidebar.expander("⏱ 단계별 시간/메모리"):
+        st.dataframe(pd.DataFrame(recent_stages(("main:", "export:"))))
+
+st.sidebar.caption(finish_page("main", _render_start))
@@ -1,14 +1,24 @@
 # streamlit_app.py
 
+import os
+import sys
+import time
+
+_render_start = time.perf_counter()  # 렌더 시간은 import 부터 잰다 (finish_page 로 넘김)
+
+# 저장소 루트의 utils 패키지를 쓰기 위해 경로 추가 (main/ 에서 단독 실행할 때)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-# 데이터 불러오기
-@st.cache_data
+from utils.plots import DEFAULT_MAX_POINTS, scatter_image
+from utils.startup import finish_page
+from utils.stats_cube import get_cube
+from utils.student_data import dataset_signature, load_students
+
+# 데이터 불러오기 (Parquet 캐시를 프로세스 안에서 공유하므로 st.cache_data 불필요)
 def load_data():
-    return pd.read_csv("enhanced_student_habits_performance_dataset.csv")
+    return load_students()
 
 df = load_data()
 
@@ -21,25 +31,27 @@ selected_gender = st.sidebar.multiselect("성별 선택", options=df["gender"].u
 
 filtered_df = df[(df["major"].isin(selected_major)) & (df["gender"].isin(selected_gender))]
 
+# 점이 많으면 성별별 밀도(hexbin) 그림으로 자동 전환, 그림은 필터 선택별로 캐시
+max_points = st.sidebar.number_input("산점도 최대 점 개수", min_value=100, value=DEFAULT_MAX_POINTS, step=1000)
+filter_key = (dataset_signature(), tuple(selected_major), tuple(selected_gender))
+
 st.subheader("공부 시간 vs 시험 점수")
-fig1, ax1 = plt.subplots()
-sns.scatterplot(data=filtered_df, x="study_hours_per_day", y="exam_score", hue="gender", ax=ax1)
-st.pyplot(fig1)
+st.image(scatter_image(filtered_df, "study_hours_per_day", max_points=max_points, cache_key=filter_key))
 
 st.subheader("수면 시간 vs 시험 점수")
-fig2, ax2 = plt.subplots()
-sns.scatterplot(data=filtered_df, x="sleep_hours", y="exam_score", hue="gender", ax=ax2)
-st.pyplot(fig2)
+st.image(scatter_image(filtered_df, "sleep_hours", max_points=max_points, cache_key=filter_key))
 
 st.subheader("SNS 사용 시간 vs 시험 점수")
-fig3, ax3 = plt.subplots()
-sns.scatterplot(data=filtered_df, x="social_media_hours", y="exam_score", hue="gender", ax=ax3)
-st.pyplot(fig3)
+st.image(scatter_image(filtered_df, "social_media_hours", max_points=max_points, cache_key=filter_key))
 
 st.subheader("학습 환경별 평균 시험 점수")
-avg_scores = filtered_df.groupby("study_environment")["exam_score"].mean().sort_values()
+# 미리 계산한 집계 큐브에서 필터에 맞는 칸들만 더함
+cube = get_cube(df, ["study_environment"], [])
+avg_scores = cube.group_mean("study_environment", selected_major, selected_gender).sort_values()
 st.bar_chart(avg_scores)
 
 # 데이터 확인
 with st.expander("원본 데이터 보기"):
     st.dataframe(filtered_df)
+
+st.sidebar.caption(finish_page("00_hihi", _render_start))
@@ -1,15 +1,20 @@
-
 # streamlit_app.py
 
+import time
+
+_render_start = time.perf_counter()  # 렌더 시간은 import 부터 잰다 (finish_page 로 넘김)
+
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-# 데이터 불러오기
-@st.cache_data
+from utils.plots import DEFAULT_MAX_POINTS, scatter_image
+from utils.startup import finish_page
+from utils.stats_cube import get_cube
+from utils.student_data import dataset_signature, load_students
+
+# 데이터 불러오기 (Parquet 캐시를 프로세스 안에서 공유하므로 st.cache_data 불필요)
 def load_data():
-    return pd.read_csv("enhanced_student_habits_performance_dataset.csv")
+    return load_students()
 
 df = load_data()
 
@@ -32,15 +37,34 @@ variables = [col for col in df.columns if col not in exclude_cols]
 
 selected_var = st.selectbox("비교할 변수 선택", variables)
 
+# 필터별 평균/상관계수는 미리 계산한 집계 큐브에서 (행 전체를 다시 훑지 않음)
+numeric_vars = [col for col in df.columns if col != "student_id" and pd.api.types.is_numeric_dtype(df[col])]
+categorical_vars = [col for col in variables if col not in numeric_vars]
+cube = get_cube(df, categorical_vars, numeric_vars)
+
 # 시각화
 if pd.api.types.is_numeric_dtype(df[selected_var]):
     st.write(f"📈 **{selected_var}** vs **시험 점수 (exam_score)**")
-    fig, ax = plt.subplots()
-    sns.scatterplot(data=filtered_df, x=selected_var, y="exam_score", hue="gender", ax=ax)
-    st.pyplot(fig)
+    # 점이 많으면 성별별 밀도(hexbin) 그림으로 자동 전환, 그림은 필터 선택별로 캐시
+    max_points = st.sidebar.number_input("산점도 최대 점 개수", min_value=100, value=DEFAULT_MAX_POINTS, step=1000)
+    filter_key = (dataset_signature(), tuple(selected_major), tuple(selected_gender))
+    st.image(scatter_image(filtered_df, selected_var, max_points=max_points, cache_key=filter_key))
 else:
     st.write(f"📊 **{selected_var}**별 평균 시험 점수")
-    grouped = filtered_df.groupby(selected_var)["exam_score"].mean().sort_values()
+    grouped = cube.group_mean(selected_var, selected_major, selected_gender).sort_values()
     st.bar_chart(grouped)
 
 # 상관계수 히트맵 옵션
+if st.checkbox("상관계수 히트맵 보기"):
+    # seaborn/matplotlib 은 히트맵을 그릴 때만 import 한다
+    from matplotlib.figure import Figure
+    import seaborn as sns
+
+    corr = cube.corr(selected_major, selected_gender)
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+    sns.heatmap(corr, annot=True, fmt=".2f", cmap="coolwarm", vmin=-1, vmax=1, ax=ax)
+    st.pyplot(fig)
+    fig.clear()
+
+st.sidebar.caption(finish_page("00_학업성취도분석", _render_start))
@@ -1,7 +1,14 @@
+import time
+
+_render_start = time.perf_counter()  # 렌더 시간은 import 부터 잰다 (finish_page 로 넘김)
+
 import streamlit as st
-import pandas as pd
-from io import BytesIO
-import re
+
+from utils.excel_stream import sanitize_sheet_name, stream_sheets
+from utils.export import FORMATS, export_cache, output_mime, output_name, unique_sheet_names, upload_key
+from utils.parallel_parse import DEFAULT_WORKERS, parse_uploads, read_compact_frame
+from utils.parse_cache import parse_cache
+from utils.startup import finish_page
 
 st.title("엑셀 파일 → 시트 병합기")
 
@@ -11,28 +18,56 @@ uploaded_files = st.file_uploader(
     accept_multiple_files=True
 )
 
-if uploaded_files:
-    def sanitize_sheet_name(name):
-        # Excel 시트명은 최대 31자, 특수문자 불가
-        name = re.sub(r'[:\\/?*\[\]]', '', name)
-        return name[:31]
-
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        for uploaded_file in uploaded_files:
-            try:
-                df = pd.read_excel(uploaded_file)
-                sheet_name = sanitize_sheet_name(uploaded_file.name.replace('.xlsx', '').replace('.xls', ''))
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-            except Exception as e:
-                st.error(f"{uploaded_file.name} 읽기 실패: {e}")
-    output.seek(0)  # 저장 후 스트림의 시작으로 이동
+# 스트리밍: 행 단위로 바로 써서 메모리 사용량이 파일 크기와 무관
+# pandas: 기존 방식 (전체를 DataFrame으로 읽어서 씀)
+mode = st.radio("병합 방식", ["스트리밍 (대용량)", "pandas (기존)"], horizontal=True)
+workers = st.sidebar.number_input("병렬 파싱 프로세스 수", min_value=1, max_value=64, value=min(DEFAULT_WORKERS, 64))
+
+if uploaded_files and mode.startswith("스트리밍"):
+    # 여기서는 읽기만 해서 실패한 파일을 알리고, xlsx 는 버튼을 누를 때만 만든다.
+    # 읽은 요약은 업로드 묶음(파일별 내용 해시)별로 캐시해서 다시 돌 때는 파일을 읽지 않는다
+    key = upload_key(uploaded_files, "stream_sheets")
+    result = parse_cache.get_or_build(("stream_sheets", key), lambda: stream_sheets(uploaded_files))
+    for name, error in result.errors:
+        st.error(f"{name} 읽기 실패: {error}")
 
     st.success(f"{len(uploaded_files)}개의 파일이 하나의 엑셀 파일로 시트 병합되었습니다!")
 
+    # 같은 업로드 묶음이면 디스크 캐시에서 바로 준다
     st.download_button(
         label="엑셀로 다운로드",
-        data=output,
+        data=lambda: export_cache.read(key, "xlsx", write=lambda f: stream_sheets(uploaded_files, out=f)),
         file_name="시트별_병합된_파일.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
+
+elif uploaded_files:
+    parsed = parse_uploads(
+        uploaded_files, read_compact_frame, max_workers=workers, cache=parse_cache,
+        on_error=lambda name, e: st.error(f"{name} 읽기 실패: {e}"),
+    )
+    names = unique_sheet_names([
+        sanitize_sheet_name(f.name.replace('.xlsx', '').replace('.xls', '')) for f, _ in parsed
+    ])
+    sheets = [(name, df) for name, (_, df) in zip(names, parsed)]
+
+    st.success(f"{len(sheets)}개의 파일이 하나의 엑셀 파일로 시트 병합되었습니다!")
+
+    # 다운로드 파일은 버튼을 누를 때만 만들고, 같은 업로드 묶음이면 디스크 캐시에서 바로 준다
+    # (csv.gz/parquet 는 시트마다 파일 하나씩 zip 으로 묶임)
+    fmt = st.radio("다운로드 형식", list(FORMATS), format_func=lambda f: FORMATS[f].label, horizontal=True)
+    key = upload_key(uploaded_files, "sheets")
+    st.download_button(
+        label="다운로드",
+        data=lambda: export_cache.read(key, fmt, lambda: sheets),
+        file_name=output_name("시트별_병합된_파일", fmt, len(sheets)),
+        mime=output_mime(fmt, len(sheets)),
+    )
+
+# 파싱 캐시 적중/미스/퇴출 횟수 (캐시 크기 조정용)
+with st.sidebar.expander("파싱 캐시 상태"):
+    st.json(parse_cache.stats())
+    st.caption("내보내기 파일 캐시")
+    st.json(export_cache.stats())
+
+st.sidebar.caption(finish_page("01_엑셀합치기", _render_start))
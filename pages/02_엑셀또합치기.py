@@ -1,10 +1,16 @@
+import time
+
+_render_start = time.perf_counter()  # 렌더 시간은 import 부터 잰다 (finish_page 로 넘김)
+
 import streamlit as st
-from io import BytesIO
-import re
 from datetime import datetime
-from openpyxl import load_workbook, Workbook
-from openpyxl.utils import get_column_letter
-from copy import copy
+
+from utils.job_tasks import MERGE_OUTPUT
+from utils.jobs import CANCELLED, DONE, get_queue
+from utils.parallel_parse import DEFAULT_WORKERS
+from utils.parse_cache import digest
+from utils.stages import ENABLED as STAGES_ENABLED, recent_stages
+from utils.startup import finish_page
 
 st.title("엑셀 파일 → 시트 병합기 (완전 스타일 & 크기 보존)")
 
@@ -13,94 +19,85 @@ uploaded_files = st.file_uploader(
     type=["xlsx", "xls"],
     accept_multiple_files=True
 )
-
-def sanitize_sheet_name(name):
-    # Excel 시트명은 최대 31자, 특수문자 불가
-    name = re.sub(r'[:\\/?*\[\]]', '', name)
-    return name[:31]
+# openpyxl: 셀 단위로 다시 만들어 복사 (기존 방식)
+# XML 이식: 시트 XML 을 그대로 옮겨 담아 대용량 .xlsx 도 빠르게 병합
+engine = st.radio("병합 엔진", ["openpyxl (기존)", "XML 이식 (대용량 .xlsx)"], horizontal=True)
+workers = st.sidebar.number_input("병렬 파싱 프로세스 수", min_value=1, max_value=64, value=min(DEFAULT_WORKERS, 64))
+
+# 병합은 백그라운드 작업으로 (utils/jobs.py). 위젯을 건드리거나 새로고침해도
+# 작업은 계속되고, 작업 id 를 주소(?merge_job=...)에 남겨 결과를 다시 찾는다
+queue = get_queue()
+
+def show_merge_job(job_id):
+    job = queue.get(job_id)
+    if job is None:
+        st.query_params.pop("merge_job", None)
+        return
+    polling = job.active
+
+    def panel():
+        job = queue.get(job_id)
+        if job.active:
+            st.progress(job.progress, text=job.message or "대기 중...")
+            st.button("⏹ 병합 취소", on_click=queue.cancel, args=(job_id,), key=f"cancel_{job_id}")
+            return
+        if polling:
+            # 끝났으면 전체를 다시 그려서 주기적 조회를 멈춘다
+            st.rerun()
+
+        if job.status == DONE:
+            for name, e in job.result["errors"]:
+                st.error(f"{name} 읽기 실패: {e}")
+            st.success(f"{job.result['files']}개의 파일이 완전 보존되어 병합되었습니다!")
+            st.download_button(
+                label="엑셀로 다운로드",
+                data=queue.read_output(job_id, MERGE_OUTPUT),
+                file_name=job.result["filename"],
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+        elif job.status == CANCELLED:
+            st.warning("병합이 취소되었습니다.")
+        else:
+            st.error(f"병합 실패: {job.error.splitlines()[0] if job.error else ''}")
+
+    st.fragment(panel, run_every=1.0 if polling else None)()
 
 if uploaded_files:
-    output = BytesIO()
     # 첫번째 파일명(확장자 제외)
     first_base = uploaded_files[0].name.rsplit('.', 1)[0]
     count = len(uploaded_files)
     # 오늘 날짜 MMDD 형식으로
     date_str = datetime.now().strftime("%m%d")
 
-    # 새 워크북 생성, 기본 시트 제거
-    target_wb = Workbook()
-    target_wb.remove(target_wb.active)
-
-    for uploaded_file in uploaded_files:
-        try:
-            src_wb = load_workbook(uploaded_file, data_only=False)
-            src = src_wb[src_wb.sheetnames[0]]
-            title = sanitize_sheet_name(uploaded_file.name.rsplit('.', 1)[0])
-            tgt = target_wb.create_sheet(title=title)
-
-            # 기본 행 높이/열 너비 복제
-            tgt.sheet_format.defaultRowHeight = src.sheet_format.defaultRowHeight
-            tgt.sheet_format.defaultColWidth  = src.sheet_format.defaultColWidth
-
-            max_row = src.max_row
-            max_col = src.max_column
-
-            # 모든 열 너비·속성 복사
-            for col_idx in range(1, max_col+1):
-                col = get_column_letter(col_idx)
-                src_dim = src.column_dimensions.get(col, None)
-                tgt_dim = tgt.column_dimensions[col]
-                if src_dim and src_dim.width is not None:
-                    tgt_dim.width = src_dim.width
-                else:
-                    tgt_dim.width = src.sheet_format.defaultColWidth
-                tgt_dim.hidden = src_dim.hidden if src_dim else False
-                tgt_dim.outlineLevel = src_dim.outlineLevel if src_dim else 0
-                tgt_dim.bestFit = src_dim.bestFit if src_dim else False
-
-            # 모든 행 높이·속성 복사
-            for row_idx in range(1, max_row+1):
-                src_dim = src.row_dimensions.get(row_idx, None)
-                tgt_dim = tgt.row_dimensions[row_idx]
-                if src_dim and src_dim.height is not None:
-                    tgt_dim.height = src_dim.height
-                else:
-                    tgt_dim.height = src.sheet_format.defaultRowHeight
-                tgt_dim.hidden = src_dim.hidden if src_dim else False
-                tgt_dim.outlineLevel = src_dim.outlineLevel if src_dim else 0
-
-            # 병합 셀 복사
-            for merged in src.merged_cells.ranges:
-                tgt.merge_cells(str(merged))
-
-            # Freeze panes 복사
-            tgt.freeze_panes = src.freeze_panes
-
-            # 셀 값 + 스타일 복사
-            for row in src.iter_rows():
-                for cell in row:
-                    nc = tgt.cell(row=cell.row, column=cell.column, value=cell.value)
-                    if cell.has_style:
-                        nc.font = copy(cell.font)
-                        nc.border = copy(cell.border)
-                        nc.fill = copy(cell.fill)
-                        nc.number_format = cell.number_format
-                        nc.protection = copy(cell.protection)
-                        nc.alignment = copy(cell.alignment)
-
-        except Exception as e:
-            st.error(f"{uploaded_file.name} 읽기 실패: {e}")
-
-    # 저장
-    target_wb.save(output)
-    output.seek(0)
-
-    # “첫번째파일명 파일수 (병합)_오늘날짜MMDD.xlsx”
-    filename = f"{first_base} ({count}개 병합)_{date_str}.xlsx"
-    st.success(f"{count}개의 파일이 완전 보존되어 병합되었습니다!")
-    st.download_button(
-        label="엑셀로 다운로드",
-        data=output.getvalue(),
-        file_name=filename,
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    # 같은 파일 묶음 + 같은 엔진이면 끝났거나 진행 중인 작업을 그대로 재사용
+    merge_key = repr(("merge", engine, tuple((f.name, digest(f.getvalue())) for f in uploaded_files)))
+    job = queue.find(merge_key)
+    if job is None:
+        # “첫번째파일명 파일수 (병합)_오늘날짜MMDD.xlsx”
+        filename = f"{first_base} ({count}개 병합)_{date_str}.xlsx"
+        job_id = queue.submit(
+            "utils.job_tasks:merge_excel",
+            {"engine": engine, "workers": int(workers), "filename": filename},
+            dedupe_key=merge_key,
+            inputs=[(f.name, f.getvalue()) for f in uploaded_files],
+        )
+    else:
+        job_id = job.id
+    st.query_params["merge_job"] = job_id
+
+if "merge_job" in st.query_params:
+    show_merge_job(st.query_params["merge_job"])
+
+# 파싱 캐시 적중/미스/퇴출 횟수 (캐시 크기 조정용). 파싱은 작업 워커에서 하므로
+# 이 서버 프로세스의 캐시가 아니라 마지막 병합 작업이 보고한 워커의 값을 보여준다
+merge_job = queue.get(st.query_params["merge_job"]) if "merge_job" in st.query_params else None
+if merge_job is not None and merge_job.result and "parse_cache" in merge_job.result:
+    with st.sidebar.expander("파싱 캐시 상태 (작업 워커)"):
+        st.json(merge_job.result["parse_cache"])
+
+# 단계별 시간/메모리 (STAGE_PROFILE=1 일 때만, 병합 작업 워커에서 잰 단계)
+if STAGES_ENABLED:
+    with st.sidebar.expander("⏱ 단계별 시간/메모리"):
+        st.dataframe(recent_stages("02:"))
+
+st.sidebar.caption(finish_page("02_엑셀또합치기", _render_start))
@@ -1,10 +1,16 @@
 # 필요한 라이브러리 설치:
 # pip install streamlit youtube-transcript-api
 
+import time
+
+_render_start = time.perf_counter()  # 렌더 시간은 import 부터 잰다 (finish_page 로 넘김)
+
 import streamlit as st
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
 from urllib.parse import urlparse, parse_qs
 
+from utils.startup import finish_page
+from utils.transcript_batch import build_zip, default_provider, fetch_many, fetch_one, parse_inputs
+
 # YouTube URL에서 video_id 추출
 def extract_video_id(url):
     parsed = urlparse(url)
@@ -16,40 +22,73 @@ def extract_video_id(url):
 
 # 공개 자막(스크립트) 가져오기
 def get_transcript(video_id):
-    try:
-        transcripts = YouTubeTranscriptApi.list_transcripts(video_id)
-        # 한국어, 영어 순으로 시도
-        transcript = transcripts.find_transcript(['ko', 'en'])
-        segments = transcript.fetch()
-        # 텍스트만 합치기
-        text = "\n".join([seg['text'] for seg in segments])
-        return text
-    except TranscriptsDisabled:
-        return None
-    except Exception:
-        return None
+    # 한국어, 영어 순으로 시도 (제한 시간/재시도/디스크 캐시는 utils/transcript_batch.py)
+    result = fetch_one(video_id, default_provider())
+    return result.text
 
 # Streamlit 앱
 st.title("📝 YouTube 스크립트 가져오기")
-youtube_url = st.text_input("유튜브 링크를 입력하세요:")
-
-if youtube_url:
-    vid = extract_video_id(youtube_url)
-    if not vid:
-        st.error("❌ 유효한 유튜브 링크가 아닙니다.")
-    else:
-        st.info("자막(스크립트) 불러오는 중...")
-        transcript = get_transcript(vid)
-        if transcript:
-            st.success("✅ 스크립트 가져오기 성공!")
-            # 스크립트 출력
-            st.text_area("스크립트", transcript, height=300)
-            # 텍스트 파일로 다운로드
+mode = st.radio("모드", ["단일 URL", "여러 URL / 재생목록"], horizontal=True)
+
+if mode == "단일 URL":
+    youtube_url = st.text_input("유튜브 링크를 입력하세요:")
+
+    if youtube_url:
+        vid = extract_video_id(youtube_url)
+        if not vid:
+            st.error("❌ 유효한 유튜브 링크가 아닙니다.")
+        else:
+            st.info("자막(스크립트) 불러오는 중...")
+            transcript = get_transcript(vid)
+            if transcript:
+                st.success("✅ 스크립트 가져오기 성공!")
+                # 스크립트 출력
+                st.text_area("스크립트", transcript, height=300)
+                # 텍스트 파일로 다운로드
+                st.download_button(
+                    label="📥 스크립트 다운로드",
+                    data=transcript,
+                    file_name=f"{vid}_transcript.txt",
+                    mime="text/plain"
+                )
+            else:
+                st.error("❌ 공개 자막(스크립트)을 가져올 수 없습니다.")
+
+else:
+    urls = st.text_area("유튜브 링크 또는 재생목록 링크를 한 줄에 하나씩 입력하세요:", height=200)
+
+    if st.button("📥 스크립트 모두 가져오기") and urls.strip():
+        with st.spinner("재생목록/링크 확인 중..."):
+            video_ids = parse_inputs(urls, on_error=lambda token, e: st.warning(f"⚠️ {token}: {e}"))
+        if not video_ids:
+            st.error("❌ 가져올 영상이 없습니다.")
+        else:
+            progress = st.progress(0.0)
+            done = []
+
+            def on_result(result):
+                done.append(result)
+                progress.progress(len(done) / len(video_ids), text=f"{len(done)}/{len(video_ids)} 완료")
+
+            results = fetch_many(video_ids, on_result=on_result)
+            ok = [r for r in results if r.text is not None]
+            st.success(f"✅ {len(ok)}/{len(results)}개 스크립트 가져오기 완료 (캐시 {sum(r.cached for r in results)}개)")
+            st.dataframe([
+                {
+                    "영상 ID": r.video_id,
+                    "언어": r.lang,
+                    "글자 수": len(r.text) if r.text else 0,
+                    "캐시": r.cached,
+                    "시도": r.attempts,
+                    "오류": r.error,
+                }
+                for r in results
+            ])
             st.download_button(
-                label="📥 스크립트 다운로드",
-                data=transcript,
-                file_name=f"{vid}_transcript.txt",
-                mime="text/plain"
+                label="📦 스크립트 전체 다운로드 (.zip)",
+                data=build_zip(results),
+                file_name="transcripts.zip",
+                mime="application/zip"
             )
-        else:
-            st.error("❌ 공개 자막(스크립트)을 가져올 수 없습니다.")
+
+st.sidebar.caption(finish_page("03_유튜브PPT로만들기", _render_start))
@@ -1,99 +1,93 @@
-# ─── ffmpeg 경로 먼저 셋업 ──────────────────────────────────────────
-import os
+# ffmpeg 경로는 필요할 때 utils/audio_pipe.py 가 찾고, whisper/torch/yt_dlp 는
+# 실제로 쓰는 작업 워커/함수 안에서 import 한다 (첫 화면을 빨리 그리기 위해)
+import time
+
+_render_start = time.perf_counter()  # 렌더 시간은 import 부터 잰다 (finish_page 로 넘김)
 
-import imageio_ffmpeg as ffmpeg_io
-# imageio-ffmpeg 가 내려받은 바이너리 절대경로
-ffmpeg_path = ffmpeg_io.get_ffmpeg_exe()
-# PATH 에 추가
-ffmpeg_dir = os.path.dirname(ffmpeg_path)
-os.environ["PATH"] = ffmpeg_dir + os.pathsep + os.environ.get("PATH", "")
-# Whisper 가 쓰는 env var 도 설정
-os.environ["FFMPEG_BINARY"] = ffmpeg_path
-
-# ─── 나머지 import ─────────────────────────────────────────────────
-import subprocess
-import json
-import tempfile
-import datetime
+import os
 from typing import Optional
 
 import streamlit as st
-import whisper
+
+from utils.job_tasks import PARTIAL_SRT, SRT_OUTPUT
+from utils.jobs import CANCELLED, DONE, get_queue
+from utils.stages import ENABLED as STAGES_ENABLED, recent_stages, stage
+from utils.startup import finish_page
+from utils.transcribe import sub_lines_to_text
+from utils.video_cache import ExtractError, fetch_video, video_cache, video_id
+from utils.whisper_pool import (DEFAULT_MODEL, DEFAULT_QUANTIZE, DEFAULT_THREADS, MODEL_SIZES, cuda_available,
+                                model_key, transcript_key)
+
+# Whisper 인식 언어 (자동 감지는 앞 30초로 언어를 추정)
+LANGUAGES = {"자동 감지": None, "한국어": "ko", "영어": "en", "일본어": "ja", "중국어": "zh"}
 
 # ─── 헬퍼 함수들 ────────────────────────────────────────────────────
-def format_time(seconds: float) -> str:
-    """SRT 타임코드 형식으로 변경: HH:MM:SS,mmm"""
-    td = datetime.timedelta(seconds=seconds)
-    total = td.total_seconds()
-    h = int(total // 3600)
-    m = int((total % 3600) // 60)
-    s = int(total % 60)
-    ms = int((total - int(total)) * 1000)
-    return f"{h:02}:{m:02}:{s:02},{ms:03}"
-
-def get_subtitles(url: str) -> Optional[str]:
-    """yt-dlp 메타 → 수동 자막(.vtt) 다운로드"""
-    proc = subprocess.run(
-        ["yt-dlp", "-J", url],
-        capture_output=True, text=True
-    )
-    if proc.returncode != 0:
+def get_video(url: str) -> Optional[dict]:
+    """yt-dlp 메타데이터 + 수동 자막 (같은 영상은 디스크 캐시에서 바로)"""
+    try:
+        with stage("04:extract"):
+            return fetch_video(url)
+    except ExtractError:
         st.error("메타데이터를 가져오는 데 실패했습니다.")
         return None
 
-    meta = json.loads(proc.stdout)
-    subs = meta.get("subtitles", {})
-    if not subs:
-        return None
+def whisper_settings() -> dict:
+    """사이드바의 Whisper 설정 → transcribe_video 작업 인자 (url 제외)"""
+    with st.sidebar.expander("Whisper 설정"):
+        size = st.selectbox("모델 크기", MODEL_SIZES, index=MODEL_SIZES.index(DEFAULT_MODEL)
+                            if DEFAULT_MODEL in MODEL_SIZES else 0)
+        # GPU 없는 서버용: 선형 층을 int8 로 양자화 (빠르고 가볍지만 정확도가 조금 다를 수 있음)
+        quantize = st.checkbox("CPU int8 양자화", value=DEFAULT_QUANTIZE, help="GPU(CUDA)가 있으면 쓰지 않습니다")
+        if quantize and cuda_available():
+            st.caption("GPU(CUDA)가 있어서 int8 대신 float32 로 인식합니다")
+        language = LANGUAGES[st.selectbox("언어", list(LANGUAGES))]
+        beam_size = st.slider("빔 크기 (1 = 탐욕 디코딩)", 1, 5, 1)
+        threads = st.number_input("연산 스레드 수 (0 = 자동)", min_value=0, max_value=os.cpu_count() or 1,
+                                  value=min(DEFAULT_THREADS, os.cpu_count() or 1))
+    return {"model_name": model_key(size, quantize), "language": language,
+            "beam_size": beam_size, "threads": int(threads)}
+
+def show_whisper_job(queue, job_id: str):
+    """Whisper 작업 진행률/중간 자막/결과 (진행 중이면 1초마다 다시 조회)"""
+    job = queue.get(job_id)
+    if job is None:
+        st.query_params.pop("whisper_job", None)
+        return
+    polling = job.active
+
+    def panel():
+        job = queue.get(job_id)
+        if job.active:
+            st.progress(job.progress, text=job.message or "대기 중...")
+            st.button("⏹ 인식 취소", on_click=queue.cancel, args=(job_id,), key=f"cancel_{job_id}")
+            partial = queue.read_output(job_id, PARTIAL_SRT)
+            if partial:
+                # 끝난 구간까지의 자막을 바로 보여준다
+                st.text_area("인식된 자막 (진행 중)", partial.decode("utf-8")[-20000:], height=300)
+            return
+        if polling:
+            # 끝났으면 전체를 다시 그려서 주기적 조회를 멈춘다
+            st.rerun()
+
+        if job.status == DONE:
+            srt = queue.read_output(job_id, SRT_OUTPUT).decode("utf-8")
+            st.success("Whisper 자막 생성 완료!")
+            data = sub_lines_to_text(srt.splitlines()).encode("utf-8")
+            st.download_button("생성된 자막 다운로드 (.txt)", data, f"{job.result['video_id']}.whisper.txt", "text/plain")
+        elif job.status == CANCELLED:
+            st.warning("Whisper 인식이 취소되었습니다.")
+        else:
+            st.error(f"Whisper 인식 실패: {job.error.splitlines()[0] if job.error else ''}")
 
-    lang, _ = next(iter(subs.items()))
-    tmp_vtt = tempfile.NamedTemporaryFile(suffix=".vtt", delete=False).name
-    dl = subprocess.run([
-        "yt-dlp", url,
-        "--skip-download",
-        "--write-sub",
-        "--sub-lang", lang,
-        "--sub-format", "vtt",
-        "-o", tmp_vtt
-    ])
-    if dl.returncode == 0 and os.path.exists(tmp_vtt):
-        return tmp_vtt
-
-    st.error("기존 자막 다운로드에 실패했습니다.")
-    return None
-
-def convert_sub_to_txt(sub_path: str) -> str:
-    """.vtt/.srt → 순수 텍스트(.txt) 추출"""
-    txt_path = sub_path.rsplit(".", 1)[0] + ".txt"
-    lines = []
-    with open(sub_path, "r", encoding="utf-8") as f:
-        for line in f:
-            t = line.strip()
-            if not t or t.isdigit() or "-->" in t:
-                continue
-            lines.append(t)
-    with open(txt_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
-    return txt_path
-
-def transcribe_with_whisper(audio_path: str) -> str:
-    """Whisper 로 음성인식 → .srt 생성"""
-    model = whisper.load_model("base")
-    result = model.transcribe(audio_path)
-
-    srt_path = audio_path + ".srt"
-    with open(srt_path, "w", encoding="utf-8") as f:
-        for i, seg in enumerate(result["segments"], start=1):
-            start = format_time(seg["start"])
-            end   = format_time(seg["end"])
-            text  = seg["text"].strip()
-            f.write(f"{i}\n{start} --> {end}\n{text}\n\n")
-    return srt_path
+    st.fragment(panel, run_every=1.0 if polling else None)()
 
 # ─── Streamlit 앱 ────────────────────────────────────────────────────
 def main():
     st.title("📥 유튜브 자막(.txt) 다운로드 / Whisper 자막 생성(.txt)")
     url = st.text_input("유튜브 영상 URL을 입력하세요")
+    queue = get_queue()
+    settings = whisper_settings()
+    cache_key = transcript_key(settings["model_name"], settings["language"], settings["beam_size"])
 
     if st.button("자막 가져오기"):
         if not url:
@@ -102,29 +96,53 @@ def main():
 
         # 1) 기존 자막 시도
         with st.spinner("기존 자막 검색 중..."):
-            sub = get_subtitles(url)
+            video = get_video(url)
+        if video is None:
+            return
 
+        vid = video_id(url)
+        sub = video.get("subtitle")
+        if video.get("subtitle_error"):
+            st.warning(f"자막 파일을 받지 못했습니다 ({video['subtitle_error']})")
+        cached_srt = (video.get("transcripts") or {}).get(cache_key)
         if sub:
-            txt = convert_sub_to_txt(sub)
+            st.query_params.pop("whisper_job", None)
             st.success("기존 자막 다운로드 완료!")
-            data = open(txt, "rb").read()
-            st.download_button("자막 다운로드 (.txt)", data, os.path.basename(txt), "text/plain")
+            data = sub_lines_to_text(sub["text"].splitlines()).encode("utf-8")
+            st.download_button("자막 다운로드 (.txt)", data, f"{vid}.{sub['lang']}.txt", "text/plain")
+
+        elif cached_srt:
+            # 예전에 Whisper 로 만든 자막이 캐시에 있다
+            st.query_params.pop("whisper_job", None)
+            st.success("Whisper 자막 (캐시) 불러오기 완료!")
+            data = sub_lines_to_text(cached_srt.splitlines()).encode("utf-8")
+            st.download_button("생성된 자막 다운로드 (.txt)", data, f"{vid}.whisper.txt", "text/plain")
 
         else:
-            # 2) 없으면 Whisper 음성인식
+            # 2) 없으면 Whisper 음성인식 — 백그라운드 작업으로 돌려서 위젯을 건드리거나
+            # 새로고침해도 끊기지 않는다. 작업 id 는 주소(?whisper_job=...)에 남긴다
             st.info("기존 자막이 없어 Whisper로 생성합니다...")
-            audio_tmp = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False).name
-
-            with st.spinner("오디오 다운로드 중..."):
-                subprocess.run(["yt-dlp", url, "-f", "bestaudio", "-o", audio_tmp], check=True)
-
-            with st.spinner("Whisper 인식 중..."):
-                srt = transcribe_with_whisper(audio_tmp)
-
-            txt = convert_sub_to_txt(srt)
-            st.success("Whisper 자막 생성 완료!")
-            data = open(txt, "rb").read()
-            st.download_button("생성된 자막 다운로드 (.txt)", data, os.path.basename(txt), "text/plain")
+            st.query_params["whisper_job"] = queue.submit(
+                "utils.job_tasks:transcribe_video",
+                {"url": url, **settings},
+                dedupe_key=f"whisper:{vid}:{cache_key}",
+            )
+
+    if "whisper_job" in st.query_params:
+        show_whisper_job(queue, st.query_params["whisper_job"])
+
+    with st.sidebar.expander("백그라운드 작업"):
+        st.dataframe([
+            {"id": j.id, "작업": j.task.rsplit(":", 1)[-1], "상태": j.status, "진행률": round(j.progress, 2)}
+            for j in queue.list(10)
+        ])
+    with st.sidebar.expander("영상 캐시 상태"):
+        st.json(video_cache.stats())
+    # 단계별 시간/메모리 (STAGE_PROFILE=1 일 때만, Whisper 작업 워커에서 잰 단계 포함)
+    if STAGES_ENABLED:
+        with st.sidebar.expander("⏱ 단계별 시간/메모리"):
+            st.dataframe(recent_stages("04:"))
 
 if __name__ == "__main__":
     main()
+    st.sidebar.caption(finish_page("04_유튜브자막", _render_start))
@@ -1,46 +1,25 @@
+import time
+
+_render_start = time.perf_counter()  # 렌더 시간은 import 부터 잰다 (finish_page 로 넘김)
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import time
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.compose import ColumnTransformer
+from utils.parse_cache import digest, estimate_size, parse_cache
+from utils.similarity import load_artifacts, score_roster, transform_dataset
+from utils.stages import ENABLED as STAGES_ENABLED, recent_stages, stage
+from utils.startup import finish_page
+from utils.student_data import dataset_signature, load_students
 
 # --- 1) 데이터 로드 및 전처리 캐시 ---
-@st.cache_data
 def load_data():
-    df = pd.read_csv('enhanced_student_habits_performance_dataset.csv')
-    numeric_cols = [
-        'age','study_hours_per_day','social_media_hours','netflix_hours',
-        'attendance_percentage','sleep_hours','exercise_frequency',
-        'screen_time','parental_support_level','motivation_level','exam_anxiety_score'
-    ]
-    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
-    df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
-    return df
+    # 수치 변환과 중앙값 계산은 Parquet 으로 바꿀 때 한 번만 (utils/student_data.py)
+    return load_students(fill_numeric=True)
 
 @st.cache_resource
-def create_preprocessor(df, numeric_features, categorical_features):
-    df_copy = df[numeric_features + categorical_features].copy()
-    df_copy[numeric_features] = df_copy[numeric_features].apply(pd.to_numeric, errors='coerce')
-    df_copy[categorical_features] = df_copy[categorical_features].astype(str)
-    num_t = StandardScaler()
-    cat_t = OneHotEncoder(handle_unknown='ignore', sparse_output=False)
-    pre = ColumnTransformer([
-        ('num', num_t, numeric_features),
-        ('cat', cat_t, categorical_features)
-    ])
-    pre.fit(df_copy)
-    return pre
-
-
-def transform_dataset(df, preprocessor, feature_cols):
-    df2 = df[feature_cols].copy()
-    num_feats = preprocessor.transformers_[0][2]
-    cat_feats = preprocessor.transformers_[1][2]
-    df2[num_feats] = df2[num_feats].apply(pd.to_numeric, errors='coerce')
-    df2[cat_feats] = df2[cat_feats].astype(str)
-    X = preprocessor.transform(df2)
-    return np.nan_to_num(X, nan=0.0, posinf=np.inf, neginf=-np.inf)
+def load_similarity(signature, numeric_features, categorical_features):
+    # 전처리기와 특성 행렬은 디스크에 저장해 두고 mmap 으로 연다 (utils/similarity.py)
+    # 인자는 서명과 특성 목록뿐이라 DataFrame 전체를 해시하지 않는다
+    return load_artifacts(load_data(), signature, numeric_features, categorical_features)
 
 # --- 앱 시작 ---
 def main():
@@ -60,8 +39,9 @@ def main():
         'family_income_range','learning_style'
     ]
     all_feats = numeric_features + categorical_features
-    pre = create_preprocessor(df, numeric_features, categorical_features)
-    X_all = transform_dataset(df, pre, all_feats)
+    # 전처리기(sklearn)는 조회할 때 처음 불러온다 → 첫 화면은 sklearn import 를 기다리지 않음
+    def similarity():
+        return load_similarity(dataset_signature(), tuple(numeric_features), tuple(categorical_features))
 
     # 한글 라벨 매핑
     labels = {
@@ -101,6 +81,7 @@ def main():
     for feat in categorical_features:
         options = df[feat].dropna().unique().tolist()
         user_input[feat] = st.sidebar.selectbox(labels[feat], options)
+    k = st.sidebar.slider('참고할 유사 학생 수 (k)', 1, 20, 1)
     if st.sidebar.button('🔍 조회하기'):
         st.session_state.user_input = user_input
         st.session_state.show_result = True
@@ -108,18 +89,17 @@ def main():
     # 메인 결과 영역
     st.header('✨ 결과')
     if st.session_state.show_result:
-        placeholder = st.empty()
-        for i in range(3, 0, -1):
-            placeholder.info(f"⏳ {i}초 후 결과 표시 중...")
-            time.sleep(1)
-        placeholder.empty()
         ui = st.session_state.user_input
         inp_df = pd.DataFrame([ui])
         inp_df[numeric_features] = inp_df[numeric_features].apply(pd.to_numeric, errors='coerce')
         inp_df[categorical_features] = inp_df[categorical_features].astype(str)
-        X_in = transform_dataset(inp_df, pre, all_feats)
-        dists = np.linalg.norm(X_all - X_in, axis=1)
-        idx = np.argmin(dists)
+        with stage("05:load_artifacts"):
+            artifacts = similarity()
+        with stage("05:transform", rows=len(inp_df)):
+            X_in = transform_dataset(inp_df, artifacts.preprocessor, all_feats)
+        with stage("05:knn_search", rows=len(df)):
+            result = artifacts.index.query(X_in, k=k)
+        idx = result.indices[0, 0]
         sim = df.iloc[idx]
         st.subheader('👤 가장 유사한 학생 정보')
         st.json({
@@ -127,9 +107,57 @@ def main():
             '시험 불안 점수': int(sim['exam_anxiety_score']),
             '최종 시험 점수': int(sim['exam_score'])
         })
-        st.success(f"🎉 예상 점수: {int(sim['exam_score'])}점 🎉")
+        if k > 1:
+            neighbors = df.iloc[result.indices[0]][['attendance_percentage', 'exam_anxiety_score', 'exam_score']]
+            st.dataframe(neighbors.assign(거리=result.distances[0]))
+        # k 명의 점수를 거리 역수로 가중 평균 (k=1 이면 가장 유사한 학생 점수)
+        st.success(f"🎉 예상 점수: {round(float(result.scores[0]))}점 🎉")
     else:
         st.info('▶️ 사이드바에서 특성을 입력 후, [🔍 조회하기] 버튼을 눌러주세요.')
 
+    # 명단 일괄 조회
+    st.header('📂 명단 일괄 조회')
+    roster_file = st.file_uploader('학생 명단 (CSV 또는 엑셀)', type=['csv', 'xlsx', 'xls'])
+    if roster_file is not None:
+        # 결과는 (명단 내용 해시, 데이터셋, k) 별로 캐시해서 다른 위젯을 건드리거나
+        # 다운로드를 눌러 스크립트가 다시 돌아도 명단 전체를 다시 조회하지 않는다
+        key = ("roster", digest(roster_file.getvalue()), dataset_signature(), k)
+        scored = parse_cache.get(key)
+        if scored is None:
+            if roster_file.name.lower().endswith('.csv'):
+                roster = pd.read_csv(roster_file)
+            else:
+                roster = pd.read_excel(roster_file)
+            missing = [f for f in all_feats if f not in roster.columns]
+            if missing:
+                st.error(f"명단에 필요한 열이 없습니다: {', '.join(missing)}")
+                return
+
+            progress = st.progress(0.0)
+            start = time.perf_counter()
+            with stage("05:load_artifacts"):
+                artifacts = similarity()
+            with stage("05:roster", size=roster_file.size, rows=len(roster)):
+                scored = score_roster(roster, artifacts, df, k, progress=progress.progress)
+            elapsed = time.perf_counter() - start
+            progress.empty()
+            parse_cache.put(key, scored, estimate_size(scored))
+            st.success(f"{len(scored)}명 조회 완료 ({len(scored) / max(elapsed, 1e-9):,.0f}행/초, {elapsed:.2f}초)")
+        else:
+            st.success(f"{len(scored)}명 조회 완료 (이전 결과)")
+
+        st.dataframe(scored.head(100))
+        st.download_button(
+            '📥 결과 다운로드 (.csv)',
+            lambda: scored.to_csv(index=False).encode('utf-8-sig'),
+            file_name=roster_file.name.rsplit('.', 1)[0] + '_예상점수.csv',
+            mime='text/csv'
+        )
+
 if __name__ == '__main__':
     main()
+    # 단계별 시간/메모리 (STAGE_PROFILE=1 일 때만)
+    if STAGES_ENABLED:
+        with st.sidebar.expander("⏱ 단계별 시간/메모리"):
+            st.dataframe(pd.DataFrame(recent_stages("05:")))
+    st.sidebar.caption(finish_page("05_이게되나", _render_start))
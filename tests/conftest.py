@@ -0,0 +1,5 @@
+# 테스트에서 저장소 루트의 utils 패키지를 import 할 수 있게 한다
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
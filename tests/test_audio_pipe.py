@@ -0,0 +1,62 @@
+# utils/audio_pipe.py: 로컬 미디어 파일로 다운로더 없이 파이프를 시험한다
+import os
+import tempfile
+import wave
+
+import numpy as np
+import pytest
+
+from utils.audio_pipe import SAMPLE_RATE, AudioPipeError, decode_audio
+
+SECONDS = 2
+
+
+@pytest.fixture
+def tmp_env(tmp_path, monkeypatch):
+    """임시 폴더를 따로 잡아서 디코딩 뒤에 남은 파일이 없는지 볼 수 있게 한다"""
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    monkeypatch.setenv("TMPDIR", str(scratch))
+    monkeypatch.setattr(tempfile, "tempdir", str(scratch))
+    return tmp_path, scratch
+
+
+def _write_wav(path, seconds=SECONDS):
+    t = np.arange(seconds * SAMPLE_RATE) / SAMPLE_RATE
+    pcm = (np.sin(2 * np.pi * 440 * t) * 0.5 * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(pcm.tobytes())
+    return pcm.astype(np.float32) / 32768
+
+
+def test_path_file_object_and_command_match(tmp_env):
+    root, scratch = tmp_env
+    wav = root / "tone.wav"
+    expected = _write_wav(wav)
+
+    by_path = decode_audio(str(wav))
+    with open(wav, "rb") as f:
+        by_file = decode_audio(f)
+    by_command = decode_audio(["cat", str(wav)])
+
+    assert by_path.dtype == np.float32
+    assert len(by_path) == len(expected)
+    np.testing.assert_allclose(by_path, expected, atol=1e-4)
+    np.testing.assert_array_equal(by_path, by_file)
+    np.testing.assert_array_equal(by_path, by_command)
+
+    # 중간 파일 없이 메모리로만 받는다
+    assert os.listdir(scratch) == []
+    assert sorted(os.listdir(root)) == ["scratch", "tone.wav"]
+
+
+def test_failures_raise_with_message(tmp_env):
+    root, scratch = tmp_env
+    with pytest.raises(AudioPipeError, match="ffmpeg"):
+        decode_audio(str(root / "missing.wav"))
+    with pytest.raises(AudioPipeError, match="다운로드 실패"):
+        decode_audio(["sh", "-c", "echo nope >&2; exit 3"])
+    assert os.listdir(scratch) == []
@@ -0,0 +1,102 @@
+# utils/transcript_batch.py: 네트워크 없이 FakeTranscriptProvider 로 fetch_many 를 시험한다
+import io
+import time
+import zipfile
+
+import pytest
+
+from utils import transcript_batch
+from utils.transcript_batch import FakeTranscriptProvider, TranscriptCache, build_zip, fetch_many
+
+
+@pytest.fixture
+def transcripts(tmp_path):
+    root = tmp_path / "fake"
+    root.mkdir()
+    (root / "aaaaaaaaaaa.ko.txt").write_text("안녕하세요\n반갑습니다", encoding="utf-8")
+    (root / "bbbbbbbbbbb.en.txt").write_text("hello\nworld", encoding="utf-8")
+    (root / "ccccccccccc.ko.txt").write_text("다시 시도", encoding="utf-8")
+    return str(root)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TranscriptCache(str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """백오프 대기 시간을 기록한다 (흔들기는 0 으로, 실제로는 아주 짧게 잔다)"""
+    recorded = []
+    real_sleep = time.sleep
+    monkeypatch.setattr(transcript_batch, "BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(transcript_batch.random, "random", lambda: 0.0)
+
+    def sleep(seconds):
+        recorded.append(seconds)
+        real_sleep(seconds)
+    monkeypatch.setattr(transcript_batch.time, "sleep", sleep)
+    return recorded
+
+
+def test_language_fallback_and_no_transcript(transcripts, cache):
+    provider = FakeTranscriptProvider(transcripts)
+    results = fetch_many(["aaaaaaaaaaa", "bbbbbbbbbbb", "zzzzzzzzzzz"], provider, cache=cache, retries=2)
+
+    assert [r.video_id for r in results] == ["aaaaaaaaaaa", "bbbbbbbbbbb", "zzzzzzzzzzz"]
+    assert (results[0].lang, results[0].text) == ("ko", "안녕하세요\n반갑습니다")
+    assert (results[1].lang, results[1].text) == ("en", "hello\nworld")
+    # 자막 없음은 다시 시도하지 않는다
+    assert results[2].text is None and "no transcript" in results[2].error
+    assert results[2].attempts == 1 and provider.calls["zzzzzzzzzzz"] == 1
+
+
+def test_retry_with_backoff(transcripts, cache, sleeps):
+    provider = FakeTranscriptProvider(transcripts, fail_first={"ccccccccccc": 2})
+    [result] = fetch_many(["ccccccccccc"], provider, cache=cache, retries=3)
+
+    assert result.text == "다시 시도" and result.error is None
+    assert result.attempts == 3 and provider.calls["ccccccccccc"] == 3
+    assert sleeps == [0.01, 0.02]
+
+
+def test_retries_exhausted(transcripts, cache, sleeps):
+    provider = FakeTranscriptProvider(transcripts, fail_first={"ccccccccccc": 5})
+    [result] = fetch_many(["ccccccccccc"], provider, cache=cache, retries=2)
+
+    assert result.text is None and result.error.startswith("ConnectionError")
+    assert result.attempts == 3
+    assert sleeps == [0.01, 0.02]
+    assert cache.get("ccccccccccc", ["ko", "en"]) is None
+
+
+def test_timeout(transcripts, cache):
+    provider = FakeTranscriptProvider(transcripts, delay=1.0)
+    start = time.perf_counter()
+    [result] = fetch_many(["aaaaaaaaaaa"], provider, cache=cache, timeout=0.05, retries=0)
+
+    assert result.text is None and result.error.startswith("TimeoutError")
+    assert time.perf_counter() - start < 0.9
+
+
+def test_second_run_hits_cache(transcripts, cache):
+    provider = FakeTranscriptProvider(transcripts)
+    first = fetch_many(["aaaaaaaaaaa", "bbbbbbbbbbb"], provider, cache=cache)
+    second = fetch_many(["aaaaaaaaaaa", "bbbbbbbbbbb"], provider, cache=cache)
+
+    assert not any(r.cached for r in first)
+    assert all(r.cached for r in second)
+    assert [(r.lang, r.text) for r in second] == [(r.lang, r.text) for r in first]
+    assert provider.calls == {"aaaaaaaaaaa": 1, "bbbbbbbbbbb": 1}
+
+
+def test_zip_contents(transcripts, cache):
+    provider = FakeTranscriptProvider(transcripts)
+    results = fetch_many(["aaaaaaaaaaa", "bbbbbbbbbbb", "zzzzzzzzzzz"], provider, cache=cache)
+
+    with zipfile.ZipFile(io.BytesIO(build_zip(results))) as zf:
+        assert sorted(zf.namelist()) == [
+            "_errors.txt", "aaaaaaaaaaa_ko_transcript.txt", "bbbbbbbbbbb_en_transcript.txt",
+        ]
+        assert zf.read("aaaaaaaaaaa_ko_transcript.txt").decode("utf-8") == "안녕하세요\n반갑습니다"
+        assert zf.read("_errors.txt").decode("utf-8").startswith("zzzzzzzzzzz\t")
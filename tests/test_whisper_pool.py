@@ -0,0 +1,64 @@
+# utils/whisper_pool.py: 진짜 Whisper 없이 작은 모델로 int8 양자화와 실패 시 float32 대체를 시험한다
+import sys
+import types
+
+import pytest
+
+from utils import whisper_pool
+from utils.whisper_pool import ModelPool, quantize_int8
+
+
+def test_quantize_int8_matches_float():
+    torch = pytest.importorskip("torch")
+    from torch import nn
+
+    class Linear(nn.Linear):
+        # whisper 처럼 nn.Linear 를 상속한 하위 클래스
+        def forward(self, x):
+            return super().forward(x)
+
+    torch.manual_seed(0)
+    model = nn.Sequential(Linear(64, 128), nn.ReLU(), Linear(128, 16)).eval()
+    x = torch.randn(8, 64)
+    with torch.no_grad():
+        expected = model(x)
+        quantized = quantize_int8(model)
+        got = quantized(x)
+
+    assert not any(isinstance(m, nn.Linear) for m in quantized.modules())
+    assert torch.allclose(got, expected, atol=0.05 * expected.abs().max().item())
+
+
+@pytest.fixture
+def fake_whisper(monkeypatch):
+    loads = []
+    model = types.SimpleNamespace(eval=lambda: model)
+
+    def load_model(name, device=None):
+        loads.append((name, device))
+        return model
+
+    monkeypatch.setitem(sys.modules, "whisper", types.SimpleNamespace(load_model=load_model))
+    return model, loads
+
+
+def test_int8_failure_falls_back_to_float32(fake_whisper, monkeypatch):
+    model, loads = fake_whisper
+
+    def broken(m):
+        raise RuntimeError("no quantized engine")
+
+    monkeypatch.setattr(whisper_pool, "quantize_int8", broken)
+    pool = ModelPool("base:int8", size=1)
+    with pytest.warns(RuntimeWarning, match="int8"):
+        with pool.borrow() as got:
+            assert got is model
+    assert loads == [("base", "cpu"), ("base", "cpu")]
+
+
+def test_float32_skips_quantize(fake_whisper, monkeypatch):
+    model, loads = fake_whisper
+    monkeypatch.setattr(whisper_pool, "quantize_int8", lambda m: pytest.fail("quantized a float32 model"))
+    with ModelPool("base", size=1).borrow() as got:
+        assert got is model
+    assert loads == [("base", None)]
@@ -0,0 +1 @@
+# 페이지들이 함께 쓰는 헬퍼 모듈 모음
@@ -0,0 +1,151 @@
+# ─── 임시파일 없는 오디오 파이프라인 ──────────────────────────────────
+# 다운로더(yt-dlp)의 표준출력을 ffmpeg 하나의 표준입력으로 바로 넘기고,
+# ffmpeg 가 16kHz 모노 float32 PCM 으로 디코딩한 출력을 메모리 버퍼에 받는다.
+# 중간 오디오 파일도, Whisper 의 두 번째 디코딩도 없다. 프로세스는 성공/실패와
+# 관계없이 항상 정리한다.
+import os
+import subprocess
+import threading
+from typing import BinaryIO, List, Optional, Sequence, Union
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+READ_SIZE = 1 << 20
+# 오류 메시지로 보여줄 stderr 끝부분 길이
+STDERR_TAIL = 4000
+
+
+class AudioPipeError(RuntimeError):
+    pass
+
+
+def ffmpeg_binary() -> str:
+    # FFMPEG_BINARY 가 있으면 그것을, 없으면 imageio-ffmpeg 가 내려받은 바이너리를 쓴다
+    path = os.environ.get("FFMPEG_BINARY")
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):
+        return "ffmpeg"
+
+
+def ytdlp_command(url: str) -> List[str]:
+    """bestaudio 를 파일 대신 표준출력으로 내보내는 yt-dlp 명령"""
+    return ["yt-dlp", "-f", "bestaudio", "--quiet", "--no-warnings", "-o", "-", url]
+
+
+def ffmpeg_command(src: str = "pipe:0", sr: int = SAMPLE_RATE) -> List[str]:
+    return [
+        ffmpeg_binary(), "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-i", src, "-f", "f32le", "-ac", "1", "-ar", str(sr), "pipe:1",
+    ]
+
+
+class _Drain(threading.Thread):
+    """stderr 를 계속 비워서 파이프가 막히지 않게 하고, 끝부분만 남긴다"""
+
+    def __init__(self, stream):
+        super().__init__(daemon=True)
+        self.stream = stream
+        self.tail = b""
+
+    def run(self):
+        for chunk in iter(lambda: self.stream.read(READ_SIZE), b""):
+            self.tail = (self.tail + chunk)[-STDERR_TAIL:]
+
+    def message(self) -> str:
+        self.join(timeout=1)
+        return self.tail.decode("utf-8", "replace").strip()
+
+
+class _Feed(threading.Thread):
+    """파일 객체를 읽어 ffmpeg 표준입력에 써 넣는다 (로컬 파일로 다운로더를 대신할 때)"""
+
+    def __init__(self, source: BinaryIO, sink):
+        super().__init__(daemon=True)
+        self.source = source
+        self.sink = sink
+
+    def run(self):
+        try:
+            for chunk in iter(lambda: self.source.read(READ_SIZE), b""):
+                self.sink.write(chunk)
+        except (BrokenPipeError, ValueError):
+            pass  # ffmpeg 가 먼저 끝났거나 정리 중
+        finally:
+            try:
+                self.sink.close()
+            except OSError:
+                pass
+
+
+def _kill(proc: Optional[subprocess.Popen]):
+    if proc is not None and proc.poll() is None:
+        proc.kill()
+        proc.wait()
+
+
+def _close(proc: Optional[subprocess.Popen]):
+    if proc is None:
+        return
+    for stream in (proc.stdin, proc.stdout, proc.stderr):
+        if stream:
+            stream.close()
+
+
+def decode_audio(source: Union[str, Sequence[str], BinaryIO], sr: int = SAMPLE_RATE) -> np.ndarray:
+    """오디오를 16kHz 모노 float32 배열로 디코딩한다.
+
+    source 는 파일 경로(str), 표준출력으로 미디어를 내보내는 명령(list, 예: ytdlp_command(url)),
+    또는 읽기 가능한 바이너리 파일 객체 중 하나다.
+    """
+    upstream = ffmpeg = None
+    feed = None
+    drains = []
+    try:
+        if isinstance(source, str):
+            ffmpeg = subprocess.Popen(ffmpeg_command(source, sr), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        elif isinstance(source, (list, tuple)):
+            upstream = subprocess.Popen(list(source), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            ffmpeg = subprocess.Popen(ffmpeg_command("pipe:0", sr), stdin=upstream.stdout,
+                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # ffmpeg 가 먼저 죽으면 다운로더가 SIGPIPE 를 받도록 부모 쪽 끝은 닫는다
+            upstream.stdout.close()
+            drains.append(_Drain(upstream.stderr))
+        else:
+            ffmpeg = subprocess.Popen(ffmpeg_command("pipe:0", sr), stdin=subprocess.PIPE,
+                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            feed = _Feed(source, ffmpeg.stdin)
+            feed.start()
+        drains.append(_Drain(ffmpeg.stderr))
+        for drain in drains:
+            drain.start()
+
+        buf = bytearray()
+        for chunk in iter(lambda: ffmpeg.stdout.read(READ_SIZE), b""):
+            buf += chunk
+        ffmpeg.wait()
+
+        if upstream is not None and upstream.wait() != 0:
+            raise AudioPipeError(f"다운로드 실패 (exit {upstream.returncode}): {drains[0].message()}")
+        if ffmpeg.returncode != 0:
+            raise AudioPipeError(f"ffmpeg 디코딩 실패 (exit {ffmpeg.returncode}): {drains[-1].message()}")
+        # 4바이트 단위가 아닌 꼬리는 버린다
+        usable = len(buf) - len(buf) % 4
+        return np.frombuffer(buf, dtype=np.float32, count=usable // 4)
+    finally:
+        # 실패했거나 중간에 끊겼으면 남은 프로세스를 죽이고, 스레드가 끝난 뒤 파이프를 닫는다
+        _kill(upstream)
+        _kill(ffmpeg)
+        for thread in drains + ([feed] if feed is not None else []):
+            if thread.ident is not None:
+                thread.join(timeout=1)
+        _close(upstream)
+        _close(ffmpeg)
+
+
+def stream_youtube_audio(url: str, sr: int = SAMPLE_RATE) -> np.ndarray:
+    return decode_audio(ytdlp_command(url), sr)
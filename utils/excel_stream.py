@@ -0,0 +1,195 @@
+# ─── 스트리밍 엑셀 병합기 ─────────────────────────────────────────────
+# 업로드 파일을 openpyxl read-only 모드로 한 행씩 읽어서
+# write-only 워크북에 바로 써 넣는다. 메모리 사용량은 전체 행 수가 아니라
+# 한 행의 너비에만 비례한다.
+# out 을 주지 않으면 쓰지 않고 읽기만 해서 행 수/미리보기/실패 파일만 알아낸다
+# (페이지는 이 요약만 먼저 보여 주고, 파일은 다운로드를 누를 때 out 을 주어 만든다).
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+FILENAME_COL = "파일명"
+
+
+@dataclass
+class StreamResult:
+    merged: List[str] = field(default_factory=list)   # 성공한 파일명
+    errors: List[tuple] = field(default_factory=list)  # (파일명, 오류 문구)
+    columns: List[str] = field(default_factory=list)
+    preview: List[tuple] = field(default_factory=list)  # 미리보기용 앞부분 행
+    rows: int = 0
+
+    def approx_size(self) -> int:
+        """캐시 예산용 어림값 (대부분 미리보기 행)"""
+        cells = sum(sys.getsizeof(v) for row in self.preview for v in row)
+        return cells + 64 * (len(self.preview) + len(self.columns) + len(self.merged) + len(self.errors))
+
+
+def sanitize_sheet_name(name: str) -> str:
+    # Excel 시트명은 최대 31자, 특수문자 불가
+    name = re.sub(r'[:\\/?*\[\]]', '', name)
+    return name[:31]
+
+
+def _is_xls(name: str) -> bool:
+    return name.lower().endswith(".xls")
+
+
+def iter_rows(uploaded_file) -> Iterator[tuple]:
+    """첫 번째 시트를 한 행씩 돌려준다 (끝쪽의 빈 행은 버림)"""
+    uploaded_file.seek(0)
+    if _is_xls(uploaded_file.name):
+        # openpyxl 은 .xls 를 못 읽으므로 pandas 로 대체 (xls 는 최대 65536행)
+        df = pd.read_excel(uploaded_file, header=None)
+        df = df.astype(object).where(df.notna(), None)
+        yield from df.itertuples(index=False, name=None)
+        return
+
+    wb = load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        blank = 0
+        for row in ws.iter_rows(values_only=True):
+            if all(v is None for v in row):
+                # 중간 빈 행은 유지하고, 마지막 빈 행들은 버리기 위해 개수만 센다
+                blank += 1
+                continue
+            for _ in range(blank):
+                yield ()
+            blank = 0
+            yield row
+    finally:
+        wb.close()
+
+
+def make_header(row: Iterable) -> List[str]:
+    """pandas.read_excel 과 같은 규칙으로 헤더 이름 생성"""
+    names, seen = [], {}
+    for i, v in enumerate(row):
+        name = f"Unnamed: {i}" if v is None else str(v)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _fail(result: StreamResult, on_error, name: str, e: Exception):
+    result.errors.append((name, f"{type(e).__name__}: {e}"))
+    if on_error:
+        on_error(name, e)
+
+
+def _read_header(uploaded_file) -> List[str]:
+    rows = iter_rows(uploaded_file)
+    try:
+        return make_header(next(rows, ()))
+    finally:
+        rows.close()
+
+
+def stream_concat(
+    uploaded_files,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    preview_rows: int = 100,
+    out: Optional[BinaryIO] = None,
+) -> StreamResult:
+    """여러 파일의 첫 시트를 위아래로 이어 붙이고 파일명 열을 추가한다 (out 이 있으면 xlsx 로 쓴다).
+
+    1차로 각 파일의 헤더만 읽어 열 합집합을 만들고,
+    2차로 행을 하나씩 합집합 위치에 맞춰 써 넣는다.
+    """
+    result = StreamResult()
+    columns: List[str] = []
+    headers = {}
+    for uploaded_file in uploaded_files:
+        try:
+            header = _read_header(uploaded_file)
+        except Exception as e:
+            _fail(result, on_error, uploaded_file.name, e)
+            continue
+        headers[id(uploaded_file)] = header
+        for col in header:
+            if col not in columns:
+                columns.append(col)
+    if FILENAME_COL in columns:
+        columns.remove(FILENAME_COL)
+    columns.append(FILENAME_COL)
+    col_pos = {c: i for i, c in enumerate(columns)}
+    result.columns = columns
+
+    out_wb = ws = None
+    if out is not None:
+        out_wb = Workbook(write_only=True)
+        ws = out_wb.create_sheet()
+        ws.append(columns)
+
+    width = len(columns)
+    for uploaded_file in uploaded_files:
+        header = headers.get(id(uploaded_file))
+        if header is None:
+            continue
+        positions = [col_pos[c] for c in header]
+        name = uploaded_file.name
+        try:
+            rows = iter_rows(uploaded_file)
+            next(rows, None)  # 헤더 건너뛰기
+            for row in rows:
+                merged = [None] * width
+                for pos, v in zip(positions, row):
+                    merged[pos] = v
+                merged[-1] = name
+                if ws is not None:
+                    ws.append(merged)
+                if len(result.preview) < preview_rows:
+                    result.preview.append(tuple(merged))
+                result.rows += 1
+        except Exception as e:
+            # 이미 일부 행이 써졌을 수 있지만, write-only 시트는 되돌릴 수 없다
+            _fail(result, on_error, name, e)
+            continue
+        result.merged.append(name)
+
+    if out_wb is not None:
+        out_wb.save(out)
+    return result
+
+
+def stream_sheets(
+    uploaded_files,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    out: Optional[BinaryIO] = None,
+) -> StreamResult:
+    """파일마다 첫 시트를 새 워크북의 시트 하나로 스트리밍 복사 (out 이 있으면 xlsx 로 쓴다)"""
+    out_wb = Workbook(write_only=True) if out is not None else None
+    result = StreamResult()
+    for uploaded_file in uploaded_files:
+        name = uploaded_file.name
+        try:
+            rows = iter_rows(uploaded_file)
+            first = next(rows, None)
+            ws = None
+            if out_wb is not None:
+                ws = out_wb.create_sheet(title=sanitize_sheet_name(name.replace('.xlsx', '').replace('.xls', '')))
+                if first is not None:
+                    ws.append(make_header(first))
+            for row in rows:
+                if ws is not None:
+                    ws.append(row)
+                result.rows += 1
+        except Exception as e:
+            _fail(result, on_error, name, e)
+            continue
+        result.merged.append(name)
+
+    if out_wb is not None:
+        if not out_wb.worksheets:
+            out_wb.create_sheet()
+        out_wb.save(out)
+    return result
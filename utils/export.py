@@ -0,0 +1,299 @@
+# ─── 필요할 때만 만드는 병합 결과 내보내기 ────────────────────────────
+# 다운로드 버튼에 바이트 대신 "파일을 만드는 함수"를 넘겨서, 사용자가 실제로
+# 누를 때만 결과 파일을 만든다. 만든 파일은 입력 파일 묶음의 해시 + 형식을 키로
+# 디스크에 두어 같은 입력이면 다시 만들지 않는다. 쓰기는 행 묶음 단위로 파일에
+# 바로 하므로 만드는 동안 결과 전체를 BytesIO 하나에 들고 있지 않는다. (누른 뒤에는
+# download_button 이 바이트를 받아야 해서 캐시 파일을 한 번 읽어 넘긴다)
+#   xlsx    : xlsxwriter constant_memory (있으면) / openpyxl write-only
+#   csv.gz  : gzip 으로 압축한 UTF-8 CSV (엑셀에서 한글이 안 깨지게 BOM 포함)
+#   parquet : pyarrow, 묶음마다 row group 하나
+# 시트가 여러 개인데 csv.gz/parquet 를 고르면 시트마다 파일 하나씩 zip 으로 묶는다.
+# 표 대신 write(파일) 함수를 주면 그 함수가 쓴 파일을 같은 방식으로 캐시한다 (스트리밍 병합용).
+import gzip
+import hashlib
+import importlib.util
+import os
+import threading
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from utils.stages import stage
+
+# 환경변수로 저장 위치/디스크 예산/한 번에 쓰는 행 수 설정
+EXPORT_DIR = os.environ.get("EXPORT_DIR", ".exports")
+DEFAULT_BUDGET = int(os.environ.get("EXPORT_CACHE_MB", "1024")) * 1024 * 1024
+CHUNK_ROWS = int(os.environ.get("EXPORT_CHUNK_ROWS", "50000"))
+
+Sheets = Sequence[Tuple[str, pd.DataFrame]]
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    label: str
+    ext: str
+    mime: str
+    write: Callable[[pd.DataFrame, BinaryIO, int], None]
+
+
+# ─── 형식별 쓰기 ─────────────────────────────────────────────────────
+def _chunks(df: pd.DataFrame, chunk_rows: int):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _cell_rows(chunk: pd.DataFrame):
+    # NaN/NaT 는 빈 칸으로, numpy 값은 파이썬 값으로 (pandas.to_excel 과 같은 결과)
+    chunk = chunk.astype(object).where(chunk.notna(), None)
+    return chunk.itertuples(index=False, name=None)
+
+
+def write_xlsx_sheets(sheets: Sheets, out: BinaryIO, chunk_rows: int = CHUNK_ROWS):
+    """여러 시트를 xlsx 하나로. 메모리는 행 수가 아니라 한 묶음 크기에만 비례한다"""
+    if importlib.util.find_spec("xlsxwriter") is not None:
+        import xlsxwriter
+
+        # constant_memory: 행을 다 쓰면 바로 임시파일로 내보낸다 (행 순서대로만 쓸 수 있음)
+        wb = xlsxwriter.Workbook(out, {"constant_memory": True, "nan_inf_to_errors": True})
+        try:
+            for name, df in sheets:
+                ws = wb.add_worksheet(name)
+                ws.write_row(0, 0, [str(c) for c in df.columns])
+                r = 1
+                for chunk in _chunks(df, chunk_rows):
+                    for row in _cell_rows(chunk):
+                        ws.write_row(r, 0, row)
+                        r += 1
+        finally:
+            wb.close()
+        return
+
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for name, df in sheets:
+        ws = wb.create_sheet(title=name)
+        ws.append([str(c) for c in df.columns])
+        for chunk in _chunks(df, chunk_rows):
+            for row in _cell_rows(chunk):
+                ws.append(row)
+    if not wb.worksheets:
+        wb.create_sheet()
+    wb.save(out)
+
+
+def _write_xlsx(df: pd.DataFrame, out: BinaryIO, chunk_rows: int):
+    write_xlsx_sheets([("Sheet1", df)], out, chunk_rows)
+
+
+def _write_csv_gz(df: pd.DataFrame, out: BinaryIO, chunk_rows: int):
+    with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6) as gz:
+        gz.write("\ufeff".encode("utf-8"))
+        header = True
+        for chunk in _chunks(df, chunk_rows):
+            gz.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+            header = False
+        if header:  # 빈 표도 헤더는 쓴다
+            gz.write(df.to_csv(index=False).encode("utf-8"))
+
+
+def _arrow_ready(df: pd.DataFrame) -> pd.DataFrame:
+    # 엑셀에서 읽은 열은 숫자/문자가 섞인 object 인 경우가 많은데 Parquet 은
+    # 열마다 한 타입이어야 하므로, 그런 열만 문자열로 바꾼다 (빈 칸은 그대로)
+    import pyarrow as pa
+
+    mixed = []
+    for col in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            mixed.append(col)
+    if not mixed:
+        return df
+    return df.assign(**{col: df[col].map(lambda v: None if pd.isna(v) else str(v)) for col in mixed})
+
+
+def _write_parquet(df: pd.DataFrame, out: BinaryIO, chunk_rows: int):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = _arrow_ready(df)
+    # 스키마는 전체 표로 한 번 정한다 (묶음마다 추론하면 빈 칸뿐인 묶음에서 타입이 달라짐)
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+FORMATS: Dict[str, ExportFormat] = {
+    "xlsx": ExportFormat("Excel (xlsx)", "xlsx",
+                         "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", _write_xlsx),
+    "csv.gz": ExportFormat("CSV (gzip 압축)", "csv.gz", "application/gzip", _write_csv_gz),
+    "parquet": ExportFormat("Parquet", "parquet", "application/vnd.apache.parquet", _write_parquet),
+}
+
+
+def output_name(base: str, fmt: str, sheets: int = 1) -> str:
+    """다운로드 파일명. 시트가 여러 개인 csv.gz/parquet 는 zip"""
+    if sheets > 1 and fmt != "xlsx":
+        return f"{base}.{fmt}.zip"
+    return f"{base}.{FORMATS[fmt].ext}"
+
+
+def output_mime(fmt: str, sheets: int = 1) -> str:
+    return "application/zip" if sheets > 1 and fmt != "xlsx" else FORMATS[fmt].mime
+
+
+def unique_sheet_names(names: Sequence[str]) -> List[str]:
+    """이미 정리된 시트명 중 겹치는 것에 (2), (3) ... 을 붙인다 (31자 제한 유지)"""
+    seen, result = set(), []
+    for name in names:
+        name = name or "Sheet"
+        candidate, n = name, 1
+        while candidate.lower() in seen:
+            n += 1
+            suffix = f" ({n})"
+            candidate = name[:31 - len(suffix)] + suffix
+        seen.add(candidate.lower())
+        result.append(candidate)
+    return result
+
+
+def write_export(sheets: Sheets, fmt: str, out: BinaryIO, chunk_rows: int = CHUNK_ROWS):
+    if fmt == "xlsx":
+        write_xlsx_sheets(sheets, out, chunk_rows)
+    elif len(sheets) == 1:
+        FORMATS[fmt].write(sheets[0][1], out, chunk_rows)
+    else:
+        # 이미 압축된 형식이라 zip 은 저장만 한다
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zf:
+            for name, df in sheets:
+                with zf.open(f"{name}.{FORMATS[fmt].ext}", "w", force_zip64=True) as member:
+                    FORMATS[fmt].write(df, member, chunk_rows)
+
+
+# ─── 디스크 캐시 ─────────────────────────────────────────────────────
+def export_key(*parts) -> str:
+    """입력 파일 묶음(예: (파일명, 내용 해시) 목록)과 옵션으로 캐시 키를 만든다"""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+class ExportCache:
+    """(입력 키, 형식) → 내보낸 파일. 예산을 넘으면 가장 오래 안 쓴 파일부터 지운다"""
+
+    def __init__(self, root: str = EXPORT_DIR, budget: int = DEFAULT_BUDGET):
+        self.root = root
+        self.budget = budget
+        self._lock = threading.Lock()
+        # 만드는 중인 경로 → [잠금, 기다리는 수] (아무도 안 쓰면 지운다)
+        self._building: Dict[str, list] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.root, f"{key}.{fmt}")
+
+    @contextmanager
+    def _build_lock(self, path: str) -> Iterator[None]:
+        # 같은 경로는 한 스레드만 만든다. 다 쓴 잠금은 지워서 키마다 쌓이지 않게 한다
+        with self._lock:
+            entry = self._building.setdefault(path, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._building[path]
+
+    def path(self, key: str, fmt: str, sheets: Optional[Callable[[], Sheets]] = None,
+             write: Optional[Callable[[BinaryIO], Any]] = None) -> str:
+        """캐시된 파일 경로. 없으면 sheets() 로 표를 받아 만들거나 write(파일) 로 쓴다 (같은 키는 한 번만 만든다)"""
+        if write is None:
+            def write(f):
+                write_export(sheets(), fmt, f)
+        path = self._path(key, fmt)
+        with self._build_lock(path):
+            if os.path.exists(path):
+                os.utime(path)
+                with self._lock:
+                    self.hits += 1
+                return path
+            os.makedirs(self.root, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "wb") as f, stage(f"export:{fmt}") as s:
+                    write(f)
+                    s.size = f.tell()
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            with self._lock:
+                self.misses += 1
+                self._evict(keep=path)
+            return path
+
+    def read(self, key: str, fmt: str, sheets: Optional[Callable[[], Sheets]] = None,
+             write: Optional[Callable[[BinaryIO], Any]] = None) -> bytes:
+        """download_button 의 data 로 넘길 함수 안에서 부른다 (파일은 바로 닫는다)"""
+        with open(self.path(key, fmt, sheets, write), "rb") as f:
+            return f.read()
+
+    def _evict(self, keep: str):
+        files = []
+        for name in os.listdir(self.root):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.budget:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            sizes = []
+            if os.path.isdir(self.root):
+                for name in os.listdir(self.root):
+                    try:
+                        sizes.append(os.path.getsize(os.path.join(self.root, name)))
+                    except OSError:
+                        pass
+            return {
+                "files": len(sizes),
+                "size_mb": round(sum(sizes) / 1024 / 1024, 2),
+                "budget_mb": round(self.budget / 1024 / 1024, 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# 프로세스 안에서 공유하는 캐시
+export_cache = ExportCache()
+
+
+def upload_key(uploaded_files, *options) -> str:
+    """업로드 파일 묶음(이름 + 내용 해시)과 옵션으로 만든 캐시 키"""
+    files = tuple((f.name, hashlib.sha256(f.getvalue()).hexdigest()) for f in uploaded_files)
+    return export_key(files, *options)
@@ -0,0 +1,180 @@
+# ─── 여러 파일의 공통 스키마 + 작은 dtype 으로 합치기 ──────────────────
+# 파일마다 열 구성이나 셀 타입이 조금씩 다르면 pd.concat 이 object 열로
+# 떨어져서 메모리가 몇 배로 늘어난다. 합치기 전에 열마다 모든 파일을 보고
+# 공통 타입을 정한 뒤 각 파일을 그 타입으로 맞춰 붙인다.
+#   정수      : 값 범위에 맞는 가장 작은 정수형 (빈 칸이 있으면 Int8 같은 nullable)
+#   실수      : 모든 값이 정수면 정수형으로, 아니면 float64 그대로 (정밀도 유지)
+#   문자열    : 서로 다른 값이 적으면 category, 아니면 str
+#   파일명    : 항상 category (행마다 같은 문자열을 들고 있지 않게)
+#   그 외(숫자/문자가 섞인 열 등)는 object 로 둔다.
+import os
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from utils.excel_stream import FILENAME_COL
+
+# 서로 다른 값 수 / 행 수 가 이 비율 이하인 문자열 열은 category 로 저장
+CATEGORY_MAX_RATIO = float(os.environ.get("FRAME_CATEGORY_RATIO", "0.1"))
+
+_INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+# float64 가 정확히 표현하는 정수 범위
+_EXACT_INT = 2 ** 53
+
+_OBJECT_KINDS = {
+    "string": "string",
+    "integer": "int",
+    "floating": "float",
+    "mixed-integer-float": "float",
+    "decimal": "float",
+    "boolean": "bool",
+    "datetime": "datetime",
+    "datetime64": "datetime",
+    "date": "object",
+    "empty": "empty",
+}
+
+
+def _kind(s: pd.Series) -> str:
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _kind(pd.Series(s.cat.categories)) if len(s.cat.categories) else "empty"
+    if s.isna().all():
+        return "empty"
+    if ptypes.is_bool_dtype(s.dtype):
+        return "bool"
+    if ptypes.is_integer_dtype(s.dtype):
+        return "int"
+    if ptypes.is_float_dtype(s.dtype):
+        return "float"
+    if ptypes.is_datetime64_any_dtype(s.dtype):
+        return "datetime"
+    if ptypes.is_string_dtype(s.dtype) and not ptypes.is_object_dtype(s.dtype):
+        return "string"
+    if ptypes.is_object_dtype(s.dtype):
+        return _OBJECT_KINDS.get(pd.api.types.infer_dtype(s, skipna=True), "object")
+    return "object"
+
+
+def _int_dtype(lo: int, hi: int, nullable: bool):
+    for t in _INT_TYPES:
+        info = np.iinfo(t)
+        if info.min <= lo and hi <= info.max:
+            return pd.api.types.pandas_dtype(t.__name__.capitalize()) if nullable else np.dtype(t)
+    return None
+
+
+def _numeric_dtype(parts: List[pd.Series], nullable: bool):
+    values = [pd.to_numeric(p, errors="coerce").dropna() for p in parts]
+    values = [v for v in values if len(v)]
+    if not values:
+        return None
+    integral = all(
+        ptypes.is_integer_dtype(v.dtype)
+        or ((v % 1 == 0).all() and v.abs().max() < _EXACT_INT)
+        for v in values
+    )
+    if not integral:
+        return np.dtype("float64")
+    lo = int(min(v.min() for v in values))
+    hi = int(max(v.max() for v in values))
+    nullable = nullable or any(p.isna().any() for p in parts)
+    return _int_dtype(lo, hi, nullable) or np.dtype("float64")
+
+
+def _string_dtype(parts: List[pd.Series], total_rows: int):
+    limit = CATEGORY_MAX_RATIO * total_rows
+    uniques = []
+    for p in parts:
+        values = p.cat.categories if isinstance(p.dtype, pd.CategoricalDtype) else p.dropna().unique()
+        uniques.append(pd.Series(values, dtype="str"))
+        if len(values) > limit:
+            return "str"
+    categories = pd.concat(uniques, ignore_index=True).unique()
+    if len(categories) > limit:
+        return "str"
+    return pd.CategoricalDtype(categories)
+
+
+def common_dtype(parts: List[pd.Series], total_rows: int, missing: bool = False):
+    """같은 열의 파일별 조각들로 공통 dtype 을 정한다. None 이면 pd.concat 에 맡긴다.
+
+    missing 은 이 열이 없는 파일이 있다는 뜻 (그 파일의 행은 빈 칸이 된다).
+    """
+    kinds = {_kind(p) for p in parts} - {"empty"}
+    if not kinds:
+        return None
+    if kinds <= {"int", "float"}:
+        return _numeric_dtype(parts, missing)
+    if kinds == {"bool"}:
+        return "boolean" if missing or any(p.isna().any() for p in parts) else np.dtype(bool)
+    if kinds == {"string"}:
+        return _string_dtype(parts, total_rows)
+    if kinds == {"datetime"}:
+        # 모두 같은 datetime64 dtype 일 때만 유지 (시간대가 다르면 object)
+        dtypes = {p.dtype for p in parts if _kind(p) != "empty"}
+        return dtypes.pop() if len(dtypes) == 1 and ptypes.is_datetime64_any_dtype(next(iter(dtypes))) else np.dtype(object)
+    return np.dtype(object)
+
+
+def _cast(s: pd.Series, dtype) -> pd.Series:
+    if dtype is None or s.dtype == dtype:
+        return s
+    if isinstance(dtype, pd.CategoricalDtype) or dtype == "str":
+        if ptypes.is_object_dtype(s.dtype) or isinstance(s.dtype, pd.CategoricalDtype):
+            # object/category 열: 빈 칸은 그대로 두고 값만 str 로 맞춘다
+            s = s.astype(object).where(s.notna(), None).astype("str")
+    elif ptypes.is_integer_dtype(dtype) or dtype == "boolean":
+        s = pd.to_numeric(s, errors="coerce") if _kind(s) != "bool" else s
+    return s.astype(dtype)
+
+
+def unify_frames(frames: Sequence[pd.DataFrame], names: Optional[Sequence[str]] = None,
+                 filename_col: str = FILENAME_COL) -> pd.DataFrame:
+    """열 합집합(처음 나온 순서)과 공통 dtype 으로 위아래로 합친다.
+
+    names 를 주면 각 행이 어느 파일에서 왔는지 filename_col 에 category 로 붙인다.
+    """
+    columns: List = []
+    for df in frames:
+        for col in df.columns:
+            if col not in columns and not (names is not None and col == filename_col):
+                columns.append(col)
+    total_rows = sum(len(df) for df in frames)
+
+    dtypes = {}
+    for col in columns:
+        parts = [df[col] for df in frames if col in df.columns]
+        dtypes[col] = common_dtype(parts, total_rows, missing=len(parts) < len(frames))
+
+    pieces = []
+    for df in frames:
+        data = {}
+        for col in columns:
+            if col in df.columns:
+                data[col] = _cast(df[col], dtypes[col]).reset_index(drop=True)
+            else:
+                data[col] = pd.Series(None, index=range(len(df)), dtype=dtypes[col] or object)
+        pieces.append(pd.DataFrame(data, index=range(len(df)), columns=columns))
+    if pieces:
+        merged = pd.concat(pieces, ignore_index=True)
+    else:
+        merged = pd.DataFrame(columns=columns)
+
+    if names is not None:
+        # 파일명은 문자열을 행마다 만들지 않고 (파일 번호 → 이름) 코드로 바로 만든다
+        categories = list(dict.fromkeys(names))
+        position = {name: i for i, name in enumerate(categories)}
+        codes = np.repeat([position[n] for n in names], [len(df) for df in frames])
+        merged[filename_col] = pd.Categorical.from_codes(codes.astype(np.int32), categories=categories)
+    return merged
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """한 파일짜리 표의 dtype 을 줄인다 (unify_frames 의 파일 하나 버전)"""
+    return unify_frames([df])
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    return round(df.memory_usage(deep=True).sum() / 1024 / 1024, 1)
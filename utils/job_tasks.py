@@ -0,0 +1,147 @@
+# ─── 백그라운드 작업 함수들 ───────────────────────────────────────────
+# utils/jobs.py 의 워커 프로세스에서 실행된다. 모두 첫 인자로 JobContext 를 받고,
+# 결과 파일은 작업 폴더에 쓰며, 작은 요약 dict 를 돌려준다.
+# 페이지에서는 "utils.job_tasks:함수이름" 으로 제출한다.
+import importlib.util
+import re
+from io import BytesIO
+from typing import Callable, List, Optional, Tuple
+
+from utils.jobs import JobContext, job_budget
+from utils.stages import stage
+
+MERGE_OUTPUT = "merged.xlsx"
+SRT_OUTPUT = "result.srt"
+PARTIAL_SRT = "partial.srt"
+
+
+def sanitize_sheet_name(name):
+    # Excel 시트명은 최대 31자, 특수문자 불가
+    name = re.sub(r'[:\\/?*\[\]]', '', name)
+    return name[:31]
+
+
+def merge_uploads(uploaded_files, engine, workers,
+                  on_progress: Optional[Callable[[int, int], None]] = None) -> Tuple[bytes, List[tuple]]:
+    """업로드 파일들의 첫 시트를 하나로 병합 → (xlsx 바이트, [(파일명, 오류)])"""
+    from openpyxl import Workbook
+
+    from utils.parallel_parse import parse_uploads, read_workbook
+    from utils.parse_cache import parse_cache
+    from utils.sheet_copy import copy_sheet
+    from utils.xlsx_transplant import transplant_sheets
+
+    output = BytesIO()
+    errors = []
+
+    def on_error(name, e):
+        errors.append((name, e))
+
+    if engine.startswith("XML"):
+        # 셀 객체 없이 zip 패키지 단위로 시트 XML 이식
+        with stage("02:transplant", size=sum(len(f.getvalue()) for f in uploaded_files)):
+            transplant_sheets(uploaded_files, output, on_error=on_error, on_progress=on_progress)
+        return output.getvalue(), errors
+
+    # 새 워크북 생성, 기본 시트 제거
+    target_wb = Workbook()
+    target_wb.remove(target_wb.active)
+
+    # 워크북 파싱은 프로세스 풀에서 병렬로 (결과는 업로드 순서 유지)
+    with stage("02:load_workbook", size=sum(len(f.getvalue()) for f in uploaded_files)):
+        parsed = parse_uploads(
+            uploaded_files, read_workbook, max_workers=workers, cache=parse_cache, on_error=on_error,
+        )
+
+    for i, (uploaded_file, src_wb) in enumerate(parsed):
+        if on_progress:
+            on_progress(i, len(parsed))
+        try:
+            src = src_wb[src_wb.sheetnames[0]]
+            title = sanitize_sheet_name(uploaded_file.name.rsplit('.', 1)[0])
+            tgt = target_wb.create_sheet(title=title)
+
+            # 크기·병합·틀 고정·셀 값·스타일 복사 (스타일은 종류별로 한 번만 변환)
+            with stage("02:copy_sheet", rows=src.max_row):
+                copy_sheet(src, tgt)
+
+        except Exception as e:
+            on_error(uploaded_file.name, e)
+
+    # 저장
+    with stage("02:save") as s:
+        target_wb.save(output)
+        s.size = output.tell()
+    return output.getvalue(), errors
+
+
+def merge_excel(ctx: JobContext, engine: str, workers: int, filename: str):
+    """02 페이지 병합: 입력 파일들 → merged.xlsx"""
+    from utils.parse_cache import parse_cache
+
+    uploads = ctx.inputs()
+    ctx.progress(0.0, f"{len(uploads)}개 파일 병합 시작")
+    # 작업 워커 안에서 또 만드는 파싱 풀은 작업 하나의 몫을 넘지 않게
+    data, errors = merge_uploads(
+        uploads, engine, min(workers, job_budget()),
+        on_progress=lambda done, total: ctx.progress(done / max(total, 1), f"{done}/{total} 파일 병합"),
+    )
+    ctx.write_bytes(MERGE_OUTPUT, data)
+    return {
+        "output": MERGE_OUTPUT,
+        "filename": filename,
+        "files": len(uploads),
+        "errors": [[name, f"{type(e).__name__}: {e}"] for name, e in errors],
+        # 파싱은 이 작업 워커에서 하므로 캐시 상태도 여기서 보고한다 (페이지 사이드바용)
+        "parse_cache": parse_cache.stats(),
+    }
+
+
+def transcribe_video(ctx: JobContext, url: str, model_name: str, language: Optional[str] = None,
+                     beam_size: Optional[int] = None, threads: int = 0):
+    """04 페이지 Whisper 인식: 유튜브 오디오 → result.srt (진행 중에는 partial.srt)
+
+    model_name 은 whisper_pool.model_key 형식 ("base", "base:int8")
+    """
+    from utils.audio_pipe import stream_youtube_audio
+    from utils.transcribe import DEFAULT_WORKERS, to_srt, transcribe_progressive
+    from utils.video_cache import video_cache, video_id
+    from utils.whisper_pool import transcript_key
+
+    ctx.progress(0.0, "오디오 다운로드 중")
+    with stage("04:download_decode") as s:
+        audio = stream_youtube_audio(url)
+        s.size = audio.nbytes
+    ctx.progress(0.0, "Whisper 인식 중")
+
+    segments = []
+    with stage("04:whisper", size=audio.nbytes) as s:
+        # 작업 하나의 CPU 몫(job_budget) 안에서 구간 워커 수와 워커당 torch 스레드 수를 나눈다.
+        # 몫이 1 이면 구간 풀 없이 이 작업 프로세스의 (예열된) 모델로 차례로 인식하고,
+        # 그보다 크면 구간 워커마다 모델을 따로 올리는 대신 구간들을 동시에 인식한다
+        budget = job_budget()
+        workers = max(1, min(DEFAULT_WORKERS, budget))
+        progress = transcribe_progressive(audio, model_name, max_workers=workers, language=language,
+                                          beam_size=beam_size, threads=threads or max(1, budget // workers))
+        for finished, total, segments in progress:
+            # 끝난 구간까지의 자막을 바로 써 두면 페이지가 읽어서 보여준다
+            ctx.write_text(PARTIAL_SRT, to_srt(segments))
+            ctx.progress(finished / total, f"Whisper 인식 중 ({finished}/{total} 구간)")
+        s.rows = len(segments)
+
+    srt = to_srt(segments)
+    ctx.write_text(SRT_OUTPUT, srt)
+    vid = video_id(url)
+    video_cache.add_transcript(vid, transcript_key(model_name, language, beam_size), srt)
+    return {"output": SRT_OUTPUT, "video_id": vid, "segments": len(segments)}
+
+
+def warm_worker():
+    """작업 워커가 뜰 때 (utils/jobs.py WORKER_WARMUP): 인식이 실제로 도는 이 프로세스에 Whisper 기본 모델을 올려 둔다"""
+    from utils.startup import WARMUP_ENABLED
+
+    if not WARMUP_ENABLED or importlib.util.find_spec("whisper") is None:
+        return
+    from utils.whisper_pool import get_pool, model_key
+
+    get_pool(model_key()).warm()
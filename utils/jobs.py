@@ -0,0 +1,414 @@
+# ─── 백그라운드 작업 큐 ───────────────────────────────────────────────
+# 오래 걸리는 작업(Whisper 인식, 엑셀 병합)을 Streamlit 스크립트 밖의
+# 워커 프로세스 풀에서 돌린다. 작업 상태는 SQLite 에, 입력/출력 파일은
+# 작업 폴더에 저장해서 위젯을 건드려 스크립트가 다시 돌거나 브라우저를
+# 새로고침해도 작업은 계속되고 결과도 남아 있다. 페이지는 작업 id 만 들고
+# 상태를 조회한다.
+#
+# 취소는 협조적이다: 작업 함수가 ctx.progress() 를 부를 때 취소 요청을 확인한다.
+# 아직 시작 안 한 작업은 바로 취소된다.
+import importlib
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any, Dict, Iterator, List, Optional
+
+# 환경변수로 작업 폴더/동시 작업 수/보관 기간 설정
+JOBS_DIR = os.environ.get("JOBS_DIR", ".jobs")
+DEFAULT_WORKERS = int(os.environ.get("JOBS_WORKERS", "2"))
+KEEP_SECONDS = float(os.environ.get("JOBS_KEEP_HOURS", "72")) * 3600
+# 서버 프로세스는 HEARTBEAT_SECONDS 마다 살아 있다고 기록하고, STALE_SECONDS 동안
+# 기록이 없는 서버의 대기/실행 중 작업은 중단된 것으로 본다
+HEARTBEAT_SECONDS = 10.0
+STALE_SECONDS = float(os.environ.get("JOBS_STALE_SECONDS", "60"))
+# 워커 프로세스가 뜰 때 백그라운드 스레드로 돌릴 예열 함수 ("모듈:함수", 빈 값이면 끔)
+WORKER_WARMUP = os.environ.get("JOBS_WORKER_WARMUP", "utils.job_tasks:warm_worker")
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    task TEXT NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key);
+CREATE TABLE IF NOT EXISTS owners (
+    owner TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    heartbeat REAL NOT NULL
+);
+"""
+
+
+def job_budget() -> int:
+    """작업 하나가 안에서 쓸 프로세스/스레드 수 (CPU 를 동시 작업 수로 나눈 몫).
+
+    작업 워커 안에서 다시 CPU 수만큼 풀을 만들면 JOBS_WORKERS 배로 불어나므로
+    작업 함수는 이 값을 넘지 않게 쓴다.
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, DEFAULT_WORKERS))
+
+
+class JobCancelled(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    task: str
+    status: str
+    progress: float
+    message: Optional[str]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    cancel_requested: bool
+    created: float
+    started: Optional[float]
+    finished: Optional[float]
+
+    @property
+    def active(self) -> bool:
+        return self.status not in FINISHED
+
+
+@contextmanager
+def _connect(db_path: str) -> Iterator[sqlite3.Connection]:
+    # 서버와 워커 프로세스가 같은 DB 를 쓰므로 짧게 열고 바로 닫는다 (자동 커밋)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _update(db_path: str, job_id: str, **fields):
+    cols = ", ".join(f"{k} = ?" for k in fields)
+    with _connect(db_path) as conn:
+        conn.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+
+
+# ─── 워커 쪽 ─────────────────────────────────────────────────────────
+class JobContext:
+    """작업 함수가 받는 핸들: 진행률 보고, 취소 확인, 입력/출력 파일"""
+
+    def __init__(self, db_path: str, job_id: str, job_dir: str):
+        self.db_path = db_path
+        self.job_id = job_id
+        self.dir = job_dir
+
+    def cancelled(self) -> bool:
+        with _connect(self.db_path) as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (self.job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def progress(self, fraction: float, message: Optional[str] = None):
+        """진행률(0~1) 기록. 취소 요청이 있으면 JobCancelled 를 던진다"""
+        _update(self.db_path, self.job_id, progress=max(0.0, min(1.0, fraction)), message=message)
+        if self.cancelled():
+            raise JobCancelled()
+
+    def inputs(self) -> List[BytesIO]:
+        """제출할 때 넘긴 입력 파일들 (업로드 순서, .name 은 원래 파일명)"""
+        root = os.path.join(self.dir, "inputs")
+        files = []
+        for stored in sorted(os.listdir(root)):
+            with open(os.path.join(root, stored), "rb") as f:
+                buf = BytesIO(f.read())
+            buf.name = stored.split("_", 1)[1]
+            files.append(buf)
+        return files
+
+    def output_path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def write_bytes(self, name: str, data: bytes):
+        tmp = self.output_path(name) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.output_path(name))
+
+    def write_text(self, name: str, text: str):
+        self.write_bytes(name, text.encode("utf-8"))
+
+
+def _resolve(task: str):
+    module, _, name = task.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _init_worker(warmup: str):
+    # 작업을 받기 전에 예열을 시작해 두고, 작업은 예열이 끝나기를 기다리지 않는다
+    if warmup:
+        threading.Thread(target=_warm_worker, args=(warmup,), name="job-warmup", daemon=True).start()
+
+
+def _warm_worker(warmup: str):
+    try:
+        _resolve(warmup)()
+    except Exception:
+        traceback.print_exc()  # 예열 실패는 첫 작업이 느려질 뿐
+
+
+def _ping():
+    pass
+
+
+def _run(db_path: str, job_id: str, job_dir: str, task: str, kwargs: Dict[str, Any]):
+    """워커 프로세스에서 작업 하나를 실행하고 결과/상태를 기록한다"""
+    ctx = JobContext(db_path, job_id, job_dir)
+    if ctx.cancelled():
+        _update(db_path, job_id, status=CANCELLED, finished=time.time())
+        return
+    _update(db_path, job_id, status=RUNNING, started=time.time())
+    try:
+        result = _resolve(task)(ctx, **kwargs) or {}
+    except JobCancelled:
+        _update(db_path, job_id, status=CANCELLED, finished=time.time(), message="취소됨")
+    except Exception as e:
+        tail = traceback.format_exc()[-2000:]
+        _update(db_path, job_id, status=FAILED, finished=time.time(), error=f"{type(e).__name__}: {e}\n\n{tail}")
+    else:
+        _update(db_path, job_id, status=DONE, progress=1.0, finished=time.time(), result=json.dumps(result))
+
+
+# ─── 서버 쪽 ─────────────────────────────────────────────────────────
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # 다른 사용자의 프로세스지만 살아 있다
+    return True
+
+
+class JobQueue:
+    def __init__(self, root: str = JOBS_DIR, workers: int = DEFAULT_WORKERS):
+        self.root = root
+        self.workers = workers
+        self.db_path = os.path.join(root, "jobs.sqlite")
+        # 이 큐가 맡은 작업 표시. 살아 있는 동안 owners 표에 주기적으로 기록해서,
+        # 다른 서버 프로세스가 이 큐의 작업을 중단된 것으로 오해하지 않게 한다
+        self.owner = uuid.uuid4().hex
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        os.makedirs(root, exist_ok=True)
+        with _connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self._heartbeat()
+        threading.Thread(target=self._beat, daemon=True).start()
+        self.reap()
+        self.purge()
+
+    # ─── 살아 있음 기록 / 주인 잃은 작업 정리 ─────────────────────────
+    def _heartbeat(self):
+        with _connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO owners (owner, host, pid, heartbeat) VALUES (?, ?, ?, ?)",
+                (self.owner, socket.gethostname(), os.getpid(), time.time()),
+            )
+
+    def _beat(self):
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            try:
+                self._heartbeat()
+            except sqlite3.Error:
+                pass  # DB 가 잠시 잠겨 있으면 다음 주기에
+
+    def reap(self):
+        """기록이 끊긴(또는 같은 호스트에서 프로세스가 없어진) 서버의 대기/실행 중 작업을 실패로 표시"""
+        host = socket.gethostname()
+        with _connect(self.db_path) as conn:
+            for row in conn.execute("SELECT owner, pid FROM owners WHERE host = ? AND owner != ?",
+                                    (host, self.owner)).fetchall():
+                if not _pid_alive(row["pid"]):
+                    conn.execute("DELETE FROM owners WHERE owner = ?", (row["owner"],))
+            cutoff = time.time() - STALE_SECONDS
+            conn.execute("DELETE FROM owners WHERE heartbeat < ?", (cutoff,))
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE status IN (?, ?)"
+                " AND (owner IS NULL OR owner NOT IN (SELECT owner FROM owners))",
+                (FAILED, "서버가 다시 시작되어 작업이 중단되었습니다", time.time(), QUEUED, RUNNING),
+            )
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.root, job_id)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # 서버 스레드가 여러 개라 fork 는 위험하므로 spawn 사용
+            ctx = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx,
+                                             initializer=_init_worker, initargs=(WORKER_WARMUP,))
+        return self._pool
+
+    def start_workers(self):
+        """워커 프로세스를 미리 모두 띄운다 (뜨면서 WORKER_WARMUP 예열을 시작한다)"""
+        with self._lock:
+            pool = self._get_pool()
+            # spawn 풀은 놀고 있는 워커가 없을 때만 새로 띄우므로 워커 수만큼 한꺼번에 넣는다
+            futures = [pool.submit(_ping) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, task: str, kwargs: Optional[Dict[str, Any]] = None, dedupe_key: Optional[str] = None,
+               inputs: Optional[List] = None) -> str:
+        """작업을 제출하고 id 를 돌려준다.
+
+        task 는 "모듈:함수" (함수는 ctx 와 kwargs 를 받는다). inputs 는 (파일명, 바이트) 목록으로,
+        작업 폴더에 저장된 뒤 ctx.inputs() 로 읽는다. dedupe_key 가 같은 작업이 실패/취소되지 않고
+        남아 있으면 새로 만들지 않고 그 id 를 돌려준다.
+        """
+        kwargs = kwargs or {}
+        with self._lock:
+            if dedupe_key is not None:
+                existing = self.find(dedupe_key)
+                if existing is not None:
+                    return existing.id
+
+            job_id = uuid.uuid4().hex[:12]
+            job_dir = self._job_dir(job_id)
+            os.makedirs(os.path.join(job_dir, "inputs"))
+            for i, (name, data) in enumerate(inputs or []):
+                with open(os.path.join(job_dir, "inputs", f"{i:04d}_{os.path.basename(name)}"), "wb") as f:
+                    f.write(data)
+            with _connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT INTO jobs (id, task, dedupe_key, status, owner, created) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, task, dedupe_key, QUEUED, self.owner, time.time()),
+                )
+
+            try:
+                future = self._get_pool().submit(_run, self.db_path, job_id, job_dir, task, kwargs)
+            except BrokenProcessPool:
+                # 워커가 죽은 풀은 버리고 새로 만든다
+                self._pool = None
+                future = self._get_pool().submit(_run, self.db_path, job_id, job_dir, task, kwargs)
+            self._futures[job_id] = future
+            future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+            return job_id
+
+    def _on_done(self, job_id: str, future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+        if future.cancelled():
+            _update(self.db_path, job_id, status=CANCELLED, finished=time.time())
+            return
+        e = future.exception()
+        if e is not None:
+            # 워커 프로세스가 죽는 등 _run 이 상태를 못 남긴 경우
+            if isinstance(e, BrokenProcessPool):
+                with self._lock:
+                    self._pool = None
+            _update(self.db_path, job_id, status=FAILED, finished=time.time(), error=f"{type(e).__name__}: {e}")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with _connect(self.db_path) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row and row["status"] not in FINISHED and row["owner"] != self.owner:
+            # 다른 서버 프로세스의 작업을 지켜보는 중이면 그 서버가 아직 살아 있는지 확인
+            self.reap()
+            with _connect(self.db_path) as conn:
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def find(self, dedupe_key: str) -> Optional[Job]:
+        """같은 키로 제출된, 실패/취소되지 않은 가장 최근 작업"""
+        with _connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE dedupe_key = ? AND status NOT IN (?, ?) ORDER BY created DESC LIMIT 1",
+                (dedupe_key, FAILED, CANCELLED),
+            ).fetchone()
+        return self._job(row) if row else None
+
+    def list(self, limit: int = 20) -> List[Job]:
+        with _connect(self.db_path) as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created DESC LIMIT ?", (limit,)).fetchall()
+        return [self._job(r) for r in rows]
+
+    @staticmethod
+    def _job(row) -> Job:
+        return Job(
+            id=row["id"], task=row["task"], status=row["status"], progress=row["progress"],
+            message=row["message"], result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"], cancel_requested=bool(row["cancel_requested"]),
+            created=row["created"], started=row["started"], finished=row["finished"],
+        )
+
+    def cancel(self, job_id: str):
+        _update(self.db_path, job_id, cancel_requested=1)
+        with self._lock:
+            future = self._futures.get(job_id)
+        # 아직 워커가 집어 가지 않았으면 바로 취소된다 (_on_done 이 상태를 기록)
+        if future is not None:
+            future.cancel()
+
+    def read_output(self, job_id: str, name: str) -> Optional[bytes]:
+        path = os.path.join(self._job_dir(job_id), name)
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def purge(self, keep_seconds: float = KEEP_SECONDS):
+        """끝난 지 오래된 작업과 그 폴더를 지운다"""
+        cutoff = time.time() - keep_seconds
+        with _connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE finished IS NOT NULL AND finished < ?", (cutoff,)
+            ).fetchall()
+            for row in rows:
+                shutil.rmtree(self._job_dir(row["id"]), ignore_errors=True)
+                conn.execute("DELETE FROM jobs WHERE id = ?", (row["id"],))
+
+    def shutdown(self):
+        self._stop.set()
+        with _connect(self.db_path) as conn:
+            conn.execute("DELETE FROM owners WHERE owner = ?", (self.owner,))
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_queue_lock = threading.Lock()
+_queue: Optional[JobQueue] = None
+
+
+def get_queue() -> JobQueue:
+    """프로세스 전역 작업 큐 (Streamlit 스크립트가 다시 돌아도 같은 것)"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
@@ -0,0 +1,151 @@
+# ─── 업로드 파일 병렬 파싱 ────────────────────────────────────────────
+# 엑셀 XML 파싱은 CPU 를 한 코어만 쓰므로, 업로드마다 바이트를 떼어
+# 프로세스 풀에 넘겨 동시에 파싱한다. 결과는 업로드 순서 그대로 돌려준다.
+# 풀은 프로세스에 하나(CPU 수 크기)만 두고, 호출마다 동시에 넣는 파일 수를
+# max_workers 로 제한한다 (사이드바 값마다 풀을 새로 만들지 않는다).
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, Callable, List, Optional, Tuple
+
+from utils.parse_cache import ParseCache, digest, estimate_size, parse_key
+
+# 환경변수 EXCEL_PARSE_WORKERS 로 풀 크기 = 기본 동시 파싱 수를 정할 수 있다 (0 이면 CPU 수)
+DEFAULT_WORKERS = int(os.environ.get("EXCEL_PARSE_WORKERS", "0")) or (os.cpu_count() or 1)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+# ─── 워커에서 실행되는 파서들 (pickle 가능하도록 모듈 최상위에 둔다) ───
+def read_frame(data: bytes):
+    """pd.read_excel 과 동일 (main.py, 01 페이지용)"""
+    import pandas as pd
+    return pd.read_excel(BytesIO(data))
+
+
+def read_compact_frame(data: bytes):
+    """read_frame + 작은 dtype (정수 다운캐스트, 값 종류가 적은 문자열은 category)"""
+    from utils.frame_schema import compact_frame
+    return compact_frame(read_frame(data))
+
+
+def read_workbook(data: bytes):
+    """스타일까지 포함한 전체 워크북 (02 페이지용)"""
+    from openpyxl import load_workbook
+    return load_workbook(BytesIO(data), data_only=False)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    # Streamlit 은 스크립트를 매번 다시 돌리고 세션마다 스레드가 다르므로 잠금 아래 하나만 만든다
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # 서버 스레드가 여러 개라 fork 는 위험하므로 spawn 사용
+            ctx = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=DEFAULT_WORKERS, mp_context=ctx)
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    # 워커가 죽은 풀은 닫고 버린다 (다른 스레드가 이미 새로 만들었으면 그것은 그대로)
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pools(wait: bool = False):
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+atexit.register(shutdown_pools)
+
+
+def _submit(pool: ProcessPoolExecutor, gate: threading.Semaphore, parse_fn, data: bytes):
+    # gate 로 이 호출이 동시에 풀에 넣는 작업 수를 제한한다
+    gate.acquire()
+    try:
+        future = pool.submit(parse_fn, data)
+    except BaseException:
+        gate.release()
+        raise
+    future.add_done_callback(lambda _: gate.release())
+    return future
+
+
+def parse_uploads(
+    uploaded_files,
+    parse_fn: Callable[[bytes], Any],
+    max_workers: Optional[int] = None,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    cache: Optional[ParseCache] = None,
+) -> List[Tuple[Any, Any]]:
+    """업로드 파일들을 parse_fn 으로 파싱해서 (업로드 파일, 결과) 목록을 돌려준다.
+
+    실패한 파일은 목록에서 빠지고 on_error(파일명, 예외) 로 알린다.
+    cache 를 주면 내용 해시가 같은 파일은 파싱하지 않고 캐시에서 꺼낸다.
+    파싱할 파일이 하나뿐이거나 max_workers 가 1 이면 풀을 거치지 않는다.
+    max_workers 는 이 호출의 동시 파싱 수 상한이다 (풀 크기 DEFAULT_WORKERS 를 넘지 않는다).
+    """
+    max_workers = min(max_workers or DEFAULT_WORKERS, DEFAULT_WORKERS)
+    results = [None] * len(uploaded_files)
+    pending = []  # (순번, 업로드 파일, 바이트, 캐시 키)
+
+    for i, uploaded_file in enumerate(uploaded_files):
+        data = uploaded_file.getvalue()
+        key = None
+        if cache is not None:
+            key = parse_key(digest(data), parse_fn)
+            value = cache.get(key)
+            if value is not None:
+                results[i] = (uploaded_file, value)
+                continue
+        pending.append((i, uploaded_file, data, key))
+
+    def store(i, uploaded_file, data, key, value):
+        results[i] = (uploaded_file, value)
+        if key is not None:
+            cache.put(key, value, estimate_size(value, len(data)))
+
+    if max_workers <= 1 or len(pending) <= 1:
+        for i, uploaded_file, data, key in pending:
+            try:
+                store(i, uploaded_file, data, key, parse_fn(data))
+            except Exception as e:
+                if on_error:
+                    on_error(uploaded_file.name, e)
+        return [r for r in results if r is not None]
+
+    gate = threading.Semaphore(max_workers)
+    pool = _get_pool()
+    futures = []  # (넣은 풀, future)
+    for _, _, data, _ in pending:
+        try:
+            futures.append((pool, _submit(pool, gate, parse_fn, data)))
+        except BrokenProcessPool:
+            # 워커가 죽은 풀은 닫고 새로 만든다
+            _discard_pool(pool)
+            pool = _get_pool()
+            futures.append((pool, _submit(pool, gate, parse_fn, data)))
+
+    for (i, uploaded_file, data, key), (used, future) in zip(pending, futures):
+        try:
+            store(i, uploaded_file, data, key, future.result())
+        except BrokenProcessPool as e:
+            _discard_pool(used)
+            if on_error:
+                on_error(uploaded_file.name, e)
+        except Exception as e:
+            if on_error:
+                on_error(uploaded_file.name, e)
+    return [r for r in results if r is not None]
@@ -0,0 +1,107 @@
+# ─── 업로드 파싱 결과 캐시 ────────────────────────────────────────────
+# Streamlit 은 위젯을 건드릴 때마다 스크립트를 처음부터 다시 돌린다.
+# 업로드 바이트의 SHA-256 + 파싱 옵션을 키로 결과를 프로세스 전역에 보관해서
+# 같은 파일은 세션이 달라도 다시 파싱하지 않는다. 메모리 예산을 넘으면
+# 가장 오래 안 쓴 항목부터 버린다 (LRU).
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+# 환경변수 PARSE_CACHE_MB 로 메모리 예산 설정 (기본 512MB)
+DEFAULT_BUDGET = int(os.environ.get("PARSE_CACHE_MB", "512")) * 1024 * 1024
+# openpyxl 워크북처럼 크기를 재기 어려운 객체는 원본 xlsx 크기의 이 배수로 어림한다
+OBJECT_SIZE_FACTOR = 30
+
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def estimate_size(value: Any, source_size: int = 0) -> int:
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    approx_size = getattr(value, "approx_size", None)
+    if approx_size is not None:  # 크기를 스스로 어림하는 객체 (excel_stream.StreamResult)
+        return approx_size()
+    memory_usage = getattr(value, "memory_usage", None)
+    if memory_usage is not None:  # pandas DataFrame
+        try:
+            return int(memory_usage(deep=True).sum())
+        except TypeError:
+            pass
+    return max(source_size, 1) * OBJECT_SIZE_FACTOR
+
+
+class ParseCache:
+    """메모리 예산이 있는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.budget = budget
+        self._items: "OrderedDict[Hashable, tuple]" = OrderedDict()  # 키 → (값, 크기)
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: Any, size: int):
+        with self._lock:
+            if size > self.budget:
+                # 예산보다 큰 항목은 넣지 않는다
+                return
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._items[key] = (value, size)
+            self.size += size
+            while self.size > self.budget:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any], source_size: int = 0):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            self.put(key, value, estimate_size(value, source_size))
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "size_mb": round(self.size / 1024 / 1024, 1),
+                "budget_mb": round(self.budget / 1024 / 1024, 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+_MISSING = object()
+
+# 모든 세션이 함께 쓰는 캐시 (모듈은 프로세스당 한 번만 import 된다)
+parse_cache = ParseCache()
+
+
+def parse_key(data_digest: str, parse_fn: Callable, options: tuple = ()) -> tuple:
+    return (data_digest, f"{parse_fn.__module__}.{parse_fn.__qualname__}", options)
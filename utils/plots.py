@@ -0,0 +1,73 @@
+# ─── 대용량 산점도 렌더링 ─────────────────────────────────────────────
+# 점이 많으면 산점도 대신 성별별 hexbin 밀도 그림으로 바꾼다.
+# 그린 그림은 PNG 바이트로 캐시하고(필터 선택 + 변수로 키), Figure 는
+# 다 그리면 바로 닫아서 긴 세션에서도 메모리가 늘지 않게 한다.
+import os
+from io import BytesIO
+from typing import Hashable, Optional
+
+import pandas as pd
+
+from utils.parse_cache import ParseCache
+
+# 환경변수 SCATTER_MAX_POINTS 로 산점도 → 밀도 그림 전환 기준 설정
+DEFAULT_MAX_POINTS = int(os.environ.get("SCATTER_MAX_POINTS", "20000"))
+# 그림 캐시 예산 (PNG 바이트 기준)
+figure_cache = ParseCache(budget=int(os.environ.get("FIGURE_CACHE_MB", "64")) * 1024 * 1024)
+
+
+def _render(df: pd.DataFrame, x: str, y: str, hue: str, max_points: int) -> bytes:
+    # pyplot 의 전역 상태를 쓰지 않는 Figure 를 직접 만든다 (여러 세션이 동시에 그려도 안전)
+    from matplotlib.figure import Figure
+    import seaborn as sns
+
+    if len(df) <= max_points:
+        fig = Figure()
+        ax = fig.subplots()
+        sns.scatterplot(data=df, x=x, y=y, hue=hue, ax=ax)
+    else:
+        levels = [v for v in pd.unique(df[hue].dropna())]
+        fig = Figure(figsize=(4.5 * max(len(levels), 1), 4))
+        axes = fig.subplots(1, max(len(levels), 1), sharex=True, sharey=True, squeeze=False)[0]
+        for ax, level in zip(axes, levels):
+            part = df[df[hue] == level]
+            xs = pd.to_numeric(part[x], errors="coerce")
+            ys = pd.to_numeric(part[y], errors="coerce")
+            ok = xs.notna() & ys.notna()
+            hb = ax.hexbin(xs[ok], ys[ok], gridsize=40, mincnt=1, bins="log", cmap="viridis")
+            fig.colorbar(hb, ax=ax, label="count (log)")
+            ax.set_title(f"{hue} = {level} (n={int(ok.sum()):,})")
+            ax.set_xlabel(x)
+        axes[0].set_ylabel(y)
+        fig.tight_layout()
+
+    buf = BytesIO()
+    try:
+        fig.savefig(buf, format="png", dpi=100)
+    finally:
+        # 명시적으로 해제
+        fig.clear()
+    return buf.getvalue()
+
+
+def scatter_image(
+    df: pd.DataFrame,
+    x: str,
+    y: str = "exam_score",
+    hue: str = "gender",
+    max_points: Optional[int] = None,
+    cache_key: Optional[Hashable] = None,
+) -> bytes:
+    """산점도(또는 점이 많으면 밀도 그림) PNG 바이트.
+
+    cache_key 는 필터 선택처럼 df 내용을 결정하는 값이어야 한다.
+    """
+    max_points = max_points or DEFAULT_MAX_POINTS
+    if cache_key is None:
+        return _render(df, x, y, hue, max_points)
+    key = (cache_key, x, y, hue, len(df) > max_points)
+    png = figure_cache.get(key)
+    if png is None:
+        png = _render(df, x, y, hue, max_points)
+        figure_cache.put(key, png, len(png))
+    return png
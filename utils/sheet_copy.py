@@ -0,0 +1,72 @@
+# ─── 스타일 보존 시트 복사 ────────────────────────────────────────────
+# 셀마다 font/border/fill/... 을 copy() 하면 저장할 때 openpyxl 이 다시
+# 중복 제거를 해야 한다. 원본 셀의 스타일 인덱스 묶음(StyleArray)이
+# 같으면 대상 워크북에서도 같은 스타일이므로, 서로 다른 스타일마다 한 번만
+# 변환하고 그 결과를 모든 셀에 재사용한다.
+from copy import copy
+
+from openpyxl.styles.cell_style import StyleArray
+
+
+def _translate_style(src_cell, tgt_cell):
+    # 기존 페이지와 같은 방식으로 한 번 복사 → openpyxl 이 대상 워크북에 등록
+    tgt_cell.font = copy(src_cell.font)
+    tgt_cell.border = copy(src_cell.border)
+    tgt_cell.fill = copy(src_cell.fill)
+    tgt_cell.number_format = src_cell.number_format
+    tgt_cell.protection = copy(src_cell.protection)
+    tgt_cell.alignment = copy(src_cell.alignment)
+    return StyleArray(tgt_cell._style)
+
+
+def copy_dimensions(src, tgt):
+    """행 높이/열 너비 복사. 기본값만 반복하는 항목은 건너뛴다"""
+    tgt.sheet_format.defaultRowHeight = src.sheet_format.defaultRowHeight
+    tgt.sheet_format.defaultColWidth = src.sheet_format.defaultColWidth
+
+    for key, src_dim in src.column_dimensions.items():
+        if src_dim.width is None and not src_dim.hidden and not src_dim.outlineLevel and not src_dim.bestFit:
+            continue
+        tgt_dim = tgt.column_dimensions[key]
+        width = src_dim.width if src_dim.width is not None else src.sheet_format.defaultColWidth
+        # defaultColWidth 가 없는 시트도 있으므로 None 은 쓰지 않는다
+        if width is not None:
+            tgt_dim.width = width
+        tgt_dim.hidden = src_dim.hidden
+        tgt_dim.outlineLevel = src_dim.outlineLevel
+        tgt_dim.bestFit = src_dim.bestFit
+        # A:C 처럼 범위로 묶인 열 정의 유지
+        tgt_dim.min = src_dim.min
+        tgt_dim.max = src_dim.max
+
+    for row_idx, src_dim in src.row_dimensions.items():
+        if src_dim.height is None and not src_dim.hidden and not src_dim.outlineLevel:
+            continue
+        tgt_dim = tgt.row_dimensions[row_idx]
+        tgt_dim.height = src_dim.height if src_dim.height is not None else src.sheet_format.defaultRowHeight
+        tgt_dim.hidden = src_dim.hidden
+        tgt_dim.outlineLevel = src_dim.outlineLevel
+
+
+def copy_sheet(src, tgt):
+    """src 시트의 값·스타일·크기·병합·틀 고정을 tgt 시트로 복사"""
+    copy_dimensions(src, tgt)
+
+    # 병합 셀 복사
+    for merged in src.merged_cells.ranges:
+        tgt.merge_cells(str(merged))
+
+    # Freeze panes 복사
+    tgt.freeze_panes = src.freeze_panes
+
+    # 셀 값 + 스타일 복사 (원본 StyleArray → 대상 StyleArray 캐시)
+    style_cache = {}
+    for cell in src._cells.values():
+        nc = tgt.cell(row=cell.row, column=cell.column, value=cell.value)
+        if cell.has_style:
+            key = tuple(cell._style)
+            style = style_cache.get(key)
+            if style is None:
+                style = style_cache[key] = _translate_style(cell, nc)
+            else:
+                nc._style = StyleArray(style)
@@ -0,0 +1,147 @@
+# ─── 유사도 조회용 전처리 산출물 저장소 ───────────────────────────────
+# 학습된 전처리기(ColumnTransformer)와 float32 특성 행렬을 디스크에 저장한다.
+# 키는 데이터셋 서명 + 특성 목록 + 산출물 버전의 지문이라서, 데이터나
+# 특성 정의가 바뀔 때만 다시 만든다. 특성 행렬은 mmap 으로 열기 때문에
+# 여러 세션/프로세스가 같은 메모리 페이지를 공유한다.
+import json
+import os
+import pickle
+import shutil
+from dataclasses import dataclass
+from typing import Any, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.knn_index import KnnIndex, fingerprint
+
+# 전처리/저장 형식이 바뀌면 올려서 예전 산출물을 무효화
+ARTIFACT_VERSION = 1
+# 환경변수 SIMILARITY_ARTIFACT_DIR 로 저장 위치 설정
+ARTIFACT_DIR = os.environ.get("SIMILARITY_ARTIFACT_DIR", ".artifacts")
+# 특성 행렬을 만들 때 한 번에 변환할 행 수
+TRANSFORM_CHUNK_ROWS = 100000
+# 명단 일괄 조회 시 한 번에 변환할 행 수 (메모리 상한)
+ROSTER_CHUNK_ROWS = 20000
+
+
+def create_preprocessor(df, numeric_features, categorical_features):
+    # sklearn 은 import 가 2초 넘게 걸려서, 전처리기를 새로 만들 때만 불러온다
+    from sklearn.compose import ColumnTransformer
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    df_copy = df[numeric_features + categorical_features].copy()
+    df_copy[numeric_features] = df_copy[numeric_features].apply(pd.to_numeric, errors='coerce')
+    df_copy[categorical_features] = df_copy[categorical_features].astype(str)
+    num_t = StandardScaler()
+    cat_t = OneHotEncoder(handle_unknown='ignore', sparse_output=False)
+    pre = ColumnTransformer([
+        ('num', num_t, numeric_features),
+        ('cat', cat_t, categorical_features)
+    ])
+    pre.fit(df_copy)
+    return pre
+
+
+def transform_dataset(df, preprocessor, feature_cols):
+    df2 = df[feature_cols].copy()
+    num_feats = preprocessor.transformers_[0][2]
+    cat_feats = preprocessor.transformers_[1][2]
+    df2[num_feats] = df2[num_feats].apply(pd.to_numeric, errors='coerce')
+    df2[cat_feats] = df2[cat_feats].astype(str)
+    X = preprocessor.transform(df2)
+    return np.nan_to_num(X, nan=0.0, posinf=np.inf, neginf=-np.inf)
+
+
+@dataclass
+class SimilarityArtifacts:
+    key: str
+    preprocessor: Any  # sklearn ColumnTransformer
+    feature_cols: List[str]
+    index: KnnIndex
+
+
+def _sklearn_version() -> str:
+    from importlib.metadata import version
+    return version("scikit-learn")
+
+
+def _build(path: str, df, numeric, categorical):
+    feature_cols = numeric + categorical
+    pre = create_preprocessor(df, numeric, categorical)
+    dims = transform_dataset(df.iloc[:1], pre, feature_cols).shape[1]
+
+    os.makedirs(path)
+    # 전체 float64 행렬을 메모리에 만들지 않고, 묶음별로 변환해 float32 파일에 바로 쓴다
+    X = np.lib.format.open_memmap(os.path.join(path, "X.npy"), mode="w+", dtype=np.float32, shape=(len(df), dims))
+    norms = np.lib.format.open_memmap(os.path.join(path, "norms.npy"), mode="w+", dtype=np.float32, shape=(len(df),))
+    for start in range(0, len(df), TRANSFORM_CHUNK_ROWS):
+        chunk = transform_dataset(df.iloc[start:start + TRANSFORM_CHUNK_ROWS], pre, feature_cols).astype(np.float32)
+        X[start:start + len(chunk)] = chunk
+        norms[start:start + len(chunk)] = np.einsum("ij,ij->i", chunk, chunk)
+    X.flush()
+    norms.flush()
+    del X, norms
+    np.save(os.path.join(path, "targets.npy"), df['exam_score'].to_numpy(dtype=np.float32))
+
+    with open(os.path.join(path, "preprocessor.pkl"), "wb") as f:
+        pickle.dump(pre, f)
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "version": ARTIFACT_VERSION,
+            "sklearn": _sklearn_version(),
+            "rows": len(df),
+            "dims": int(dims),
+            "numeric": numeric,
+            "categorical": categorical,
+        }, f, ensure_ascii=False)
+
+
+def load_artifacts(df, signature: str, numeric: Sequence[str], categorical: Sequence[str]) -> SimilarityArtifacts:
+    """산출물이 디스크에 있으면 읽고, 없으면 만들어 저장한 뒤 읽는다"""
+    numeric, categorical = list(numeric), list(categorical)
+    key = fingerprint(ARTIFACT_VERSION, _sklearn_version(), signature, numeric, categorical)
+    path = os.path.join(ARTIFACT_DIR, key)
+
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        # 다른 프로세스와 겹쳐도 안전하도록 임시 폴더에 만든 뒤 이름을 바꾼다
+        tmp = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(ARTIFACT_DIR, exist_ok=True)
+        _build(tmp, df, numeric, categorical)
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            # 이미 누군가 만들어 두었으면 그것을 쓴다
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    with open(os.path.join(path, "preprocessor.pkl"), "rb") as f:
+        pre = pickle.load(f)
+    return SimilarityArtifacts(key, pre, numeric + categorical, KnnIndex.load(path))
+
+
+def score_roster(roster, artifacts, df, k, chunk_rows=ROSTER_CHUNK_ROWS, progress=None):
+    """명단 전체를 묶음 단위로 변환·조회해서 유사 학생과 예상 점수 열을 붙여 돌려준다"""
+    def batches():
+        for start in range(0, len(roster), chunk_rows):
+            yield transform_dataset(roster.iloc[start:start + chunk_rows], artifacts.preprocessor, artifacts.feature_cols)
+            if progress:
+                progress(min(1.0, (start + chunk_rows) / len(roster)))
+
+    indices, distances, scores = [], [], []
+    for result in artifacts.index.query_batches(batches(), k=k):
+        indices.append(result.indices[:, 0])
+        distances.append(result.distances[:, 0])
+        scores.append(result.scores)
+    if not scores:
+        return roster.assign(유사학생_ID=[], 유사학생_점수=[], 유사도_거리=[], 예상_점수=[])
+
+    nearest = np.concatenate(indices)
+    match = df.iloc[nearest]
+    id_col = match['student_id'].to_numpy() if 'student_id' in df.columns else nearest
+    return roster.assign(
+        유사학생_ID=id_col,
+        유사학생_점수=match['exam_score'].to_numpy(),
+        유사도_거리=np.concatenate(distances),
+        예상_점수=np.round(np.concatenate(scores), 1),
+    )
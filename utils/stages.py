@@ -0,0 +1,215 @@
+# ─── 단계별 시간/메모리 측정 ──────────────────────────────────────────
+# 페이지와 작업 함수가 느린 단계를 `with stage("main:parse", size=...)` 로 감싸면
+# 걸린 시간, 최대 RSS 증가량(VmHWM), RSS 변화, 입력 크기를 기록한다.
+# 기록은 프로세스마다 자기 로그 파일(stages.<pid>.jsonl)에 JSON 한 줄씩 쌓고,
+# 패널은 모든 프로세스의 파일을 합쳐 읽으므로 작업 워커 프로세스에서 잰 단계도
+# 페이지의 사이드바 패널에서 함께 볼 수 있다. (한 파일을 여러 프로세스가 돌려 쓰지 않는다)
+# 환경변수 STAGE_PROFILE=1 일 때만 동작하고, 꺼져 있으면 with 문 하나의 비용뿐이다.
+# STAGE_PROFILE=mem 이면 파이썬 할당 최대치(tracemalloc)도 함께 잰다. tracemalloc 은
+# 켜져 있는 동안 프로세스의 모든 할당(다른 스레드 포함)을 느리게 하므로 시간은 부풀려진다.
+import functools
+import glob
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# 환경변수로 켜기/로그 위치/로그 크기 설정 (작업 워커 프로세스도 같은 값을 물려받는다)
+PROFILE = os.environ.get("STAGE_PROFILE", "0")
+ENABLED = PROFILE in ("1", "mem")
+TRACE_ALLOC = PROFILE == "mem"
+LOG_DIR = os.environ.get("STAGE_LOG_DIR", ".stage_log")
+# 프로세스 로그 하나의 최대 크기. 넘으면 .1 로 한 번 밀어 두고 새로 쓴다
+LOG_MAX_BYTES = int(os.environ.get("STAGE_LOG_MB", "5")) * 1024 * 1024
+# 이보다 오래 안 쓴 (끝난 프로세스의) 로그는 지운다
+LOG_KEEP_SECONDS = 7 * 24 * 3600
+# 패널이 로그 파일마다 끝에서 읽어 오는 최대 바이트
+TAIL_BYTES = 256 * 1024
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+_lock = threading.Lock()
+_active: List["stage"] = []  # 지금 열려 있는 단계들 (겹친 단계의 최대치를 나눠 갖기 위해)
+_log_pid: Optional[int] = None  # 로그 폴더를 정리한 프로세스 (spawn 된 워커는 따로 정리)
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _hwm_bytes() -> Optional[int]:
+    # 리눅스 /proc 의 VmHWM = 최대 RSS (bench/run.py 와 같은 방식)
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reset_hwm():
+    # 최대 RSS 기록을 지금 RSS 로 되돌린다
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _log_path() -> str:
+    return os.path.join(LOG_DIR, f"stages.{os.getpid()}.jsonl")
+
+
+def _prune_logs():
+    os.makedirs(LOG_DIR, exist_ok=True)
+    cutoff = time.time() - LOG_KEEP_SECONDS
+    for path in glob.glob(os.path.join(LOG_DIR, "stages.*.jsonl*")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _write(record: Dict[str, Any]):
+    global _log_pid
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _lock:
+        if _log_pid != os.getpid():
+            _prune_logs()
+            _log_pid = os.getpid()
+        path = _log_path()
+        try:
+            if os.path.getsize(path) + len(line) > LOG_MAX_BYTES:
+                os.replace(path, path + ".1")
+        except OSError:
+            pass  # 아직 파일이 없음
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def _update_peaks():
+    # 최대치 기록은 프로세스에 하나라서, 초기화하기 전에 열린 단계들에 나눠 준다
+    hwm = _hwm_bytes()
+    alloc = tracemalloc.get_traced_memory()[1] if TRACE_ALLOC else 0
+    for s in _active:
+        if hwm is not None:
+            s._peak = max(s._peak, hwm)
+        s._alloc_peak = max(s._alloc_peak, alloc)
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / 1024 / 1024, 2) if value is not None else None
+
+
+class stage:
+    """단계 하나를 재는 with 문. size 에는 입력 바이트 수를, rows 에는 행 수를 줄 수 있다.
+
+    with stage("05:transform", rows=len(df)) as s:
+        ...
+        s.rows = len(result)   # 끝난 뒤에 알게 된 크기는 이렇게
+    """
+
+    __slots__ = ("name", "size", "rows", "_start", "_rss0", "_peak", "_alloc0", "_alloc_peak")
+
+    def __init__(self, name: str, size: Optional[int] = None, rows: Optional[int] = None):
+        self.name = name
+        self.size = size
+        self.rows = rows
+
+    def __enter__(self):
+        if not ENABLED:
+            return self
+        with _lock:
+            _update_peaks()
+            _reset_hwm()
+            self._rss0 = _rss_bytes()
+            self._peak = self._rss0 or 0
+            self._alloc0 = self._alloc_peak = 0
+            if TRACE_ALLOC:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                tracemalloc.reset_peak()
+                self._alloc0 = self._alloc_peak = tracemalloc.get_traced_memory()[0]
+            _active.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not ENABLED:
+            return False
+        seconds = time.perf_counter() - self._start
+        rss = _rss_bytes()
+        with _lock:
+            _update_peaks()
+            _active.remove(self)
+            if TRACE_ALLOC and not _active:
+                tracemalloc.stop()
+        record = {
+            "ts": round(time.time(), 3),
+            "stage": self.name,
+            "seconds": round(seconds, 4),
+            "peak_mb": _mb(self._peak - self._rss0) if self._rss0 else None,
+            "rss_delta_mb": _mb(rss - self._rss0) if rss and self._rss0 else None,
+            "size_mb": round(self.size / 1024 / 1024, 3) if self.size is not None else None,
+            "rows": self.rows,
+            "pid": os.getpid(),
+            "error": exc_type.__name__ if exc_type else None,
+        }
+        if TRACE_ALLOC:
+            record["alloc_peak_mb"] = _mb(self._alloc_peak - self._alloc0)
+        try:
+            _write(record)
+        except OSError:
+            pass  # 로그를 못 써도 페이지는 계속
+        return False
+
+
+def timed(name: Optional[str] = None):
+    """함수 전체를 한 단계로 재는 데코레이터"""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with stage(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _tail_lines(path: str) -> List[str]:
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - TAIL_BYTES))
+            return f.read().decode("utf-8", "replace").splitlines()
+    except OSError:
+        return []
+
+
+def recent_stages(prefix: Union[str, Tuple[str, ...]] = "", limit: int = 50) -> List[Dict[str, Any]]:
+    """모든 프로세스 로그의 끝부분에서 이름이 prefix(튜플이면 그중 하나)로 시작하는 기록을 최근 것부터 돌려준다 (패널용)"""
+    found = []
+    # 같은 시각이면 파일에 쓴 순서대로 (밀어 둔 .1 파일이 먼저)
+    paths = sorted(glob.glob(os.path.join(LOG_DIR, "stages.*.jsonl*")), key=lambda p: not p.endswith(".1"))
+    for path in paths:
+        for line in _tail_lines(path):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # 잘려서 읽힌 첫 줄
+            if record.get("stage", "").startswith(prefix):
+                found.append((record.get("ts", 0), len(found), record))
+    found.sort(key=lambda item: item[:2], reverse=True)
+    return [record for _, _, record in found[:limit]]
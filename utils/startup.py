@@ -0,0 +1,122 @@
+# ─── 시작 시간 단축: 렌더 시간 기록 + 백그라운드 예열 ──────────────────
+# 무거운 라이브러리(torch/whisper, sklearn, matplotlib/seaborn)는 각 페이지에서
+# 실제로 필요한 코드가 돌 때 import 한다. 대신 첫 화면이 그려진 뒤에
+# 백그라운드 스레드가 데이터셋과 라이브러리를 미리 올려 두고, 작업 워커 프로세스를
+# 미리 띄워서 인식이 실제로 도는 그 프로세스들에 Whisper 모델을 올려 둔다.
+# 페이지마다 스크립트 시작 → 끝 시간을 기록해서 첫 렌더/최근 렌더 시간을 보여준다.
+# 페이지는 맨 위(import 보다 먼저)에서 time.perf_counter() 를 적어 두고,
+# 스크립트 끝에서 finish_page("페이지 이름", 그 시각) 을 한 번 부른다.
+import importlib
+import importlib.util
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 환경변수 APP_WARMUP=0 으로 예열 끄기
+WARMUP_ENABLED = os.environ.get("APP_WARMUP", "1") != "0"
+
+_lock = threading.Lock()
+_renders: Dict[str, Dict[str, Any]] = {}
+_warmup: Dict[str, Any] = {"state": "idle", "steps": {}}
+_warmup_thread: Optional[threading.Thread] = None
+
+
+# ─── 렌더 시간 ───────────────────────────────────────────────────────
+def render_finished(page: str, started: float) -> Dict[str, Any]:
+    """페이지 스크립트 끝에서 부른다. 이 프로세스에서의 첫 렌더/최근 렌더 시간(초)을 돌려준다"""
+    elapsed = time.perf_counter() - started
+    with _lock:
+        stats = _renders.get(page)
+        if stats is None:
+            # 프로세스에서 이 페이지를 처음 그린 시간 = import 비용까지 포함한 첫 렌더 시간
+            stats = _renders[page] = {"first": elapsed, "runs": 0}
+        stats["last"] = elapsed
+        stats["runs"] += 1
+        return dict(stats)
+
+
+def render_caption(page: str, started: float) -> str:
+    stats = render_finished(page, started)
+    return f"⏱ 렌더 {stats['last']:.2f}초 (이 서버의 첫 렌더 {stats['first']:.2f}초, {stats['runs']}회)"
+
+
+def finish_page(page: str, started: float) -> str:
+    """페이지 스크립트 끝에서 한 번 부른다: 첫 화면을 그린 뒤 예열을 시작하고, 렌더 시간 문구를 돌려준다.
+
+    _render_start = time.perf_counter()   # 페이지 맨 위
+    ...
+    st.sidebar.caption(finish_page("main", _render_start))
+    """
+    start_warmup()
+    return render_caption(page, started)
+
+
+def render_stats() -> Dict[str, Dict[str, Any]]:
+    with _lock:
+        return {page: dict(s) for page, s in _renders.items()}
+
+
+# ─── 예열 ────────────────────────────────────────────────────────────
+def _import_libraries():
+    for name in ("sklearn.compose", "sklearn.preprocessing", "matplotlib.figure", "seaborn"):
+        if importlib.util.find_spec(name.split(".")[0]) is not None:
+            importlib.import_module(name)
+
+
+def _load_dataset():
+    from utils.student_data import CSV_PATH, load_students
+    if os.path.exists(CSV_PATH):
+        load_students()
+        load_students(fill_numeric=True)
+
+
+def _start_job_workers():
+    # Whisper 는 작업 워커 프로세스에서 돌기 때문에 워커를 미리 띄워 그쪽에서 모델을 올린다
+    # (utils.job_tasks:warm_worker). 이 프로세스에 올려 봐야 인식에는 쓰이지 않는다
+    if importlib.util.find_spec("whisper") is None:
+        return
+    from utils.jobs import get_queue
+    get_queue().start_workers()
+
+
+DEFAULT_STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("dataset", _load_dataset),
+    ("libraries", _import_libraries),
+    ("whisper", _start_job_workers),
+]
+
+
+def _run_warmup(steps):
+    for name, fn in steps:
+        start = time.perf_counter()
+        try:
+            fn()
+            result = round(time.perf_counter() - start, 2)
+        except Exception as e:
+            result = f"{type(e).__name__}: {e}"
+        with _lock:
+            _warmup["steps"][name] = result
+    with _lock:
+        _warmup["state"] = "done"
+
+
+def start_warmup(steps: Optional[List[Tuple[str, Callable[[], None]]]] = None) -> bool:
+    """예열 스레드를 프로세스당 한 번만 시작한다. 첫 화면을 그린 뒤(스크립트 끝)에 부를 것"""
+    global _warmup_thread
+    if not WARMUP_ENABLED:
+        return False
+    with _lock:
+        if _warmup_thread is not None:
+            return False
+        _warmup["state"] = "running"
+        _warmup_thread = threading.Thread(
+            target=_run_warmup, args=(steps or DEFAULT_STEPS,), name="app-warmup", daemon=True,
+        )
+        _warmup_thread.start()
+        return True
+
+
+def warmup_status() -> Dict[str, Any]:
+    with _lock:
+        return {"state": _warmup["state"], "steps": dict(_warmup["steps"])}
@@ -0,0 +1,102 @@
+# ─── 집계 큐브 ────────────────────────────────────────────────────────
+# (전공, 성별, 범주형 변수값) 칸마다 exam_score 의 개수/합/제곱합을,
+# (전공, 성별) 칸마다 수치형 변수들의 교차 모멘트를 미리 계산해 둔다.
+# 사이드바 필터가 바뀌어도 전체 행을 다시 훑지 않고 칸들만 더해서
+# 평균·표준편차·상관계수를 구할 수 있다.
+import threading
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+TARGET = "exam_score"
+DIMS = ["major", "gender"]
+
+
+class StatsCube:
+    def __init__(self, df: pd.DataFrame, categorical: Sequence[str], numeric: Sequence[str]):
+        self.numeric: List[str] = list(numeric)
+        y = pd.to_numeric(df[TARGET], errors="coerce").astype("float64")
+        base = df[DIMS].assign(_y=y, _y2=y * y)
+
+        # 범주형 변수별 (major, gender, 값) → count/sum/sumsq
+        self.groups: Dict[str, pd.DataFrame] = {}
+        for var in categorical:
+            g = base.assign(**{var: df[var]}).groupby(DIMS + [var], observed=True)
+            self.groups[var] = pd.DataFrame({
+                "count": g["_y"].count(),
+                "sum": g["_y"].sum(),
+                "sumsq": g["_y2"].sum(),
+            })
+
+        # (major, gender) → 짝별 결측 제외 교차 모멘트 (df.corr() 와 같은 결과)
+        cols = self.numeric
+        self.moments: Dict[tuple, Dict[str, np.ndarray]] = {}
+        for key, part in df.groupby(DIMS, observed=True)[cols]:
+            x = part.apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64")
+            mask = ~np.isnan(x)
+            x0 = np.where(mask, x, 0.0)
+            m = mask.astype("float64")
+            self.moments[key] = {
+                "n": m.T @ m,            # n[i, j]: i, j 둘 다 있는 행 수
+                "sx": x0.T @ m,          # sx[i, j]: j 가 있는 행에서 x_i 의 합
+                "sxx": (x0 * x0).T @ m,
+                "sxy": x0.T @ x0,
+            }
+
+    @staticmethod
+    def _select(frame: pd.DataFrame, majors, genders) -> pd.DataFrame:
+        idx = frame.index
+        keep = idx.get_level_values(0).isin(majors) & idx.get_level_values(1).isin(genders)
+        return frame[keep]
+
+    def group_stats(self, var: str, majors, genders) -> pd.DataFrame:
+        """var 값별 exam_score 개수/평균/표준편차 (필터 적용)"""
+        cells = self._select(self.groups[var], majors, genders)
+        agg = cells.groupby(level=2, observed=True).sum()
+        agg = agg[agg["count"] > 0]
+        mean = agg["sum"] / agg["count"]
+        var_ = (agg["sumsq"] - agg["count"] * mean ** 2) / (agg["count"] - 1)
+        return pd.DataFrame({
+            "count": agg["count"],
+            "mean": mean,
+            "std": np.sqrt(var_.clip(lower=0)),
+        })
+
+    def group_mean(self, var: str, majors, genders) -> pd.Series:
+        return self.group_stats(var, majors, genders)["mean"].rename(TARGET)
+
+    def corr(self, majors, genders) -> pd.DataFrame:
+        """필터에 해당하는 칸들의 모멘트를 더해 수치형 변수 상관계수 행렬 계산"""
+        k = len(self.numeric)
+        total = {name: np.zeros((k, k)) for name in ("n", "sx", "sxx", "sxy")}
+        majors, genders = set(majors), set(genders)
+        for (major, gender), mom in self.moments.items():
+            if major in majors and gender in genders:
+                for name in total:
+                    total[name] += mom[name]
+        n, sx, sxx, sxy = total["n"], total["sx"], total["sxx"], total["sxy"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = n * sxy - sx * sx.T
+            var_i = n * sxx - sx ** 2
+            corr = cov / np.sqrt(var_i * var_i.T)
+        return pd.DataFrame(corr, index=self.numeric, columns=self.numeric)
+
+
+_lock = threading.Lock()
+_cubes: Dict[tuple, tuple] = {}  # (id(df), 범주형, 수치형) → (df, 큐브)
+
+
+def get_cube(df: pd.DataFrame, categorical: Sequence[str], numeric: Sequence[str]) -> StatsCube:
+    """같은 DataFrame 객체(load_students 가 공유하는 것)에 대해서는 큐브를 한 번만 만든다"""
+    key = (id(df), tuple(categorical), tuple(numeric))
+    with _lock:
+        cached = _cubes.get(key)
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        cube = StatsCube(df, categorical, numeric)
+        # 데이터가 바뀌면 예전 큐브는 버린다 (df 를 같이 들고 있어야 id 가 재사용되지 않음)
+        for stale in [k for k, v in _cubes.items() if v[0] is not df]:
+            del _cubes[stale]
+        _cubes[key] = (df, cube)
+        return cube
@@ -0,0 +1,144 @@
+# ─── 학생 습관 데이터셋 로더 ──────────────────────────────────────────
+# CSV 를 처음 한 번만 타입이 정해진 Parquet 파일로 바꿔 두고, 이후에는
+# Parquet 을 읽는다. 문자열 열은 pandas categorical 로 저장한다.
+# CSV 의 크기/수정시각이 바뀌면 Parquet 을 자동으로 다시 만든다.
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 가 없으면 매번 CSV 를 읽는다
+    pa = pq = None
+
+CSV_PATH = "enhanced_student_habits_performance_dataset.csv"
+
+NUMERIC_COLS = [
+    'age', 'study_hours_per_day', 'social_media_hours', 'netflix_hours',
+    'attendance_percentage', 'sleep_hours', 'exercise_frequency',
+    'screen_time', 'parental_support_level', 'motivation_level', 'exam_anxiety_score'
+]
+# 고유값 비율이 이보다 낮은 문자열 열만 categorical 로 (student_id 같은 열 제외)
+CATEGORY_MAX_RATIO = 0.5
+
+_SIGNATURE_KEY = b"source_signature"
+_MEDIANS_KEY = b"numeric_medians"
+
+_lock = threading.Lock()
+_loaded: Dict[tuple, tuple] = {}  # (csv 경로, fill 여부) → (서명, DataFrame)
+
+
+def parquet_path_for(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def _signature(csv_path: str) -> str:
+    st = os.stat(csv_path)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def dataset_signature(csv_path: str = CSV_PATH) -> str:
+    """CSV 가 바뀌면 달라지는 값 (그림 캐시 등의 키로 사용)"""
+    return _signature(csv_path)
+
+
+def _typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    cols = [c for c in NUMERIC_COLS if c in df.columns]
+    df[cols] = df[cols].apply(pd.to_numeric, errors='coerce')
+    for col in df.columns:
+        s = df[col]
+        if s.dtype == object or pd.api.types.is_string_dtype(s.dtype):
+            if s.nunique(dropna=True) <= max(1, len(s) * CATEGORY_MAX_RATIO):
+                df[col] = s.astype("category")
+        elif pd.api.types.is_integer_dtype(s):
+            df[col] = pd.to_numeric(s, downcast="integer")
+    return df
+
+
+def build_parquet(csv_path: str = CSV_PATH, parquet_path: Optional[str] = None) -> pd.DataFrame:
+    """CSV → 타입 지정된 Parquet 변환. 변환한 DataFrame 을 돌려준다"""
+    parquet_path = parquet_path or parquet_path_for(csv_path)
+    signature = _signature(csv_path)
+    df = _typed_frame(pd.read_csv(csv_path))
+    if pq is None:
+        return df
+
+    medians = df.select_dtypes("number").median().to_dict()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_SIGNATURE_KEY] = signature.encode()
+    metadata[_MEDIANS_KEY] = json.dumps(medians).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    # 여러 프로세스가 동시에 만들어도 깨진 파일을 읽지 않도록 임시파일 → 교체
+    tmp = f"{parquet_path}.{os.getpid()}.tmp"
+    try:
+        pq.write_table(table, tmp)
+        os.replace(tmp, parquet_path)
+    except OSError:
+        # 읽기 전용 위치라면 변환 결과만 쓰고 저장은 건너뛴다
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return df
+
+
+def _read_parquet(parquet_path: str, signature: str) -> Optional[pd.DataFrame]:
+    if pq is None or not os.path.exists(parquet_path):
+        return None
+    try:
+        metadata = pq.read_schema(parquet_path).metadata or {}
+    except Exception:
+        return None
+    if metadata.get(_SIGNATURE_KEY, b"").decode() != signature:
+        return None
+    return pq.read_table(parquet_path).to_pandas()
+
+
+def numeric_medians(df: pd.DataFrame) -> pd.Series:
+    return df.select_dtypes("number").median()
+
+
+def load_students(csv_path: str = CSV_PATH, fill_numeric: bool = False) -> pd.DataFrame:
+    """학생 데이터셋을 돌려준다. 프로세스 안에서 공유되므로 돌려받은 DataFrame 은 수정하지 말 것.
+
+    fill_numeric=True 면 NUMERIC_COLS 의 결측치를 중앙값으로 채운 버전을 준다.
+    """
+    signature = _signature(csv_path)
+    key = (os.path.abspath(csv_path), fill_numeric)
+    with _lock:
+        cached = _loaded.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        df = None
+        if fill_numeric:
+            base = _loaded.get((key[0], False))
+            if base is not None and base[0] == signature:
+                df = base[1]
+        if df is None:
+            parquet_path = parquet_path_for(csv_path)
+            df = _read_parquet(parquet_path, signature)
+            if df is None:
+                df = build_parquet(csv_path, parquet_path)
+            _loaded[(key[0], False)] = (signature, df)
+
+        if fill_numeric:
+            cols = [c for c in NUMERIC_COLS if c in df.columns]
+            df = df.copy()
+            df[cols] = df[cols].fillna(_stored_medians(csv_path, df)[cols])
+            _loaded[key] = (signature, df)
+        return df
+
+
+def _stored_medians(csv_path: str, df: pd.DataFrame) -> pd.Series:
+    # 변환할 때 Parquet 메타데이터에 저장해 둔 중앙값을 쓴다 (없으면 계산)
+    parquet_path = parquet_path_for(csv_path)
+    if pq is not None and os.path.exists(parquet_path):
+        raw = (pq.read_schema(parquet_path).metadata or {}).get(_MEDIANS_KEY)
+        if raw:
+            return pd.Series(json.loads(raw))
+    return numeric_medians(df)
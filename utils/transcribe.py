@@ -0,0 +1,236 @@
+# ─── 구간 분할 병렬 음성인식 ──────────────────────────────────────────
+# 오디오를 조용한 지점에서 잘라 앞뒤로 조금씩 겹치는 구간들로 나누고,
+# 구간마다 프로세스 풀의 워커가 Whisper 로 인식한다. 워커는 프로세스마다
+# 모델을 한 번만 올려 두고(utils/whisper_pool.py) 계속 재사용한다.
+# 구간이 끝나는 대로 결과를 돌려주므로 화면에 자막을 차례로 보여줄 수 있고,
+# 겹친 부분의 중복 자막은 "자기 구간" 안에 시작점이 있는 것만 남겨 없앤다.
+# 언어를 정하지 않으면 첫 구간에서 한 번만 감지해 나머지 구간에 그대로 넘긴다
+# (구간마다 따로 감지하면 구간별로 언어가 달라질 수 있고 감지 비용도 반복된다).
+import datetime
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.audio_pipe import SAMPLE_RATE
+from utils.whisper_pool import DEFAULT_THREADS, cuda_available, get_pool, model_key
+
+# 환경변수로 구간 길이/겹침/워커 수 설정
+CHUNK_SECONDS = float(os.environ.get("TRANSCRIBE_CHUNK_SECONDS", "120"))
+OVERLAP_SECONDS = float(os.environ.get("TRANSCRIBE_OVERLAP_SECONDS", "2"))
+# 자를 지점을 찾을 때 목표 위치 앞뒤로 살펴보는 범위
+SEARCH_SECONDS = 10.0
+# 에너지를 계산하는 프레임 길이
+FRAME_SECONDS = 0.03
+# 워커마다 모델을 따로 올리므로 메모리를 생각해 기본은 최대 4개 (0 이면 CPU 수)
+DEFAULT_WORKERS = int(os.environ.get("TRANSCRIBE_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+_pools = {}
+
+
+@dataclass
+class Chunk:
+    index: int
+    start: float       # 자기 구간 시작 (초)
+    end: float         # 자기 구간 끝 (초)
+    audio_start: float  # 겹침을 포함해 실제로 인식하는 오디오 시작 (초)
+
+
+@dataclass
+class Segment:
+    start: float
+    end: float
+    text: str
+
+
+def format_time(seconds: float) -> str:
+    """SRT 타임코드 형식으로 변경: HH:MM:SS,mmm"""
+    td = datetime.timedelta(seconds=seconds)
+    total = td.total_seconds()
+    h = int(total // 3600)
+    m = int((total % 3600) // 60)
+    s = int(total % 60)
+    ms = int((total - int(total)) * 1000)
+    return f"{h:02}:{m:02}:{s:02},{ms:03}"
+
+
+def to_srt(segments: Iterable[Segment]) -> str:
+    lines = []
+    for i, seg in enumerate(segments, start=1):
+        lines.append(f"{i}\n{format_time(seg.start)} --> {format_time(seg.end)}\n{seg.text}\n\n")
+    return "".join(lines)
+
+
+def sub_lines_to_text(lines) -> str:
+    """자막 줄들에서 번호/타임코드/빈 줄을 빼고 텍스트만 남긴다"""
+    out = []
+    for line in lines:
+        t = line.strip()
+        if not t or t.isdigit() or "-->" in t:
+            continue
+        out.append(t)
+    return "\n".join(out)
+
+
+# ─── 분할 ────────────────────────────────────────────────────────────
+def _frame_energy(audio: np.ndarray) -> np.ndarray:
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+    n = len(audio) // frame
+    frames = audio[:n * frame].reshape(n, frame)
+    return np.einsum("ij,ij->i", frames, frames) / frame
+
+
+def split_points(audio: np.ndarray, chunk_seconds: float = CHUNK_SECONDS) -> List[float]:
+    """chunk_seconds 마다, 그 근처에서 가장 조용한 지점을 자를 위치(초)로 고른다"""
+    duration = len(audio) / SAMPLE_RATE
+    if duration <= chunk_seconds * 1.5:
+        return []
+    energy = _frame_energy(audio)
+    # 짧은 잡음에 끌려가지 않도록 0.3초 정도로 이동평균
+    width = max(1, int(0.3 / FRAME_SECONDS))
+    energy = np.convolve(energy, np.ones(width) / width, mode="same")
+
+    points, last = [], 0.0
+    while duration - last > chunk_seconds * 1.5:
+        target = last + chunk_seconds
+        lo = int(max(last + chunk_seconds / 2, target - SEARCH_SECONDS) / FRAME_SECONDS)
+        hi = int(min(duration, target + SEARCH_SECONDS) / FRAME_SECONDS)
+        cut = (lo + int(np.argmin(energy[lo:hi]))) * FRAME_SECONDS if hi > lo else target
+        points.append(cut)
+        last = cut
+    return points
+
+
+def make_chunks(audio: np.ndarray, chunk_seconds: float = CHUNK_SECONDS,
+                overlap: float = OVERLAP_SECONDS) -> List[Tuple[Chunk, np.ndarray]]:
+    duration = len(audio) / SAMPLE_RATE
+    bounds = [0.0] + split_points(audio, chunk_seconds) + [duration]
+    chunks = []
+    for i, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        a = max(0.0, start - overlap)
+        b = min(duration, end + overlap)
+        piece = audio[int(a * SAMPLE_RATE):int(b * SAMPLE_RATE)]
+        chunks.append((Chunk(i, start, end, a), piece))
+    return chunks
+
+
+# ─── 워커 ────────────────────────────────────────────────────────────
+def _set_threads(threads: int):
+    # 0 이면 이 프로세스 혼자 쓰는 것으로 보고 CPU 수만큼. 프로세스를 재사용하므로 매번 맞춘다
+    import torch
+    threads = threads or os.cpu_count() or 1
+    if torch.get_num_threads() != threads:
+        torch.set_num_threads(threads)
+
+
+def transcribe_chunk(model_name: str, audio: np.ndarray, threads: int = 0, language: Optional[str] = None,
+                     beam_size: Optional[int] = None) -> Tuple[str, List[Tuple[float, float, str]]]:
+    """워커 프로세스에서 실행: 구간 하나를 인식해 (언어, (시작, 끝, 텍스트) 목록) 을 돌려준다 (구간 기준 시각)
+
+    model_name 은 whisper_pool.model_key 형식 ("base", "base:int8"), beam_size 가 없거나 1 이면 탐욕 디코딩.
+    language 가 없으면 Whisper 가 감지한 언어를 돌려준다.
+    """
+    _set_threads(threads)
+    options = {"beam_size": beam_size} if beam_size and beam_size > 1 else {}
+    # fp16 은 GPU 에서만 (CPU 에서 켜면 Whisper 가 경고를 내고 float32 로 돈다)
+    with get_pool(model_name).borrow() as model:
+        result = model.transcribe(audio, language=language, fp16=cuda_available(), **options)
+    segments = [(seg["start"], seg["end"], seg["text"].strip()) for seg in result["segments"]]
+    return result.get("language") or language, segments
+
+
+def _own_segments(chunk: Chunk, raw) -> List[Segment]:
+    # 구간 기준 시각 → 전체 기준 시각, 겹침 부분은 시작점이 자기 구간에 있는 것만
+    out = []
+    for start, end, text in raw:
+        start = round(start + chunk.audio_start, 3)
+        end = round(end + chunk.audio_start, 3)
+        if chunk.start <= start < chunk.end and text:
+            out.append(Segment(start, min(end, chunk.end + OVERLAP_SECONDS), text))
+    return out
+
+
+def stitch(done: Dict[int, List[Segment]]) -> List[Segment]:
+    """구간 순서대로 이어 붙이고 시각이 거꾸로 가지 않도록 맞춘다"""
+    out: List[Segment] = []
+    for index in sorted(done):
+        for seg in done[index]:
+            start = max(seg.start, out[-1].end) if out else seg.start
+            out.append(Segment(start, max(seg.end, start), seg.text))
+    return out
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    pool = _pools.get(max_workers)
+    if pool is None:
+        ctx = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx)
+        _pools[max_workers] = pool
+    return pool
+
+
+def shutdown_pools(wait: bool = False):
+    for pool in _pools.values():
+        pool.shutdown(wait=wait, cancel_futures=True)
+    _pools.clear()
+
+
+def transcribe_progressive(
+    audio: np.ndarray,
+    model_name: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    language: Optional[str] = None,
+    chunk_seconds: float = CHUNK_SECONDS,
+    beam_size: Optional[int] = None,
+    threads: int = DEFAULT_THREADS,
+) -> Iterator[Tuple[int, int, List[Segment]]]:
+    """구간이 끝날 때마다 (끝난 구간 수, 전체 구간 수, 지금까지 이어 붙인 자막) 을 돌려준다.
+
+    구간이 하나뿐이거나 max_workers 가 1 이면 풀 없이 이 프로세스의 모델로 인식한다.
+    language 가 없으면 첫 구간을 먼저 인식해 감지한 언어로 나머지 구간을 인식한다.
+    threads 는 인식 프로세스 하나의 torch 연산 스레드 수 (0 이면 CPU 수를 워커 수로 나눈 값).
+    """
+    model_name = model_name or model_key()
+    max_workers = max_workers or DEFAULT_WORKERS
+    chunks = make_chunks(audio, chunk_seconds)
+    done: Dict[int, List[Segment]] = {}
+    # 워커마다 torch 스레드를 나눠 줘서 코어를 서로 뺏지 않게 한다
+    threads = threads or max(1, (os.cpu_count() or 1) // max_workers)
+
+    if max_workers <= 1 or len(chunks) <= 1:
+        for chunk, piece in chunks:
+            language, raw = transcribe_chunk(model_name, piece, threads, language, beam_size)
+            done[chunk.index] = _own_segments(chunk, raw)
+            yield len(done), len(chunks), stitch(done)
+        return
+
+    pool = _get_pool(max_workers)
+    futures = {}
+    try:
+        if language is None:
+            # 언어 감지는 첫 구간에서 한 번만: 이 구간이 끝나야 나머지를 보낸다
+            chunk, piece = chunks[0]
+            language, raw = pool.submit(transcribe_chunk, model_name, piece, threads, None, beam_size).result()
+            done[chunk.index] = _own_segments(chunk, raw)
+            yield len(done), len(chunks), stitch(done)
+        futures = {
+            pool.submit(transcribe_chunk, model_name, piece, threads, language, beam_size): chunk
+            for chunk, piece in chunks if chunk.index not in done
+        }
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk = futures[future]
+                done[chunk.index] = _own_segments(chunk, future.result()[1])
+            yield len(done), len(chunks), stitch(done)
+    except BrokenProcessPool:
+        _pools.pop(max_workers, None)
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
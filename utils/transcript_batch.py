@@ -0,0 +1,260 @@
+# ─── 유튜브 스크립트 일괄 가져오기 ────────────────────────────────────
+# 여러 URL(또는 재생목록)의 공개 자막을 스레드 풀에서 동시에 가져온다.
+# 요청마다 제한 시간을 두고, 일시적인 실패는 지수 백오프로 다시 시도한다.
+# 받아 온 스크립트는 (영상 id, 언어) 별 텍스트 파일로 저장해 다음에는
+# 네트워크 없이 돌려주고, 결과 전체를 zip 하나로 묶을 수 있다.
+# 자막 공급자는 갈아 끼울 수 있어서, 네트워크 없이 확인할 때는
+# 로컬 폴더의 텍스트 파일을 읽는 FakeTranscriptProvider 를 쓴다.
+import os
+import random
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.video_cache import find_video_id
+
+LANGUAGES = ("ko", "en")
+# 환경변수로 동시 요청 수/제한 시간/재시도 횟수 설정
+DEFAULT_WORKERS = int(os.environ.get("TRANSCRIPT_WORKERS", "8"))
+DEFAULT_TIMEOUT = float(os.environ.get("TRANSCRIPT_TIMEOUT", "20"))
+DEFAULT_RETRIES = int(os.environ.get("TRANSCRIPT_RETRIES", "3"))
+BACKOFF_SECONDS = 0.5
+CACHE_DIR = os.environ.get("TRANSCRIPT_CACHE_DIR", ".transcript_cache")
+# 이 폴더가 설정되면 유튜브 대신 로컬 파일(<영상 id>.<언어>.txt)을 읽는다
+FAKE_DIR = os.environ.get("TRANSCRIPT_FAKE_DIR")
+
+
+class TranscriptUnavailable(Exception):
+    """자막이 없거나 꺼져 있음 (다시 시도해도 소용없는 실패)"""
+
+
+# ─── 공급자 ──────────────────────────────────────────────────────────
+class YouTubeTranscriptProvider:
+    """youtube-transcript-api 로 공개 자막을 가져온다 (0.x, 1.x 모두 지원)"""
+
+    def fetch(self, video_id: str, languages: Sequence[str]) -> Tuple[str, str]:
+        from youtube_transcript_api import (
+            NoTranscriptFound, TranscriptsDisabled, VideoUnavailable, YouTubeTranscriptApi,
+        )
+
+        # 0.x 는 클래스 메서드 list_transcripts, 1.x 는 인스턴스 메서드 list
+        lister = getattr(YouTubeTranscriptApi, "list_transcripts", None) or YouTubeTranscriptApi().list
+        try:
+            transcript = lister(video_id).find_transcript(list(languages))
+            segments = transcript.fetch()
+        except (TranscriptsDisabled, NoTranscriptFound, VideoUnavailable) as e:
+            raise TranscriptUnavailable(type(e).__name__) from e
+        text = "\n".join(seg["text"] if isinstance(seg, dict) else seg.text for seg in segments)
+        return transcript.language_code, text
+
+
+class FakeTranscriptProvider:
+    """네트워크 없이 확인용: root/<영상 id>.<언어>.txt 를 자막으로 돌려준다.
+
+    delay 초만큼 기다리고, fail_first 에 있는 영상 id 는 처음 그 횟수만큼 일시적 오류를 낸다.
+    """
+
+    def __init__(self, root: str, delay: float = 0.0, fail_first: Optional[Dict[str, int]] = None):
+        self.root = root
+        self.delay = delay
+        self.fail_first = dict(fail_first or {})
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, video_id: str, languages: Sequence[str]) -> Tuple[str, str]:
+        with self._lock:
+            n = self.calls[video_id] = self.calls.get(video_id, 0) + 1
+        if self.delay:
+            time.sleep(self.delay)
+        if n <= self.fail_first.get(video_id, 0):
+            raise ConnectionError(f"fake transient failure #{n}")
+        for lang in languages:
+            path = os.path.join(self.root, f"{video_id}.{lang}.txt")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    return lang, f.read()
+        raise TranscriptUnavailable(f"no transcript for {video_id}")
+
+
+def default_provider():
+    return FakeTranscriptProvider(FAKE_DIR) if FAKE_DIR else YouTubeTranscriptProvider()
+
+
+# ─── 캐시 ────────────────────────────────────────────────────────────
+class TranscriptCache:
+    """(영상 id, 언어) → 스크립트 텍스트 파일"""
+
+    def __init__(self, root: str = CACHE_DIR):
+        self.root = root
+
+    def _path(self, video_id: str, lang: str) -> str:
+        return os.path.join(self.root, f"{video_id}.{lang}.txt")
+
+    def get(self, video_id: str, languages: Sequence[str]) -> Optional[Tuple[str, str]]:
+        # 언어 우선순위대로 찾는다 (ko 가 없어서 en 을 받았던 영상은 en 이 저장돼 있다)
+        for lang in languages:
+            try:
+                with open(self._path(video_id, lang), encoding="utf-8") as f:
+                    return lang, f.read()
+            except OSError:
+                continue
+        return None
+
+    def put(self, video_id: str, lang: str, text: str):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(video_id, lang)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+
+transcript_cache = TranscriptCache()
+
+
+# ─── 입력 해석 ───────────────────────────────────────────────────────
+_PLAYLIST = re.compile(r"[?&]list=([0-9A-Za-z_-]+)")
+
+
+def expand_playlist(url: str) -> List[str]:
+    """재생목록 URL → 영상 id 목록 (영상 정보는 받지 않고 목록만)"""
+    import yt_dlp
+
+    opts = {"quiet": True, "no_warnings": True, "extract_flat": "in_playlist", "skip_download": True}
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+    return [e["id"] for e in info.get("entries") or [] if e and e.get("id")]
+
+
+def parse_inputs(text: str, on_error: Optional[Callable[[str, Exception], None]] = None) -> List[str]:
+    """줄/공백으로 구분된 URL 들을 영상 id 목록으로 (순서 유지, 중복 제거).
+
+    v= 없이 list= 만 있는 주소는 재생목록으로 펼친다. 해석할 수 없는 줄은 on_error 로 알린다.
+    """
+    ids: List[str] = []
+    for token in text.split():
+        try:
+            if _PLAYLIST.search(token) and "v=" not in token:
+                ids.extend(expand_playlist(token))
+                continue
+            vid = find_video_id(token)
+            if vid is None:
+                raise ValueError("유튜브 영상 주소가 아닙니다")
+            ids.append(vid)
+        except Exception as e:
+            if on_error:
+                on_error(token, e)
+    return list(dict.fromkeys(ids))
+
+
+# ─── 가져오기 ────────────────────────────────────────────────────────
+@dataclass
+class TranscriptResult:
+    video_id: str
+    lang: Optional[str] = None
+    text: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+    attempts: int = 0
+    seconds: float = 0.0
+
+
+def _call_with_timeout(fn, timeout: float):
+    # 공급자 라이브러리가 제한 시간을 받지 않아서 별도 스레드에서 돌리고 기다린다.
+    # 시간을 넘긴 호출은 버린다 (데몬 스레드라 결과가 늦게 와도 무시됨)
+    box = {}
+
+    def run():
+        try:
+            box["value"] = fn()
+        except BaseException as e:
+            box["error"] = e
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise TimeoutError(f"{timeout:g}초 안에 응답이 없습니다")
+    if "error" in box:
+        raise box["error"]
+    return box["value"]
+
+
+def fetch_one(video_id, provider, languages=LANGUAGES, timeout=DEFAULT_TIMEOUT,
+              retries=DEFAULT_RETRIES, cache: Optional[TranscriptCache] = transcript_cache) -> TranscriptResult:
+    start = time.perf_counter()
+    result = TranscriptResult(video_id)
+    if cache is not None:
+        hit = cache.get(video_id, languages)
+        if hit is not None:
+            result.lang, result.text = hit
+            result.cached = True
+            return result
+
+    for attempt in range(retries + 1):
+        result.attempts = attempt + 1
+        try:
+            result.lang, result.text = _call_with_timeout(lambda: provider.fetch(video_id, languages), timeout)
+            result.error = None
+            break
+        except TranscriptUnavailable as e:
+            result.error = str(e) or "자막 없음"
+            break
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            if attempt < retries:
+                # 0.5, 1, 2 ... 초 + 무작위 흔들기 (동시에 실패한 요청들이 같이 몰리지 않게)
+                time.sleep(BACKOFF_SECONDS * (2 ** attempt) * (1 + random.random()))
+
+    if result.text is not None and cache is not None:
+        cache.put(video_id, result.lang, result.text)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def fetch_many(
+    video_ids: Sequence[str],
+    provider=None,
+    languages: Sequence[str] = LANGUAGES,
+    max_workers: int = DEFAULT_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    cache: Optional[TranscriptCache] = transcript_cache,
+    on_result: Optional[Callable[[TranscriptResult], None]] = None,
+) -> List[TranscriptResult]:
+    """영상들의 스크립트를 동시에 가져와 입력 순서대로 돌려준다. on_result 는 끝나는 순서대로 불린다"""
+    provider = provider or default_provider()
+    results: List[Optional[TranscriptResult]] = [None] * len(video_ids)
+    if not video_ids:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(video_ids)))) as pool:
+        futures = {
+            pool.submit(fetch_one, vid, provider, languages, timeout, retries, cache): i
+            for i, vid in enumerate(video_ids)
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if on_result:
+                on_result(result)
+    return results
+
+
+def build_zip(results: Sequence[TranscriptResult]) -> bytes:
+    """성공한 스크립트는 <영상 id>_<언어>_transcript.txt 로, 실패 목록은 _errors.txt 로 묶는다"""
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        errors = []
+        for r in results:
+            if r.text is not None:
+                zf.writestr(f"{r.video_id}_{r.lang}_transcript.txt", r.text)
+            else:
+                errors.append(f"{r.video_id}\t{r.error}")
+        if errors:
+            zf.writestr("_errors.txt", "\n".join(errors))
+    return buf.getvalue()
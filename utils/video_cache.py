@@ -0,0 +1,213 @@
+# ─── 유튜브 메타데이터/자막 디스크 캐시 ────────────────────────────────
+# yt-dlp 를 하위 프로세스로 두 번 띄우는 대신 파이썬 API 로 메타데이터를
+# 한 번만 추출하고, 같은 추출기 세션으로 자막 파일을 받아 온다.
+# 결과(메타데이터 요약, 자막, Whisper 로 만든 자막)는 영상 id 별 JSON 파일로
+# 저장해서 같은 영상을 다시 요청하면 네트워크 없이 바로 돌려준다.
+# 오래된 항목은 TTL 로, 전체 크기가 예산을 넘으면 가장 오래 안 쓴 것부터 지운다.
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# 환경변수로 저장 위치/유효 시간/크기 예산 설정
+CACHE_DIR = os.environ.get("VIDEO_CACHE_DIR", ".video_cache")
+TTL_SECONDS = float(os.environ.get("VIDEO_CACHE_TTL_HOURS", "168")) * 3600
+DEFAULT_BUDGET = int(os.environ.get("VIDEO_CACHE_MB", "200")) * 1024 * 1024
+
+# 저장할 메타데이터 키 (formats 등 큰 값은 버린다)
+META_KEYS = ("id", "title", "duration", "uploader", "channel", "upload_date", "webpage_url", "language")
+
+_ID_PATTERNS = [
+    re.compile(r"(?:v=|/shorts/|/embed/|/live/|youtu\.be/)([0-9A-Za-z_-]{11})"),
+]
+
+
+def find_video_id(url: str) -> Optional[str]:
+    """URL 에서 유튜브 영상 id 를 뽑는다 (네트워크 없이). 못 찾으면 None"""
+    for pattern in _ID_PATTERNS:
+        m = pattern.search(url)
+        if m:
+            return m.group(1)
+    return None
+
+
+def video_id(url: str) -> str:
+    """캐시 키용 영상 id. 유튜브 주소가 아니면 URL 해시"""
+    return find_video_id(url) or "url-" + hashlib.sha256(url.strip().encode()).hexdigest()[:16]
+
+
+class VideoCache:
+    """영상 id → {stored_at, meta, subtitle, transcripts} JSON 파일 캐시"""
+
+    def __init__(self, root: str = CACHE_DIR, ttl: float = TTL_SECONDS, budget: int = DEFAULT_BUDGET):
+        self.root = root
+        self.ttl = ttl
+        self.budget = budget
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, vid: str) -> str:
+        return os.path.join(self.root, f"{vid}.json")
+
+    def get(self, vid: str) -> Optional[Dict[str, Any]]:
+        path = self._path(vid)
+        with self._lock:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            if time.time() - entry.get("stored_at", 0) > self.ttl:
+                self._remove(path)
+                self.misses += 1
+                return None
+            # 최근 사용 시각 = 파일 수정 시각 (크기 초과 시 오래된 것부터 지우는 기준)
+            os.utime(path)
+            self.hits += 1
+            return entry
+
+    def put(self, vid: str, entry: Dict[str, Any]):
+        entry.setdefault("stored_at", time.time())
+        path = self._path(vid)
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+            self._evict(keep=path)
+
+    def add_transcript(self, vid: str, model: str, srt: str):
+        """Whisper 로 만든 자막을 영상 항목에 덧붙인다 (항목이 없으면 새로 만든다)"""
+        entry = self.get(vid) or {"meta": {"id": vid}, "subtitle": None}
+        entry.setdefault("transcripts", {})[model] = srt
+        self.put(vid, entry)
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self, keep: str):
+        files = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        now = time.time()
+        for mtime, size, path in sorted(files):
+            expired = now - mtime > self.ttl
+            if path == keep or not (expired or total > self.budget):
+                continue
+            self._remove(path)
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            if os.path.isdir(self.root):
+                for name in os.listdir(self.root):
+                    self._remove(os.path.join(self.root, name))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes = []
+            if os.path.isdir(self.root):
+                for name in os.listdir(self.root):
+                    if name.endswith(".json"):
+                        try:
+                            sizes.append(os.path.getsize(os.path.join(self.root, name)))
+                        except OSError:
+                            pass
+            return {
+                "videos": len(sizes),
+                "size_mb": round(sum(sizes) / 1024 / 1024, 2),
+                "budget_mb": round(self.budget / 1024 / 1024, 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# 프로세스 안에서 공유하는 캐시
+video_cache = VideoCache()
+
+
+class ExtractError(RuntimeError):
+    """yt-dlp 추출 실패 (페이지가 yt_dlp 를 import 하지 않고도 잡을 수 있게)"""
+
+
+# ─── yt-dlp 추출 ─────────────────────────────────────────────────────
+def _pick_track(tracks) -> Optional[dict]:
+    # vtt 를 우선, 없으면 첫 번째 형식
+    for track in tracks:
+        if track.get("ext") == "vtt" and track.get("url"):
+            return track
+    return next((t for t in tracks if t.get("url")), None)
+
+
+def extract_video(url: str) -> Dict[str, Any]:
+    """yt_dlp API 로 메타데이터를 한 번 추출하고, 첫 번째 수동 자막 트랙을 받아 온다.
+
+    메타데이터 추출이 실패하면 ExtractError 를 올린다. 자막 파일만 못 받았으면
+    subtitle 을 None 으로 두고 subtitle_error 에 이유를 적는다 (페이지는 Whisper 로 넘어간다).
+    """
+    import yt_dlp
+    from yt_dlp.utils import DownloadError, YoutubeDLError
+
+    opts = {"quiet": True, "no_warnings": True, "skip_download": True, "noplaylist": True}
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        try:
+            info = ydl.extract_info(url, download=False)
+        except DownloadError as e:
+            raise ExtractError(str(e)) from e
+        subtitle = subtitle_error = None
+        # 라이브 채팅 기록은 subtitles 에 섞여 오지만 자막이 아니다
+        subs = {k: v for k, v in (info.get("subtitles") or {}).items() if k != "live_chat"}
+        if subs:
+            lang, tracks = next(iter(subs.items()))
+            track = _pick_track(tracks)
+            if track is not None:
+                # HTTP/네트워크 오류 (yt_dlp 의 RequestError 는 YoutubeDLError, urllib 쪽은 OSError)
+                try:
+                    with ydl.urlopen(track["url"]) as resp:
+                        text = resp.read().decode("utf-8", "replace")
+                    subtitle = {"lang": lang, "ext": track.get("ext"), "text": text}
+                except (YoutubeDLError, OSError) as e:
+                    subtitle_error = f"{type(e).__name__}: {e}"
+
+    entry = {
+        "meta": {k: info.get(k) for k in META_KEYS if info.get(k) is not None},
+        "subtitle": subtitle,
+        "transcripts": {},
+    }
+    if subtitle_error:
+        entry["subtitle_error"] = subtitle_error
+    return entry
+
+
+def fetch_video(url: str, cache: Optional[VideoCache] = video_cache) -> Dict[str, Any]:
+    """캐시에 있으면 바로, 없으면 추출해서 저장한 뒤 항목을 돌려준다"""
+    vid = video_id(url)
+    if cache is not None:
+        entry = cache.get(vid)
+        if entry is not None:
+            return entry
+    entry = extract_video(url)
+    # 자막을 일시적으로 못 받은 결과는 캐시하지 않는다 (다음 요청에서 다시 시도)
+    if cache is not None and "subtitle_error" not in entry:
+        cache.put(vid, entry)
+    return entry
@@ -0,0 +1,214 @@
+# ─── Whisper 모델 풀 ──────────────────────────────────────────────────
+# 모델 크기마다 프로세스 안에서 한 번만 가중치를 읽고, 미리 올려 둔
+# 인스턴스를 빌려 쓰고 돌려준다. 인스턴스 수가 동시 인식 수의 상한이고,
+# 모두 사용 중이면 돌아올 때까지 기다린다. Whisper 의 transcribe 는
+# 모델에 훅을 다는 등 스레드 안전하지 않아서 인스턴스 하나는 한 번에 한 요청만 쓴다.
+# 풀 이름은 "base" 처럼 모델 크기만 있거나 "base:int8" 처럼 CPU 용 int8 동적 양자화
+# 모드가 붙는다 (model_key). GPU 가 없는 서버에서는 선형 층을 int8 로 바꾼 모델이
+# 더 빠르고 가볍다 — 정확도 차이는 python -m bench.whisper_cpu 로 확인.
+# int8 은 CPU 전용이라 CUDA 를 쓸 수 있는 서버에서는 골라도 float32 (GPU) 로 돈다.
+# 양자화가 실패하면 (양자화 커널이 없는 torch 빌드 등) 경고만 내고 float32 로 돈다.
+import functools
+import importlib.util
+import os
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# 환경변수 WHISPER_MODEL 로 기본 모델 크기 설정 (tiny/base/small/medium/large)
+DEFAULT_MODEL = os.environ.get("WHISPER_MODEL", "base")
+# 환경변수 WHISPER_POOL_SIZE 로 모델 크기당 인스턴스 수 (= 동시 인식 수) 설정
+DEFAULT_POOL_SIZE = max(1, int(os.environ.get("WHISPER_POOL_SIZE", "1")))
+# 환경변수 WHISPER_INT8=1 이면 GPU 가 없는 서버의 기본값을 int8 양자화 모델로
+DEFAULT_QUANTIZE = os.environ.get("WHISPER_INT8", "0") == "1"
+# 환경변수 WHISPER_THREADS 로 인식 프로세스 하나의 torch 연산 스레드 수 (0 이면 CPU 수 / 워커 수)
+DEFAULT_THREADS = int(os.environ.get("WHISPER_THREADS", "0"))
+MODEL_SIZES = ["tiny", "base", "small", "medium", "large"]
+INT8 = "int8"
+
+
+@functools.lru_cache(maxsize=None)
+def cuda_available() -> bool:
+    """torch 가 CUDA 를 쓸 수 있는지 (처음 부를 때 torch 를 import 한다)"""
+    if importlib.util.find_spec("torch") is None:
+        return False
+    import torch
+    return torch.cuda.is_available()
+
+
+def model_key(name: str = DEFAULT_MODEL, quantize: bool = DEFAULT_QUANTIZE) -> str:
+    """풀/캐시 이름 ("base" 또는 "base:int8"). CUDA 가 있으면 quantize 는 무시한다"""
+    return f"{name}:{INT8}" if quantize and not cuda_available() else name
+
+
+def transcript_key(key: str, language: Optional[str] = None, beam_size: Optional[int] = None) -> str:
+    """영상 캐시에 Whisper 자막을 저장하는 이름 (설정이 다르면 다른 자막)"""
+    parts = [key]
+    if language:
+        parts.append(language)
+    if beam_size and beam_size > 1:
+        parts.append(f"beam{beam_size}")
+    return "|".join(parts)
+
+
+def quantize_int8(model):
+    """선형 층 가중치를 int8 로 (활성값은 실행할 때마다 동적으로 양자화)"""
+    import torch
+    from torch import nn
+    from torch.ao.quantization import quantize_dynamic
+
+    # x86 은 fbgemm, ARM 서버는 qnnpack 커널을 쓴다
+    engines = torch.backends.quantized.supported_engines
+    if "fbgemm" not in engines and "qnnpack" in engines:
+        torch.backends.quantized.engine = "qnnpack"
+    # whisper 의 Linear 는 nn.Linear 를 상속해 dtype 만 맞추는 하위 클래스라서
+    # quantize_dynamic 이 알아보도록 nn.Linear 로 되돌린다 (CPU float32 에서는 동작이 같음)
+    for module in model.modules():
+        if isinstance(module, nn.Linear) and type(module) is not nn.Linear:
+            module.__class__ = nn.Linear
+    return quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def _load_whisper(key: str):
+    # torch/whisper 는 무거워서 실제로 모델이 필요할 때 불러온다
+    import whisper
+
+    name, _, mode = key.partition(":")
+    if mode != INT8:
+        return whisper.load_model(name)
+    # model_key 가 CUDA 없는 서버에서만 int8 을 고르므로 CPU 에 올린다 (동적 양자화는 CPU 전용)
+    model = whisper.load_model(name, device="cpu")
+    try:
+        return quantize_int8(model.eval())
+    except Exception as e:
+        warnings.warn(f"{key}: int8 양자화 실패, float32 로 대신 올린다 ({type(e).__name__}: {e})", RuntimeWarning)
+    # 양자화 도중 층 클래스를 바꿨을 수 있으므로 새로 읽는다
+    return whisper.load_model(name, device="cpu")
+
+
+class ModelPool:
+    """한 모델 크기의 인스턴스 풀 (필요할 때 size 개까지 만든다)"""
+
+    def __init__(self, name: str, size: int = DEFAULT_POOL_SIZE, loader: Optional[Callable[[str], Any]] = None):
+        self.name = name
+        self.size = size
+        self._loader = loader or _load_whisper
+        self._idle: List[Any] = []
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._cond = threading.Condition()
+        self.inferences = 0
+        self.total_seconds = 0.0
+        self.last_seconds: Optional[float] = None
+        self.load_seconds = 0.0
+
+    def _acquire(self):
+        """(모델, 새로 만들어야 하는지) — 쉬는 인스턴스가 없고 상한이면 기다린다"""
+        with self._cond:
+            self._waiting += 1
+            try:
+                while not self._idle and self._created >= self.size:
+                    self._cond.wait()
+            finally:
+                self._waiting -= 1
+            self._in_use += 1
+            if self._idle:
+                return self._idle.pop(), False
+            self._created += 1
+            return None, True
+
+    def _release(self, model, failed_load: bool = False):
+        with self._cond:
+            self._in_use -= 1
+            if failed_load:
+                self._created -= 1
+            else:
+                self._idle.append(model)
+            self._cond.notify()
+
+    def _load(self):
+        start = time.perf_counter()
+        model = self._loader(self.name)
+        with self._cond:
+            self.load_seconds += time.perf_counter() - start
+        return model
+
+    @contextmanager
+    def borrow(self) -> Iterator[Any]:
+        """with pool.borrow() as model: ... — 블록이 끝나면 풀에 돌려준다"""
+        model, create = self._acquire()
+        if create:
+            try:
+                model = self._load()
+            except BaseException:
+                self._release(None, failed_load=True)
+                raise
+        start = time.perf_counter()
+        try:
+            yield model
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._cond:
+                self.inferences += 1
+                self.total_seconds += elapsed
+                self.last_seconds = elapsed
+            self._release(model)
+
+    def warm(self):
+        """인스턴스 하나를 미리 올려 둔다 (이미 있으면 아무것도 안 함)"""
+        with self._cond:
+            if self._created:
+                return
+            self._created += 1
+        try:
+            model = self._load()
+        except BaseException:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._idle.append(model)
+            self._cond.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "model": self.name,
+                "size": self.size,
+                "loaded": self._created,
+                "in_use": self._in_use,
+                "queue_depth": self._waiting,
+                "inferences": self.inferences,
+                "avg_seconds": round(self.total_seconds / self.inferences, 2) if self.inferences else None,
+                "last_seconds": round(self.last_seconds, 2) if self.last_seconds is not None else None,
+                "load_seconds": round(self.load_seconds, 2),
+            }
+
+
+_lock = threading.Lock()
+_pools: Dict[str, ModelPool] = {}
+
+
+def get_pool(name: str = DEFAULT_MODEL) -> ModelPool:
+    """모델 크기(+양자화 모드)별 풀 (프로세스 전역에서 공유)"""
+    with _lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = ModelPool(name)
+        return pool
+
+
+def drop_pool(name: str):
+    """풀을 없애 올려 둔 모델 메모리를 돌려준다 (벤치마크에서 모델을 바꿔 가며 잴 때)"""
+    with _lock:
+        _pools.pop(name, None)
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    with _lock:
+        pools = list(_pools.values())
+    return [p.stats() for p in pools]
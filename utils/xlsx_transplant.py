@@ -0,0 +1,393 @@
+# ─── XML 직접 이식 병합 엔진 ──────────────────────────────────────────
+# openpyxl 로 셀 객체를 만들지 않고, 각 .xlsx 패키지에서 첫 번째 시트의
+# XML 을 그대로 떼어 새 zip 에 옮겨 담는다. styles.xml 과 sharedStrings 는
+# 하나로 합치고, 시트 XML 안의 스타일 번호(s="N")와 공유 문자열 번호(<v>N</v>)만
+# 바이트 단위 정규식으로 바꿔 쓴다. 병합 셀, 틀 고정, 열 너비, 행 높이는
+# 시트 XML 에 들어 있으므로 그대로 유지된다.
+import posixpath
+import re
+import shutil
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from utils.excel_stream import sanitize_sheet_name
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_M = "{%s}" % MAIN_NS
+
+CHUNK_SIZE = 1 << 20
+# 변환한 시트 XML 을 zip 에 넣기 전에 메모리에 두는 최대 크기 (넘으면 임시 파일로)
+SPOOL_SIZE = 32 << 20
+
+# openpyxl 이 새 워크북에 넣는 기본 스타일과 동일 (기존 페이지 결과와 맞추기 위함)
+_DEFAULT_FONT = ('<font><sz val="11"/><color theme="1"/><name val="Calibri"/>'
+                 '<family val="2"/><scheme val="minor"/></font>')
+_DEFAULT_FILLS = ['<fill><patternFill/></fill>', '<fill><patternFill patternType="gray125"/></fill>']
+_DEFAULT_BORDER = '<border><left/><right/><top/><bottom/><diagonal/></border>'
+_DEFAULT_XF = '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0" applyAlignment="1"/>'
+
+# 다른 파트와의 관계(r:id)가 필요한 요소들은 옮겨 올 수 없으므로 뺀다
+_TAIL_STRIP = re.compile(
+    rb'<(hyperlinks|drawing|legacyDrawing|legacyDrawingHF|picture|oleObjects|controls|tableParts|customProperties|extLst)\b'
+    rb'(?:[^>]*?/>|.*?</\1>)',
+    re.S,
+)
+_RID_ATTR = re.compile(rb'\sr:id="[^"]*"')
+_TAB_SELECTED = re.compile(rb'\stabSelected="[^"]*"')
+_CELL_STYLE = re.compile(rb'(<(?:c|row)\b[^>]*?\ss=")(\d+)(")')
+_COL_STYLE = re.compile(rb'(<col\b[^>]*?\sstyle=")(\d+)(")')
+_SHARED_VALUE = re.compile(rb'(<c\b[^>]*?\st="s"[^>]*>\s*<v>)(\d+)(</v>)')
+_META_ATTR = re.compile(rb'(<c\b[^>]*?)\s[cv]m="\d+"')
+_EMPTY_SHEET_DATA = re.compile(rb'<sheetData\s*/>')
+_DXF_ID = re.compile(rb'(<cfRule\b[^>]*?\sdxfId=")(\d+)(")')
+
+
+class UnsupportedWorkbook(ValueError):
+    pass
+
+
+def _fragment(el) -> str:
+    # 부모 요소에 기본 네임스페이스가 선언되므로 조각에서는 접두사 없이 쓴다
+    for child in el.iter():
+        if child.tag.startswith(_M):
+            child.tag = child.tag[len(_M):]
+    return ET.tostring(el, encoding="unicode")
+
+
+def _sub_map(pattern, mapping: Dict[bytes, bytes], data: bytes) -> bytes:
+    if not mapping:
+        return data
+    return pattern.sub(lambda m: m.group(1) + mapping.get(m.group(2), m.group(2)) + m.group(3), data)
+
+
+class _Table:
+    """문자열 조각 → 번호. 같은 조각은 같은 번호를 돌려준다"""
+
+    def __init__(self, items=()):
+        self.items: List[str] = []
+        self.index: Dict[str, int] = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: str) -> int:
+        idx = self.index.get(item)
+        if idx is None:
+            idx = self.index[item] = len(self.items)
+            self.items.append(item)
+        return idx
+
+    def truncate(self, n: int):
+        """n 번째 이후에 추가된 조각을 없앤다 (실패한 파일의 스타일/문자열 되돌리기)"""
+        for item in self.items[n:]:
+            del self.index[item]
+        del self.items[n:]
+
+
+class XlsxTransplanter:
+    """여러 .xlsx 의 첫 시트를 하나의 zip 패키지로 옮겨 담는다"""
+
+    def __init__(self, output):
+        self.zf = zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED)
+        self.sheets: List[tuple] = []   # (시트명, 파트 경로)
+        self.fonts = _Table([_DEFAULT_FONT])
+        self.fills = _Table(_DEFAULT_FILLS)
+        self.borders = _Table([_DEFAULT_BORDER])
+        self.xfs = _Table([_DEFAULT_XF])
+        self.dxfs = _Table()
+        self.num_fmts: Dict[str, int] = {}   # formatCode → numFmtId
+        self.strings = _Table()
+        self._titles = set()
+
+    # ─── 소스 패키지 읽기 ────────────────────────────────────────────
+    @staticmethod
+    def _rels(zf, part):
+        folder, name = posixpath.split(part)
+        rels_path = posixpath.join(folder, "_rels", name + ".rels")
+        rels = {}
+        if rels_path not in zf.namelist():
+            return rels
+        root = ET.fromstring(zf.read(rels_path))
+        for rel in root.iter("{%s}Relationship" % PKG_REL_NS):
+            target = rel.get("Target")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            rels[rel.get("Id")] = (rel.get("Type").rsplit("/", 1)[-1], target)
+        return rels
+
+    def _locate(self, zf):
+        root_rels = self._rels(zf, "")
+        wb_part = next((t for typ, t in root_rels.values() if typ == "officeDocument"), "xl/workbook.xml")
+        wb_rels = self._rels(zf, wb_part)
+        wb = ET.fromstring(zf.read(wb_part))
+        first = wb.find(f"{_M}sheets/{_M}sheet")
+        if first is None:
+            raise UnsupportedWorkbook("시트가 없습니다")
+        typ, sheet_part = wb_rels[first.get("{%s}id" % REL_NS)]
+        if typ != "worksheet":
+            raise UnsupportedWorkbook("첫 번째 시트가 일반 워크시트가 아닙니다")
+        styles = next((t for typ, t in wb_rels.values() if typ == "styles"), None)
+        sst = next((t for typ, t in wb_rels.values() if typ == "sharedStrings"), None)
+        return sheet_part, styles, sst
+
+    # ─── 스타일 병합 ─────────────────────────────────────────────────
+    def _merge_styles(self, zf, styles_part) -> Tuple[Dict[bytes, bytes], Dict[bytes, bytes]]:
+        if styles_part is None:
+            return {}, {}
+        root = ET.fromstring(zf.read(styles_part))
+
+        fmt_map = {}
+        for nf in root.iterfind(f"{_M}numFmts/{_M}numFmt"):
+            code = nf.get("formatCode")
+            new_id = self.num_fmts.get(code)
+            if new_id is None:
+                new_id = self.num_fmts[code] = 164 + len(self.num_fmts)
+            fmt_map[nf.get("numFmtId")] = str(new_id)
+
+        font_map = [self.fonts.add(_fragment(el)) for el in root.iterfind(f"{_M}fonts/{_M}font")]
+        fill_map = [self.fills.add(_fragment(el)) for el in root.iterfind(f"{_M}fills/{_M}fill")]
+        border_map = [self.borders.add(_fragment(el)) for el in root.iterfind(f"{_M}borders/{_M}border")]
+
+        xf_map = {}
+        for i, xf in enumerate(root.iterfind(f"{_M}cellXfs/{_M}xf")):
+            num_fmt = xf.get("numFmtId", "0")
+            xf.set("numFmtId", fmt_map.get(num_fmt, num_fmt))
+            for attr, mapping in (("fontId", font_map), ("fillId", fill_map), ("borderId", border_map)):
+                xf.set(attr, str(mapping[int(xf.get(attr, "0"))]))
+            # 이름 있는 셀 스타일은 옮기지 않는다 (기존 페이지와 동일)
+            xf.set("xfId", "0")
+            xf_map[str(i).encode()] = str(self.xfs.add(_fragment(xf))).encode()
+
+        dxf_map = {}
+        for i, dxf in enumerate(root.iterfind(f"{_M}dxfs/{_M}dxf")):
+            dxf_map[str(i).encode()] = str(self.dxfs.add(_fragment(dxf))).encode()
+
+        # 번호가 그대로인 것은 바꿀 필요 없음
+        xf_map = {k: v for k, v in xf_map.items() if k != v}
+        dxf_map = {k: v for k, v in dxf_map.items() if k != v}
+        return xf_map, dxf_map
+
+    def _merge_strings(self, zf, sst_part) -> Dict[bytes, bytes]:
+        if sst_part is None:
+            return {}
+        sst_map = {}
+        with zf.open(sst_part) as f:
+            i = 0
+            for _, el in ET.iterparse(f):
+                if el.tag == f"{_M}si":
+                    new = self.strings.add(_fragment(el))
+                    if new != i:
+                        sst_map[str(i).encode()] = str(new).encode()
+                    i += 1
+                    el.clear()
+        return sst_map
+
+    # ─── 시트 XML 스트리밍 변환 ──────────────────────────────────────
+    def _copy_sheet(self, zf, sheet_part, dst, xf_map, sst_map, dxf_map):
+        def rewrite_rows(data: bytes) -> bytes:
+            data = _sub_map(_CELL_STYLE, xf_map, data)
+            data = _sub_map(_SHARED_VALUE, sst_map, data)
+            if b'm="' in data:
+                data = _META_ATTR.sub(rb"\1", data)
+            return data
+
+        with zf.open(sheet_part) as src:
+            buf = b""
+            # 1) <sheetData> 앞부분: 열 너비(cols), 틀 고정(sheetViews), 기본 행 높이
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                buf += chunk
+                pos = buf.find(b"<sheetData")
+                if pos >= 0 or not chunk:
+                    break
+            if pos < 0:
+                raise UnsupportedWorkbook("sheetData 를 찾을 수 없습니다")
+            head, buf = buf[:pos], buf[pos:]
+            head = _TAB_SELECTED.sub(b"", head)
+            head = _sub_map(_COL_STYLE, xf_map, head)
+            dst.write(head)
+
+            # 2) <sheetData> 본문: 완결된 </row> 단위로 잘라서 변환
+            empty = _EMPTY_SHEET_DATA.match(buf)
+            while True:
+                end = empty.end() if empty else buf.find(b"</sheetData>")
+                if end >= 0:
+                    dst.write(rewrite_rows(buf[:end]))
+                    buf = buf[end:]
+                    break
+                cut = buf.rfind(b"</row>")
+                if cut >= 0:
+                    cut += len(b"</row>")
+                    dst.write(rewrite_rows(buf[:cut]))
+                    buf = buf[cut:]
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    raise UnsupportedWorkbook("sheetData 가 닫히지 않았습니다")
+                buf += chunk
+
+            # 3) 뒷부분: 병합 셀, 조건부 서식 등 (작으므로 한 번에)
+            tail = buf + src.read()
+            tail = _TAIL_STRIP.sub(b"", tail)
+            tail = _RID_ATTR.sub(b"", tail)
+            tail = _sub_map(_DXF_ID, dxf_map, tail)
+            dst.write(tail)
+
+    def _unique_title(self, name: str) -> str:
+        title = sanitize_sheet_name(name) or "Sheet"
+        base, n = title, 1
+        while title.lower() in self._titles:
+            suffix = str(n)
+            title = base[:31 - len(suffix)] + suffix
+            n += 1
+        self._titles.add(title.lower())
+        return title
+
+    def _tables(self):
+        return (self.fonts, self.fills, self.borders, self.xfs, self.dxfs, self.strings)
+
+    def add(self, source, name: str):
+        """source(.xlsx 파일 또는 파일 객체)의 첫 시트를 name 시트로 추가
+
+        시트 XML 은 임시 버퍼에 다 변환한 뒤에야 출력 zip 에 쓴다. 중간에 실패하면
+        이 파일이 보탠 스타일/공유 문자열도 되돌려서 출력에는 흔적이 남지 않는다.
+        """
+        sizes = [len(t.items) for t in self._tables()]
+        num_fmts = dict(self.num_fmts)
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as part:
+            try:
+                with zipfile.ZipFile(source) as zf:
+                    sheet_part, styles_part, sst_part = self._locate(zf)
+                    xf_map, dxf_map = self._merge_styles(zf, styles_part)
+                    sst_map = self._merge_strings(zf, sst_part)
+                    self._copy_sheet(zf, sheet_part, part, xf_map, sst_map, dxf_map)
+            except BaseException:
+                for table, n in zip(self._tables(), sizes):
+                    table.truncate(n)
+                self.num_fmts = num_fmts
+                raise
+            target = f"xl/worksheets/sheet{len(self.sheets) + 1}.xml"
+            part.seek(0)
+            with self.zf.open(target, "w", force_zip64=True) as dst:
+                shutil.copyfileobj(part, dst, CHUNK_SIZE)
+        self.sheets.append((self._unique_title(name), target))
+
+    # ─── 새 패키지 마무리 ────────────────────────────────────────────
+    def _styles_xml(self) -> str:
+        def section(tag, table):
+            if not table.items:
+                return ""
+            return f'<{tag} count="{len(table.items)}">' + "".join(table.items) + f"</{tag}>"
+
+        num_fmts = ""
+        if self.num_fmts:
+            num_fmts = f'<numFmts count="{len(self.num_fmts)}">' + "".join(
+                f'<numFmt numFmtId="{i}" formatCode={quoteattr(code)}/>' for code, i in self.num_fmts.items()
+            ) + "</numFmts>"
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<styleSheet xmlns="{MAIN_NS}">'
+            + num_fmts
+            + section("fonts", self.fonts)
+            + section("fills", self.fills)
+            + section("borders", self.borders)
+            + '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            + section("cellXfs", self.xfs)
+            + '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            + (section("dxfs", self.dxfs) or '<dxfs count="0"/>')
+            + "</styleSheet>"
+        )
+
+    def close(self):
+        zf = self.zf
+        if not self.sheets:
+            # 빈 통합 문서는 Excel 이 열지 못하므로 빈 시트를 하나 넣는다
+            target = "xl/worksheets/sheet1.xml"
+            zf.writestr(target, f'<worksheet xmlns="{MAIN_NS}"><sheetData/></worksheet>')
+            self.sheets.append(("Sheet", target))
+
+        with zf.open("xl/sharedStrings.xml", "w", force_zip64=True) as f:
+            n = len(self.strings.items)
+            f.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<sst xmlns="{MAIN_NS}" count="{n}" uniqueCount="{n}">'.encode())
+            for item in self.strings.items:
+                f.write(item.encode())
+            f.write(b"</sst>")
+        zf.writestr("xl/styles.xml", self._styles_xml())
+
+        sheets = "".join(
+            f'<sheet name={quoteattr(title)} sheetId="{i}" r:id="rId{i}"/>'
+            for i, (title, _) in enumerate(self.sheets, start=1)
+        )
+        zf.writestr("xl/workbook.xml", (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+            f'<bookViews><workbookView activeTab="0"/></bookViews><sheets>{sheets}</sheets></workbook>'
+        ))
+
+        n = len(self.sheets)
+        rels = "".join(
+            f'<Relationship Id="rId{i}" Type="{REL_NS}/worksheet" Target="{escape(posixpath.relpath(part, "xl"))}"/>'
+            for i, (_, part) in enumerate(self.sheets, start=1)
+        )
+        rels += (f'<Relationship Id="rId{n + 1}" Type="{REL_NS}/styles" Target="styles.xml"/>'
+                 f'<Relationship Id="rId{n + 2}" Type="{REL_NS}/sharedStrings" Target="sharedStrings.xml"/>')
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{PKG_REL_NS}">{rels}</Relationships>'
+        ))
+        zf.writestr("_rels/.rels", (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{PKG_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            f'</Relationships>'
+        ))
+
+        ct = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+        overrides = "".join(
+            f'<Override PartName="/{part}" ContentType="{ct}.worksheet+xml"/>' for _, part in self.sheets
+        )
+        zf.writestr("[Content_Types].xml", (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            f'<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            f'<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{ct}.sheet.main+xml"/>'
+            f'<Override PartName="/xl/styles.xml" ContentType="{ct}.styles+xml"/>'
+            f'<Override PartName="/xl/sharedStrings.xml" ContentType="{ct}.sharedStrings+xml"/>'
+            f'{overrides}</Types>'
+        ))
+        zf.close()
+
+
+def transplant_sheets(
+    uploaded_files,
+    output,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> List[str]:
+    """업로드 파일마다 첫 시트를 output 에 XML 그대로 옮겨 담는다. 성공한 파일명 목록을 돌려준다
+
+    on_progress(처리한 파일 수, 전체 파일 수) 는 파일 하나를 끝낼 때마다 불린다.
+    """
+    merged = []
+    transplanter = XlsxTransplanter(output)
+    for i, uploaded_file in enumerate(uploaded_files, start=1):
+        if on_progress and i > 1:
+            on_progress(i - 1, len(uploaded_files))
+        try:
+            if not uploaded_file.name.lower().endswith((".xlsx", ".xlsm")):
+                raise UnsupportedWorkbook("XML 이식 모드는 .xlsx 파일만 지원합니다")
+            uploaded_file.seek(0)
+            transplanter.add(uploaded_file, uploaded_file.name.rsplit('.', 1)[0])
+        except Exception as e:
+            if on_error:
+                on_error(uploaded_file.name, e)
+            continue
+        merged.append(uploaded_file.name)
+    transplanter.close()
+    return merged